@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the client hot paths.
+
+Runs the client against the in-process server from
+``altertable_flightsql.testing``, so the numbers measure client-side overhead
+(plus the local server) rather than the network or the query engine.
+
+Results are written as JSON. Passing a previous result file with
+``--baseline`` compares the two runs and exits with status 1 if any
+benchmark got slower than ``--threshold`` times its baseline.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results.json --threshold 1.5
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import pyarrow as pa
+
+import altertable_flightsql
+from altertable_flightsql import Client
+from altertable_flightsql.client import IngestTableMode
+from altertable_flightsql.testing import FlightSQLServer
+
+COLUMN_TYPES = {
+    "int64": lambda n: pa.array(range(n), pa.int64()),
+    "float64": lambda n: pa.array([i * 0.5 for i in range(n)], pa.float64()),
+    "string": lambda n: pa.array([f"value_{i}" for i in range(n)], pa.string()),
+}
+
+
+def measure(func: Callable[[], Any], *, iterations: int, warmup: int = 1) -> dict:
+    """Time a function, returning the timing statistics in seconds."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "min": timings[0],
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def with_throughput(timing: dict, *, rows: int, nbytes: int) -> dict:
+    """Add row and byte throughputs, based on the median timing."""
+    return {
+        **timing,
+        "rows": rows,
+        "bytes": nbytes,
+        "rows_per_second": rows / timing["median"],
+        "bytes_per_second": nbytes / timing["median"],
+    }
+
+
+@contextmanager
+def local_server(args: argparse.Namespace, **options) -> Iterator[FlightSQLServer]:
+    with FlightSQLServer(latency=args.latency, endpoints=args.endpoints, **options) as server:
+        yield server
+
+
+def bench_query_throughput(args: argparse.Namespace) -> dict:
+    results = {}
+    for type_name, make_column in COLUMN_TYPES.items():
+        data = pa.table({"value": make_column(args.rows)})
+        for batch_size in args.batch_sizes:
+            with local_server(args, chunk_size=batch_size) as server:
+                server.create_table("data", data)
+                with Client(**server.client_options()) as client:
+                    timing = measure(
+                        lambda client=client: client.query("SELECT * FROM data").read_all(),
+                        iterations=args.iterations,
+                    )
+            key = f"{type_name}/batch_size={batch_size}"
+            results[key] = with_throughput(timing, rows=data.num_rows, nbytes=data.nbytes)
+    return results
+
+
+def bench_call_latency(args: argparse.Namespace) -> dict:
+    iterations = args.iterations * 10
+    with local_server(args) as server:
+        server.create_table("data", pa.table({"id": pa.array(range(10), pa.int32())}))
+        with Client(**server.client_options()) as client:
+            statement = client.prepare("SELECT ? AS value")
+
+            def prepare_query():
+                with client.prepare("SELECT ? AS value") as stmt:
+                    stmt.query(parameters={"value": 1}).read_all()
+
+            calls = {
+                "query": lambda: client.query("SELECT 1 AS value").read_all(),
+                "execute": lambda: client.execute("INSERT INTO data VALUES (1)"),
+                "prepare+query": prepare_query,
+                "prepared_query": lambda: statement.query(parameters={"value": 1}).read_all(),
+                "get_catalogs": lambda: client.get_catalogs().read_all(),
+                "get_schemas": lambda: client.get_schemas().read_all(),
+                "get_tables": lambda: client.get_tables().read_all(),
+            }
+            results = {name: measure(call, iterations=iterations) for name, call in calls.items()}
+            statement.close()
+    return results
+
+
+def bench_ingest_throughput(args: argparse.Namespace) -> dict:
+    results = {}
+    data = pa.table(
+        {"id": COLUMN_TYPES["int64"](args.rows), "name": COLUMN_TYPES["string"](args.rows)}
+    )
+    for batch_size in args.batch_sizes:
+        batches = data.to_batches(max_chunksize=batch_size)
+        with local_server(args) as server:
+            with Client(**server.client_options()) as client:
+
+                def ingest(client=client, batches=batches):
+                    with client.ingest(
+                        table_name="data",
+                        schema=data.schema,
+                        mode=IngestTableMode.REPLACE,
+                    ) as writer:
+                        for batch in batches:
+                            writer.write_batch(batch)
+
+                timing = measure(ingest, iterations=args.iterations)
+        key = f"batch_size={batch_size}"
+        results[key] = with_throughput(timing, rows=data.num_rows, nbytes=data.nbytes)
+    return results
+
+
+def bench_connect(args: argparse.Namespace) -> dict:
+    with local_server(args) as server:
+        options = server.client_options()
+        return {
+            "handshake": measure(lambda: Client(**options).close(), iterations=args.iterations * 10)
+        }
+
+
+BENCHMARKS = {
+    "query_throughput": bench_query_throughput,
+    "call_latency": bench_call_latency,
+    "ingest_throughput": bench_ingest_throughput,
+    "connect": bench_connect,
+}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the benchmarks whose median timing regressed past the threshold."""
+    regressions = []
+    for group, cases in results["benchmarks"].items():
+        for case, timing in cases.items():
+            previous = baseline.get("benchmarks", {}).get(group, {}).get(case)
+            if previous is None:
+                continue
+            ratio = timing["median"] / previous["median"]
+            if ratio > threshold:
+                regressions.append(
+                    f"{group}/{case}: {previous['median'] * 1e3:.3f}ms -> "
+                    f"{timing['median'] * 1e3:.3f}ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="BENCHMARK",
+        help=f"Benchmarks to run, among {', '.join(BENCHMARKS)} (default: all)",
+    )
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per dataset")
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1024, 65536],
+        help="Record batch sizes to compare",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed iterations")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency per call")
+    parser.add_argument("--endpoints", type=int, default=1, help="Endpoints per query result")
+    parser.add_argument("--output", help="Write the JSON results to a file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio reported as a regression (default: 1.25)",
+    )
+    args = parser.parse_args(argv)
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "altertable_flightsql": altertable_flightsql.__version__,
+            "pyarrow": pa.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "rows": args.rows,
+                "batch_sizes": args.batch_sizes,
+                "iterations": args.iterations,
+                "latency": args.latency,
+                "endpoints": args.endpoints,
+            },
+        },
+        "benchmarks": {},
+    }
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        results["benchmarks"][name] = BENCHMARKS[name](args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,36 @@ enabling high-performance SQL queries and data analysis.
 
 __version__ = "0.2.1"
 
-from altertable_flightsql.client import Client, PreparedStatement
+from altertable_flightsql.aio import AsyncClient
+from altertable_flightsql.cache import ResultCache
+from altertable_flightsql.client import (
+    Client,
+    MultiEndpointReader,
+    PreparedStatement,
+    QueryHandle,
+    QueryResult,
+    ReadaheadReader,
+    RechunkReader,
+)
+from altertable_flightsql.export import ExportWriter
+from altertable_flightsql.ingest import Ingestor, IngestProgress
+from altertable_flightsql.pool import ClientPool
+from altertable_flightsql.retry import RetryPolicy
 
 __all__ = [
     "__version__",
+    "AsyncClient",
     "Client",
+    "ClientPool",
+    "ExportWriter",
+    "IngestProgress",
+    "Ingestor",
+    "MultiEndpointReader",
     "PreparedStatement",
+    "QueryHandle",
+    "QueryResult",
+    "ReadaheadReader",
+    "RechunkReader",
+    "ResultCache",
+    "RetryPolicy",
 ]
@@ -0,0 +1,845 @@
+"""
+Asyncio client implementation.
+
+This module provides an asyncio flavour of the Altertable client. Blocking
+Arrow Flight calls are dispatched one step at a time to an executor, so a
+result stream only occupies a thread while a batch is actually being read and
+many queries can be in flight on a small pool of threads.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import pyarrow as pa
+import pyarrow.flight as flight
+
+from altertable_flightsql.cache import CacheInfo, ResultCache
+from altertable_flightsql.client import (
+    Client,
+    IngestIncrementalOptions,
+    IngestTableMode,
+    MultiEndpointReader,
+    PreparedStatement,
+    QueryResult,
+    Transaction,
+)
+from altertable_flightsql.export import DEFAULT_ROW_GROUP_SIZE
+from altertable_flightsql.ingest import IngestProgress
+from altertable_flightsql.instrumentation import Instrumentation, traced
+from altertable_flightsql.retry import RetryPolicy
+
+T = TypeVar("T")
+
+
+_END_OF_STREAM = object()
+
+
+class _ExecutorMixin:
+    _executor: Optional[Executor]
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call on the executor."""
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the task's context, which holds its implicit transaction
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+
+class AsyncRecordBatchStream(_ExecutorMixin):
+    """
+    Asynchronous result stream.
+
+    Supports ``async for`` iteration over the chunks of a query result. Each
+    chunk exposes the record batch as ``chunk.data``, like with the
+    synchronous ``FlightStreamReader``.
+
+    Example:
+        >>> stream = await client.query("SELECT * FROM users")
+        >>> async for batch in stream:
+        ...     print(batch.data.num_rows)
+    """
+
+    def __init__(
+        self,
+        reader: Union[QueryResult, MultiEndpointReader],
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize an asynchronous result stream.
+
+        Args:
+            reader: Underlying synchronous result stream.
+            executor: Executor used for blocking reads (default: the event loop's).
+        """
+        self._reader = reader
+        self._executor = executor
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the result."""
+        return self._reader.schema
+
+    def _read_chunk(self) -> Any:
+        try:
+            return self._reader.read_chunk()
+        except StopIteration:
+            return _END_OF_STREAM
+
+    def __aiter__(self) -> AsyncIterator[flight.FlightStreamChunk]:
+        return self
+
+    async def __anext__(self) -> flight.FlightStreamChunk:
+        chunk = await self._run(self._read_chunk)
+        if chunk is _END_OF_STREAM:
+            raise StopAsyncIteration
+        return chunk
+
+    async def read_all(self) -> pa.Table:
+        """Read all remaining chunks into a table."""
+        batches = [chunk.data async for chunk in self]
+        return pa.Table.from_batches(batches, schema=self.schema)
+
+    async def read_pandas(self, **options) -> Any:
+        """Read all remaining chunks into a pandas DataFrame."""
+        table = await self.read_all()
+        return table.to_pandas(**options)
+
+    async def cancel(self, *, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel the query, see ``QueryResult.cancel``.
+
+        Returns:
+            Whether the server cancelled the query or is cancelling it.
+        """
+        if isinstance(self._reader, QueryResult):
+            return await self._run(self._reader.cancel, timeout=timeout)
+        self._reader.cancel()
+        return False
+
+
+class AsyncStreamWriter(_ExecutorMixin):
+    """
+    Asynchronous writer for bulk ingestion.
+
+    Can be used as an async context manager, closing the stream on exit.
+    """
+
+    def __init__(self, writer: flight.FlightStreamWriter, executor: Optional[Executor] = None):
+        """
+        Initialize an asynchronous writer.
+
+        Args:
+            writer: Underlying synchronous FlightStreamWriter.
+            executor: Executor used for blocking writes (default: the event loop's).
+        """
+        self._writer = writer
+        self._executor = executor
+
+    async def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        """Write a record batch or a table to the stream."""
+        await self._run(self._writer.write, data)
+
+    async def close(self) -> None:
+        """Finish the upload and close the stream."""
+        await self._run(self._writer.close)
+
+    async def __aenter__(self) -> "AsyncStreamWriter":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
+class AsyncTransaction(_ExecutorMixin):
+    """
+    Asynchronous transaction.
+
+    When used as an async context manager, the transaction becomes the
+    client's implicit transaction, and is committed on exit or rolled back if
+    an exception was raised.
+    """
+
+    def __init__(self, transaction: Transaction, executor: Optional[Executor] = None):
+        self._transaction = transaction
+        self._executor = executor
+
+    async def __aenter__(self) -> "AsyncTransaction":
+        self._transaction.__enter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if not self._transaction._closed:
+                if exc_type is not None:
+                    await self.rollback()
+                else:
+                    await self.commit()
+        finally:
+            # The implicit transaction was set in the task's context, not the executor's
+            self._transaction._reset_context()
+
+    async def commit(self, *, timeout: Optional[float] = None) -> None:
+        await self._run(self._transaction.commit, timeout=timeout)
+
+    async def rollback(self, *, timeout: Optional[float] = None) -> None:
+        await self._run(self._transaction.rollback, timeout=timeout)
+
+
+class AsyncPreparedStatement(_ExecutorMixin):
+    """
+    Asynchronous prepared SQL statement.
+
+    Prepared statements can be executed multiple times with different parameters.
+    """
+
+    def __init__(self, statement: PreparedStatement, executor: Optional[Executor] = None):
+        self._statement = statement
+        self._executor = executor
+
+    async def query(
+        self,
+        *,
+        parameters: Optional[
+            Union[pa.Table, pa.RecordBatch, Mapping[str, Any], Sequence[Any]]
+        ] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncRecordBatchStream:
+        """
+        Execute the prepared statement query.
+
+        Args:
+            parameters: Optional parameters for the query, see
+                ``PreparedStatement.query``.
+            timeout: Timeout in seconds of each call to the server, see
+                ``Client.query``.
+
+        Returns:
+            AsyncRecordBatchStream with query results.
+        """
+        reader = await self._run(self._statement.query, parameters=parameters, timeout=timeout)
+        return AsyncRecordBatchStream(reader, self._executor)
+
+    async def querymany(
+        self,
+        parameters: Union[
+            pa.Table,
+            pa.RecordBatch,
+            pa.RecordBatchReader,
+            Iterable[Union[pa.RecordBatch, Mapping[str, Any], Sequence[Any]]],
+        ],
+        *,
+        batch_size: int = 65536,
+        pipeline: bool = False,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncRecordBatchStream:
+        """
+        Execute the prepared statement query for many parameter batches.
+
+        See ``PreparedStatement.querymany``.
+
+        Returns:
+            AsyncRecordBatchStream with the results of all batches.
+        """
+        reader = await self._run(
+            self._statement.querymany,
+            parameters,
+            batch_size=batch_size,
+            pipeline=pipeline,
+            max_workers=max_workers,
+            timeout=timeout,
+        )
+        return AsyncRecordBatchStream(reader, self._executor)
+
+    async def execute(
+        self,
+        *,
+        parameters: Optional[
+            Union[pa.Table, pa.RecordBatch, Mapping[str, Any], Sequence[Any]]
+        ] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Execute the prepared statement as an update.
+
+        Returns:
+            Number of rows affected, or -1 if unknown.
+        """
+        return await self._run(self._statement.execute, parameters=parameters, timeout=timeout)
+
+    async def executemany(
+        self,
+        parameters: Union[
+            pa.Table,
+            pa.RecordBatch,
+            pa.RecordBatchReader,
+            Iterable[Union[pa.RecordBatch, Mapping[str, Any], Sequence[Any]]],
+        ],
+        *,
+        batch_size: int = 65536,
+        timeout: Optional[float] = None,
+    ) -> list[int]:
+        """
+        Execute the prepared statement as an update for many parameter sets.
+
+        See ``PreparedStatement.executemany``.
+
+        Returns:
+            Affected row counts reported by the server.
+        """
+        return await self._run(
+            self._statement.executemany, parameters, batch_size=batch_size, timeout=timeout
+        )
+
+    async def close(self, *, timeout: Optional[float] = None) -> None:
+        """Close the prepared statement and release server resources."""
+        await self._run(self._statement.close, timeout=timeout)
+
+    async def __aenter__(self) -> "AsyncPreparedStatement":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
+class AsyncClient(_ExecutorMixin):
+    """
+    Asyncio client for Altertable.
+
+    Mirrors the ``Client`` API with awaitable methods. Query planning uses
+    the native asyncio support of Arrow Flight when available, and other
+    blocking calls are dispatched to an executor one step at a time.
+
+    Example:
+        >>> async with AsyncClient(username="user", password="pass") as client:
+        ...     stream = await client.query("SELECT * FROM users")
+        ...     async for batch in stream:
+        ...         print(batch.data.to_pandas())
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        catalog: Optional[str] = "altertable",
+        schema: Optional[str] = "main",
+        host: str = "flight.altertable.ai",
+        port: int = 443,
+        tls: bool = True,
+        auto_commit: bool = False,
+        prepared_statement_cache_size: int = 0,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        result_compression: Optional[str] = None,
+        result_batch_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        timeout: Optional[float] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache_ttl: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize an asyncio Altertable client.
+
+        The connection is established by ``connect()``, or when entering the
+        client as an async context manager.
+
+        Args:
+            username: Altertable username (required).
+            password: Altertable password (required).
+            catalog: Default catalog name (default: "altertable").
+            schema: Default schema name (default: "main").
+            host: Altertable server hostname (default: "flight.altertable.ai").
+            port: Server port (default: 443).
+            tls: Whether to use TLS/SSL (default: True).
+            auto_commit: Whether to auto-commit transactions (default: False).
+            prepared_statement_cache_size: Maximum number of prepared statements
+                kept open and reused per client (default: 0, disabled).
+            compression: Default IPC buffer compression for uploaded data
+                (default: None, uncompressed).
+            result_compression: Codec the server is asked to use for result
+                streams (default: None).
+            result_batch_size: Preferred number of rows per record batch of
+                result streams (default: None).
+            instrumentation: Instrumentation receiving a span per RPC
+                (default: None, disabled).
+            timeout: Default timeout in seconds of each call to the server
+                (default: None, no timeout).
+            result_cache: Cache of the results of read-only queries
+                (default: None, disabled).
+            metadata_cache_ttl: Time in seconds metadata lookups are cached
+                (default: None, disabled).
+            retry_policy: Policy retrying idempotent calls on transient errors
+                (default: None, no retries).
+            executor: Executor used for blocking calls (default: the event
+                loop's default executor).
+        """
+        self._client_options = {
+            "username": username,
+            "password": password,
+            "catalog": catalog,
+            "schema": schema,
+            "host": host,
+            "port": port,
+            "tls": tls,
+            "auto_commit": auto_commit,
+            "prepared_statement_cache_size": prepared_statement_cache_size,
+            "compression": compression,
+            "result_compression": result_compression,
+            "result_batch_size": result_batch_size,
+            "instrumentation": instrumentation,
+            "timeout": timeout,
+            "result_cache": result_cache,
+            "metadata_cache_ttl": metadata_cache_ttl,
+            "retry_policy": retry_policy,
+        }
+        self._executor = executor
+        self._client: Optional[Client] = None
+
+    @property
+    def _sync_client(self) -> Client:
+        if self._client is None:
+            raise RuntimeError("AsyncClient is not connected, call `await client.connect()` first")
+        return self._client
+
+    @property
+    def _instrumentation(self) -> Optional[Instrumentation]:
+        return self._client_options["instrumentation"]
+
+    async def connect(self) -> "AsyncClient":
+        """Connect and authenticate to the server."""
+        if self._client is None:
+            self._client = await self._run(Client, **self._client_options)
+        return self
+
+    def _stream(self, reader: Union[QueryResult, MultiEndpointReader]) -> AsyncRecordBatchStream:
+        return AsyncRecordBatchStream(reader, self._executor)
+
+    def _transaction(self, transaction: Optional[AsyncTransaction]) -> Optional[Transaction]:
+        return transaction._transaction if transaction else None
+
+    async def set_catalog(self, catalog: str, *, timeout: Optional[float] = None) -> None:
+        await self._run(self._sync_client.set_catalog, catalog, timeout=timeout)
+
+    async def set_schema(self, schema: str, *, timeout: Optional[float] = None) -> None:
+        await self._run(self._sync_client.set_schema, schema, timeout=timeout)
+
+    @traced("query")
+    async def query(
+        self,
+        query: str,
+        *,
+        transaction: Optional[AsyncTransaction] = None,
+        parallel: bool = False,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> AsyncRecordBatchStream:
+        """
+        Execute a SQL query and return an asynchronous result stream.
+
+        Args:
+            query: SQL query string to execute.
+            transaction: Optional transaction to execute query within.
+            parallel: Whether to fetch the result endpoints concurrently.
+            ordered: Whether to return the endpoints in the order advertised by
+                the server (default: True).
+            max_workers: Maximum number of endpoints fetched concurrently when
+                ``parallel`` is set.
+            timeout: Timeout in seconds of each call to the server, see
+                ``Client.query``.
+            use_cache: Whether to use the client's result cache, if any
+                (default: True).
+
+        Returns:
+            AsyncRecordBatchStream for reading query results.
+
+        Example:
+            >>> stream = await client.query("SELECT * FROM users WHERE age > 18")
+            >>> table = await stream.read_all()
+        """
+        client = self._sync_client
+        sync_transaction = self._transaction(transaction)
+        if use_cache and client._result_cache_key(
+            query, client._get_transaction_id(sync_transaction)
+        ):
+            # Cached results are read whole, planning does not need the native asyncio path
+            reader = await self._run(
+                client.query,
+                query,
+                transaction=sync_transaction,
+                parallel=parallel,
+                ordered=ordered,
+                max_workers=max_workers,
+                timeout=timeout,
+            )
+            return self._stream(reader)
+
+        descriptor = client._query_descriptor(query, sync_transaction)
+        options = client._call_options(timeout=timeout)
+
+        # The retry policy applies to the blocking call only
+        if client._client.supports_async and client._retry_policy is None:
+            token = client._auth_middleware.token
+            try:
+                info = await client._client.as_async().get_flight_info(descriptor, options=options)
+            except flight.FlightUnauthenticatedError:
+                # Re-authenticate and retry once, like the synchronous calls
+                await self._run(client._reauthenticate, token)
+                info = await client._client.as_async().get_flight_info(descriptor, options=options)
+            except OSError:
+                # Asynchronous calls may fail with an untyped error: plan again with the
+                # blocking call, which raises typed errors and re-authenticates if needed
+                info = await self._run(client._client.get_flight_info, descriptor, options)
+        else:
+            info = await self._run(client._client.get_flight_info, descriptor, options)
+
+        reader = await self._run(
+            client._read_flight_info,
+            info,
+            parallel=parallel,
+            ordered=ordered,
+            max_workers=max_workers,
+            options=options,
+        )
+        return self._stream(reader)
+
+    async def execute(
+        self,
+        query: str,
+        *,
+        transaction: Optional[AsyncTransaction] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Execute a SQL update statement (INSERT, UPDATE, DELETE, etc.).
+
+        Args:
+            query: SQL update statement to execute.
+            transaction: Optional transaction to execute within.
+            compression: IPC compression of the upload, overriding the client
+                default.
+            timeout: Timeout in seconds, see ``Client.query``.
+
+        Returns:
+            Number of rows affected.
+        """
+        return await self._run(
+            self._sync_client.execute,
+            query,
+            transaction=self._transaction(transaction),
+            compression=compression,
+            timeout=timeout,
+        )
+
+    async def export(
+        self,
+        query: str,
+        path: Union[str, os.PathLike],
+        *,
+        format: str = "parquet",
+        transaction: Optional[AsyncTransaction] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = None,
+        partitioned: bool = False,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Execute a SQL query and write its results to files.
+
+        See ``Client.export`` for a description of the arguments.
+
+        Returns:
+            Number of rows written.
+        """
+        return await self._run(
+            self._sync_client.export,
+            query,
+            path,
+            format=format,
+            transaction=self._transaction(transaction),
+            row_group_size=row_group_size,
+            compression=compression,
+            partitioned=partitioned,
+            parallel=parallel,
+            max_workers=max_workers,
+            timeout=timeout,
+        )
+
+    async def ingest(
+        self,
+        *,
+        table_name: str,
+        schema: pa.Schema,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional[AsyncTransaction] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncStreamWriter:
+        """
+        Bulk ingest data into a table.
+
+        See ``Client.ingest`` for a description of the arguments.
+
+        Returns:
+            AsyncStreamWriter for writing record batches to the table.
+
+        Example:
+            >>> async with await client.ingest(table_name="users", schema=schema) as writer:
+            ...     await writer.write(batch)
+        """
+        writer = await self._run(
+            self._sync_client.ingest,
+            table_name=table_name,
+            schema=schema,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            mode=mode,
+            incremental_options=incremental_options,
+            transaction=self._transaction(transaction),
+            compression=compression,
+            timeout=timeout,
+        )
+        return AsyncStreamWriter(writer, self._executor)
+
+    async def ingest_parallel(
+        self,
+        *,
+        table_name: str,
+        source: Union[pa.Table, pa.RecordBatchReader, Iterable[pa.RecordBatch], Any],
+        parallelism: int = 4,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional[AsyncTransaction] = None,
+        batch_size: int = 65536,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Bulk ingest data into a table over several concurrent streams.
+
+        See ``Client.ingest_parallel`` for a description of the arguments.
+
+        Returns:
+            Number of rows sent to the server.
+        """
+        return await self._run(
+            self._sync_client.ingest_parallel,
+            table_name=table_name,
+            source=source,
+            parallelism=parallelism,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            mode=mode,
+            incremental_options=incremental_options,
+            transaction=self._transaction(transaction),
+            batch_size=batch_size,
+            compression=compression,
+            timeout=timeout,
+        )
+
+    async def ingest_files(
+        self,
+        *,
+        table_name: str,
+        source: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]], Any],
+        format: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filter: Optional[Any] = None,
+        parallelism: int = 4,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional[AsyncTransaction] = None,
+        batch_size: int = 65536,
+        batch_readahead: int = 16,
+        fragment_readahead: int = 4,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[IngestProgress], None]] = None,
+        progress_interval: float = 1.0,
+    ) -> int:
+        """
+        Bulk ingest Parquet, Arrow IPC (Feather) or CSV files into a table.
+
+        See ``Client.ingest_files`` for a description of the arguments. The
+        ``progress`` callable is called from a worker thread.
+
+        Returns:
+            Number of rows sent to the server.
+        """
+        return await self._run(
+            self._sync_client.ingest_files,
+            table_name=table_name,
+            source=source,
+            format=format,
+            columns=columns,
+            filter=filter,
+            parallelism=parallelism,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            mode=mode,
+            incremental_options=incremental_options,
+            transaction=self._transaction(transaction),
+            batch_size=batch_size,
+            batch_readahead=batch_readahead,
+            fragment_readahead=fragment_readahead,
+            compression=compression,
+            timeout=timeout,
+            progress=progress,
+            progress_interval=progress_interval,
+        )
+
+    async def prepare(
+        self,
+        query: str,
+        *,
+        transaction: Optional[AsyncTransaction] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncPreparedStatement:
+        """
+        Create a prepared statement.
+
+        Args:
+            query: SQL query to prepare.
+            transaction: Optional transaction to prepare within.
+            timeout: Timeout in seconds, see ``Client.query``.
+
+        Returns:
+            AsyncPreparedStatement object.
+        """
+        statement = await self._run(
+            self._sync_client.prepare,
+            query,
+            transaction=self._transaction(transaction),
+            timeout=timeout,
+        )
+        return AsyncPreparedStatement(statement, self._executor)
+
+    def prepared_statement_cache_info(self) -> CacheInfo:
+        """Get the statistics of the prepared statement cache."""
+        return self._sync_client.prepared_statement_cache_info()
+
+    def result_cache_info(self) -> CacheInfo:
+        """Get the statistics of the result cache."""
+        return self._sync_client.result_cache_info()
+
+    def metadata_cache_info(self) -> CacheInfo:
+        """Get the statistics of the metadata cache."""
+        return self._sync_client.metadata_cache_info()
+
+    def invalidate_result_cache(self, query: Optional[str] = None) -> None:
+        """Remove results from the result cache, see ``Client.invalidate_result_cache``."""
+        self._sync_client.invalidate_result_cache(query)
+
+    async def get_catalogs(self, *, timeout: Optional[float] = None) -> AsyncRecordBatchStream:
+        """Get list of catalogs from the server."""
+        return self._stream(await self._run(self._sync_client.get_catalogs, timeout=timeout))
+
+    async def get_schemas(
+        self,
+        *,
+        catalog: Optional[str] = None,
+        schema_pattern: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncRecordBatchStream:
+        """Get list of schemas from the server, see ``Client.get_schemas``."""
+        reader = await self._run(
+            self._sync_client.get_schemas,
+            catalog=catalog,
+            schema_pattern=schema_pattern,
+            timeout=timeout,
+        )
+        return self._stream(reader)
+
+    async def get_tables(
+        self,
+        *,
+        catalog: Optional[str] = None,
+        schema_pattern: Optional[str] = None,
+        table_pattern: Optional[str] = None,
+        include_schema: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncRecordBatchStream:
+        """Get list of tables from the server, see ``Client.get_tables``."""
+        reader = await self._run(
+            self._sync_client.get_tables,
+            catalog=catalog,
+            schema_pattern=schema_pattern,
+            table_pattern=table_pattern,
+            include_schema=include_schema,
+            timeout=timeout,
+        )
+        return self._stream(reader)
+
+    async def get_table_schemas(
+        self,
+        *,
+        catalog: Optional[str] = None,
+        schema: Optional[str] = None,
+        table_pattern: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, pa.Schema]:
+        """Get the Arrow schemas of the tables of a schema, see ``Client.get_table_schemas``."""
+        return await self._run(
+            self._sync_client.get_table_schemas,
+            catalog=catalog,
+            schema=schema,
+            table_pattern=table_pattern,
+            timeout=timeout,
+        )
+
+    async def begin_transaction(self, *, timeout: Optional[float] = None) -> AsyncTransaction:
+        """
+        Begin a new transaction.
+
+        Example:
+            >>> async with await client.begin_transaction():
+            ...     await client.execute("INSERT INTO users (name) VALUES ('Alice')")
+        """
+        transaction = await self._run(self._sync_client.begin_transaction, timeout=timeout)
+        return AsyncTransaction(transaction, self._executor)
+
+    async def commit_transaction(self, transaction: AsyncTransaction) -> None:
+        """Commit a transaction."""
+        await transaction.commit()
+
+    async def rollback_transaction(self, transaction: AsyncTransaction) -> None:
+        """Rollback a transaction."""
+        await transaction.rollback()
+
+    async def close(self) -> None:
+        """Close the client connection."""
+        if self._client is not None:
+            await self._run(self._client.close)
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        """Async context manager entry."""
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
@@ -0,0 +1,376 @@
+"""
+Client-side caches.
+
+This module provides the caches used by the Altertable client to avoid
+repeating round trips to the server.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+import pyarrow as pa
+
+if TYPE_CHECKING:
+    from altertable_flightsql.client import PreparedStatement
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """Cache statistics."""
+
+    hits: int
+    """Number of lookups served from the cache."""
+
+    misses: int
+    """Number of lookups not found in the cache."""
+
+    size: int
+    """Current number of entries, or bytes for caches bounded by size."""
+
+    maxsize: int
+    """Maximum number of entries, or bytes for caches bounded by size."""
+
+
+class PreparedStatementCache:
+    """
+    LRU cache of live prepared statements.
+
+    Statements are shared by every caller asking for the same key, each
+    call handing out a lease on the statement. Closing a cached statement
+    releases the lease instead of closing it on the server, so callers can
+    keep using ``with client.prepare(...) as stmt:``. Evicted statements
+    are closed with ``ClosePreparedStatement`` once their last lease is
+    released; statements never closed by their callers are released with
+    the session.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of prepared statements kept open.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+
+        self._maxsize = maxsize
+        self._statements: OrderedDict[Hashable, PreparedStatement] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional["PreparedStatement"]:
+        """Get a cached statement, marking it as most recently used."""
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._statements.move_to_end(key)
+            statement._leases += 1
+            return statement
+
+    def put(self, key: Hashable, statement: "PreparedStatement") -> "PreparedStatement":
+        """
+        Add a statement to the cache, evicting the least recently used ones.
+
+        Returns:
+            The cached statement for the key, leased to the caller. If another
+            statement was cached for the same key in the meantime, it is
+            returned and the new one is closed.
+        """
+        evicted = []
+        with self._lock:
+            existing = self._statements.get(key)
+            if existing is not None:
+                evicted.append(statement)
+                statement = existing
+            else:
+                statement._cache = self
+                statement._cached = True
+                self._statements[key] = statement
+                while len(self._statements) > self._maxsize:
+                    _, oldest = self._statements.popitem(last=False)
+                    evicted.extend(self._evicted(oldest))
+            statement._leases += 1
+
+        self._close(evicted)
+        return statement
+
+    def evict(self, predicate) -> None:
+        """Evict the statements whose key matches a predicate, closing those not leased."""
+        with self._lock:
+            keys = [key for key in self._statements if predicate(key)]
+            evicted = [
+                closed for key in keys for closed in self._evicted(self._statements.pop(key))
+            ]
+
+        self._close(evicted)
+
+    def release(self, statement: "PreparedStatement") -> bool:
+        """
+        Release a lease on a statement.
+
+        Returns:
+            Whether the statement was evicted and this was its last lease, in
+            which case the caller closes it on the server.
+        """
+        with self._lock:
+            statement._leases = max(statement._leases - 1, 0)
+            if statement._cached or statement._leases:
+                return False
+            statement._cache = None
+            return True
+
+    def clear(self) -> None:
+        """Evict and close all statements."""
+        self.evict(lambda key: True)
+
+    def info(self) -> CacheInfo:
+        """Get the cache statistics."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._statements),
+                maxsize=self._maxsize,
+            )
+
+    @staticmethod
+    def _evicted(statement: "PreparedStatement") -> list["PreparedStatement"]:
+        """Mark a statement removed from the cache, returning it if it can be closed now."""
+        statement._cached = False
+        if statement._leases:
+            # Closed by the release of its last lease
+            return []
+        statement._cache = None
+        return [statement]
+
+    def _close(self, statements: list["PreparedStatement"]) -> None:
+        for statement in statements:
+            try:
+                statement.close()
+            except pa.ArrowException:
+                # The statement is gone from the cache either way; the server
+                # releases it with the session.
+                pass
+
+
+class MetadataCache:
+    """
+    Cache of metadata lookups, whose entries expire after a TTL.
+
+    Entries are invalidated as a whole, by the client, when it changes the
+    tables of the server.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Time in seconds entries stay valid.
+        """
+        if ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+
+        self._ttl = ttl
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached entry, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Add an entry to the cache."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        """Get the cache statistics. The cache is not bounded, so ``maxsize`` is 0."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits, misses=self._misses, size=len(self._entries), maxsize=0
+            )
+
+
+DEFAULT_RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class _CachedResult:
+    data: Union[pa.Buffer, str]
+    """Serialized IPC stream in memory, or path of an IPC file on disk."""
+
+    nbytes: int
+    expires_at: Optional[float]
+
+
+class ResultCache:
+    """
+    LRU cache of query results, bounded by size.
+
+    Results are stored as Arrow IPC, either in memory or in files of a
+    directory, and served back without copies: tables read from the cache
+    reference the cached buffers, or the memory-mapped files.
+
+    Example:
+        >>> cache = ResultCache(max_bytes=64 * 1024 * 1024, ttl=60)
+        >>> client = Client(username="user", password="pass", result_cache=cache)
+        >>> client.query("SELECT * FROM events").read_all()  # Fetched from the server
+        >>> client.query("SELECT * FROM events").read_all()  # Served from the cache
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+        *,
+        ttl: Optional[float] = None,
+        directory: Optional[Union[str, os.PathLike]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum size of the cached results in bytes, as
+                serialized IPC (default: 256 MiB).
+            ttl: Time in seconds results stay valid (default: None, until
+                evicted or invalidated).
+            directory: Directory storing the results as memory-mapped IPC
+                files (default: None, results are kept in memory). Pass an
+                empty string to use a new temporary directory.
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        if directory == "":
+            directory = tempfile.mkdtemp(prefix="altertable-results-")
+        elif directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+        self._results: OrderedDict[Hashable, _CachedResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[pa.Table]:
+        """Get a cached result, marking it as most recently used."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None and (
+                result.expires_at is not None and result.expires_at <= time.monotonic()
+            ):
+                self._remove(key)
+                result = None
+            if result is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._results.move_to_end(key)
+            return self._read(result)
+
+    def put(self, key: Hashable, table: pa.Table) -> None:
+        """
+        Add a result to the cache, evicting the least recently used ones.
+
+        Results larger than the whole cache are not cached.
+        """
+        result = self._write(table)
+        with self._lock:
+            if key in self._results:
+                self._remove(key)
+            if result.nbytes > self._max_bytes:
+                self._discard(result)
+                return
+            self._results[key] = result
+            self._nbytes += result.nbytes
+            while self._nbytes > self._max_bytes:
+                self._remove(next(iter(self._results)))
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """
+        Remove results from the cache.
+
+        Args:
+            predicate: Callable selecting the keys to remove (default: None,
+                remove every result).
+        """
+        with self._lock:
+            for key in [key for key in self._results if predicate is None or predicate(key)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every result."""
+        self.invalidate()
+
+    def info(self) -> CacheInfo:
+        """Get the cache statistics, with sizes in bytes."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                size=self._nbytes,
+                maxsize=self._max_bytes,
+            )
+
+    def _write(self, table: pa.Table) -> _CachedResult:
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        if self._directory is None:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            buffer = sink.getvalue()
+            return _CachedResult(buffer, buffer.size, expires_at)
+
+        path = os.path.join(self._directory, f"{uuid.uuid4().hex}.arrow")
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return _CachedResult(path, os.path.getsize(path), expires_at)
+
+    def _read(self, result: _CachedResult) -> pa.Table:
+        if isinstance(result.data, str):
+            return pa.ipc.open_file(pa.memory_map(result.data)).read_all()
+        return pa.ipc.open_stream(result.data).read_all()
+
+    def _remove(self, key: Hashable) -> None:
+        result = self._results.pop(key)
+        self._nbytes -= result.nbytes
+        self._discard(result)
+
+    def _discard(self, result: _CachedResult) -> None:
+        if isinstance(result.data, str):
+            try:
+                # Tables still mapping the file keep it readable until released
+                os.remove(result.data)
+            except OSError:
+                pass
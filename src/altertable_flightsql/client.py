@@ -4,17 +4,55 @@ Altertable client implementation.
 This module provides a high-level Python client for Altertable.
 """
 
+import concurrent.futures
+import contextvars
+import functools
+import hashlib
+import itertools
 import json
-from collections.abc import Mapping, Sequence
+import os
+import queue
+import re
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 import pyarrow as pa
 import pyarrow.flight as flight
 from google.protobuf import any_pb2
 
+from altertable_flightsql.cache import (
+    CacheInfo,
+    MetadataCache,
+    PreparedStatementCache,
+    ResultCache,
+)
+from altertable_flightsql.export import DEFAULT_ROW_GROUP_SIZE, ExportWriter, get_extension
 from altertable_flightsql.generated import arrow_flight_sql_pb2 as sql_pb2
+from altertable_flightsql.ingest import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ROWS,
+    Ingestor,
+    IngestProgress,
+    report_progress,
+)
+from altertable_flightsql.instrumentation import (
+    CountingReader,
+    CountingWriter,
+    Instrumentation,
+    InstrumentationMiddlewareFactory,
+    Span,
+    current_operation,
+    current_span,
+    operation,
+    traced,
+)
+from altertable_flightsql.retry import RetryPolicy, resumable
 
 
 def _pack_command(cmd) -> bytes:
@@ -30,6 +68,57 @@ def _unpack_command(bytes, packed):
     any_msg.Unpack(packed)
 
 
+T = TypeVar("T")
+
+# Statements whose results can be cached
+_READ_ONLY_QUERY = re.compile(r"^\s*\(?\s*(select|with|values|from|show|describe)\b", re.IGNORECASE)
+
+# Statements changing the tables of the server
+_DDL_STATEMENT = re.compile(
+    r"^\s*(create|drop|alter|rename|attach|detach|comment)\b", re.IGNORECASE
+)
+
+# Table written by a statement, as a possibly qualified and quoted name
+_WRITTEN_TABLE = re.compile(
+    r"^\s*(?:insert\s+(?:or\s+\w+\s+)?into|update|delete\s+from|merge\s+into|"
+    r"truncate(?:\s+table)?|copy|(?:create|drop|alter)(?:\s+or\s+replace)?"
+    r"(?:\s+temp(?:orary)?)?\s+table(?:\s+if(?:\s+not)?\s+exists)?)"
+    r"\s+((?:\"[^\"]+\"|[\w$]+)(?:\s*\.\s*(?:\"[^\"]+\"|[\w$]+))*)",
+    re.IGNORECASE,
+)
+
+
+def _written_table(statement: str) -> Optional[str]:
+    """Get the unqualified name of the table a statement writes, None if unknown."""
+    match = _WRITTEN_TABLE.match(statement)
+    if match is None:
+        return None
+    return match.group(1).split(".")[-1].strip().strip('"')
+
+
+def _ipc_digest(data: Union[pa.Table, pa.RecordBatch]) -> str:
+    """Hash the IPC serialization of Arrow data."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, data.schema) as writer:
+        writer.write(data)
+    return hashlib.sha256(sink.getvalue()).hexdigest()
+
+
+def _get_codec(compression: Optional[Union[str, pa.Codec]]) -> Optional[pa.Codec]:
+    """Validate an IPC compression setting."""
+    if compression is None or isinstance(compression, pa.Codec):
+        return compression
+    if compression == "uncompressed":
+        return None
+    try:
+        available = pa.Codec.is_available(compression)
+    except ValueError:
+        available = False
+    if not available:
+        raise ValueError(f"Unsupported compression codec: {compression!r}")
+    return pa.Codec(compression)
+
+
 class IngestTableMode(Enum):
     """Mode for ingesting data into a table."""
 
@@ -57,15 +146,16 @@ class IngestIncrementalOptions:
 class BearerAuthMiddleware(flight.ClientMiddleware):
     """Client middleware that adds Bearer token authentication to all requests."""
 
-    def __init__(self, factory: "BearerAuthMiddlewareFactory"):
+    def __init__(self, factory: "BearerAuthMiddlewareFactory", send_token: bool = True):
         self._factory = factory
+        self._send_token = send_token
 
     def sending_headers(self):
         """A callback before headers are sent."""
         headers = {}
 
-        if self._factory.token:
-            headers[b"authorization"] = self._factory.token
+        if self._send_token and (token := self._factory.token):
+            headers[b"authorization"] = token
 
         return headers
 
@@ -75,14 +165,139 @@ class BearerAuthMiddleware(flight.ClientMiddleware):
 
 
 class BearerAuthMiddlewareFactory(flight.ClientMiddlewareFactory):
-    """Factory for creating Bearer authentication middleware."""
+    """
+    Factory for creating Bearer authentication middleware.
+
+    The token is shared by every call of the client, which may run on
+    several threads, so it is read and replaced under a lock.
+    """
 
     def __init__(self):
-        self.token = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._token: Optional[Union[str, bytes]] = None
+
+    @property
+    def token(self) -> Optional[Union[str, bytes]]:
+        """Bearer token sent with every call, the last one received from the server."""
+        with self._lock:
+            return self._token
+
+    @token.setter
+    def token(self, token: Optional[Union[str, bytes]]) -> None:
+        with self._lock:
+            self._token = token
+
+    def refresh(
+        self, expired_token: Optional[Union[str, bytes]], authenticate: Callable[[], None]
+    ) -> None:
+        """
+        Replace an expired token by running ``authenticate`` again.
+
+        Calls failing concurrently with the same token share a single
+        handshake: the first one runs it, the others wait for it and reuse
+        the new token.
+        """
+        with self._refresh_lock:
+            if self.token == expired_token:
+                authenticate()
 
     def start_call(self, info):
         """Create middleware instance for a new call."""
-        return BearerAuthMiddleware(self)
+        # The handshake sends basic credentials, not the (possibly expired) token
+        return BearerAuthMiddleware(self, send_token=info.method != flight.FlightMethod.HANDSHAKE)
+
+
+# Actions safe to run twice, running CreatePreparedStatement again only leaves a statement unused
+_IDEMPOTENT_ACTIONS = frozenset(
+    {"CancelQuery", "CreatePreparedStatement", "GetSessionOptions", "SetSessionOptions"}
+)
+
+
+class _RetryingClient:
+    """
+    Flight client wrapper retrying failed calls.
+
+    Calls failing with UNAUTHENTICATED are retried once after a new
+    handshake. Planning and result streams are safe to retry. Actions are
+    only retried when running them twice has no effect on data (see
+    ``_IDEMPOTENT_ACTIONS``); others, e.g. ending a transaction, may have
+    run before failing, so ``call_once`` raises the error once the token is
+    renewed. Uploads (``do_put``) are only retried by ``call`` when their
+    data is in memory and binding it again is harmless, e.g. statement
+    parameters; updates go through ``call_once``, and other upload streams
+    pick the new token up once they are reopened.
+
+    Planning is also retried on transient errors with the retry policy, if
+    any. Result streams are resumed by ``ResumableStreamReader`` instead.
+    """
+
+    def __init__(
+        self,
+        client: flight.FlightClient,
+        auth: BearerAuthMiddlewareFactory,
+        reauthenticate: Callable[[Optional[Union[str, bytes]]], None],
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.flight_client = client
+        self._auth = auth
+        self._reauthenticate = reauthenticate
+        self._retry_policy = retry_policy
+
+    def get_flight_info(
+        self,
+        descriptor: flight.FlightDescriptor,
+        options: Optional[flight.FlightCallOptions] = None,
+    ) -> flight.FlightInfo:
+        def get_flight_info() -> flight.FlightInfo:
+            return self.call(lambda: self.flight_client.get_flight_info(descriptor, options))
+
+        if self._retry_policy is None:
+            return get_flight_info()
+        return self._retry_policy.call(get_flight_info)
+
+    def do_get(
+        self, ticket: flight.Ticket, options: Optional[flight.FlightCallOptions] = None
+    ) -> flight.FlightStreamReader:
+        def do_get() -> flight.FlightStreamReader:
+            reader = self.flight_client.do_get(ticket, options)
+            # Authentication errors surface with the first message, read along the schema
+            _ = reader.schema
+            return reader
+
+        return self.call(do_get)
+
+    def do_action(
+        self, action: flight.Action, options: Optional[flight.FlightCallOptions] = None
+    ) -> list[flight.Result]:
+        def do_action() -> list[flight.Result]:
+            return list(self.flight_client.do_action(action, options))
+
+        if action.type in _IDEMPOTENT_ACTIONS:
+            return self.call(do_action)
+        return self.call_once(do_action)
+
+    def call(self, call: Callable[[], T]) -> T:
+        """Make a call, retrying it once after re-authenticating if the token expired."""
+        token = self._auth.token
+        try:
+            return call()
+        except flight.FlightUnauthenticatedError:
+            self._reauthenticate(token)
+            return call()
+
+    def call_once(self, call: Callable[[], T]) -> T:
+        """Make a call that must not run twice, re-authenticating if the token expired."""
+        token = self._auth.token
+        try:
+            return call()
+        except flight.FlightUnauthenticatedError:
+            # Renew the token for the next calls, the caller decides whether to run it again
+            self._reauthenticate(token)
+            raise
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.flight_client, name)
 
 
 class Client:
@@ -110,6 +325,15 @@ class Client:
         port: int = 443,
         tls: bool = True,
         auto_commit: bool = False,
+        prepared_statement_cache_size: int = 0,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        result_compression: Optional[str] = None,
+        result_batch_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        timeout: Optional[float] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache_ttl: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         """
         Initialize an Altertable client.
@@ -123,6 +347,48 @@ class Client:
             port: Server port (default: 443).
             tls: Whether to use TLS/SSL (default: True).
             auto_commit: Whether to auto-commit transactions (default: False).
+            prepared_statement_cache_size: Maximum number of prepared statements
+                kept open and reused by ``prepare`` for the same SQL text,
+                transaction, catalog and schema (default: 0, disabled).
+                Cached statements are shared by all the callers of ``prepare``.
+            compression: Default IPC buffer compression for uploaded data, as a
+                codec name ("lz4" or "zstd") or a ``pyarrow.Codec`` with a
+                compression level (default: None, uncompressed). Applies to
+                ``ingest``, ``execute`` and prepared statement parameters, and
+                can be overridden per call.
+            result_compression: Codec the server is asked to use for result
+                streams ("lz4" or "zstd"), sent as the ``result_compression``
+                session option. Servers that do not support it ignore it.
+                Compressed results are decompressed transparently
+                (default: None).
+            result_batch_size: Preferred number of rows per record batch of
+                result streams, sent as the ``result_batch_size`` session
+                option. Servers that do not support it ignore it; use
+                ``QueryResult.rechunk`` to enforce a batch size on the client
+                (default: None).
+            instrumentation: Instrumentation receiving a span per RPC, with
+                timings, row and byte counts (default: None, disabled). When
+                enabled, result streams are always wrapped in a reader
+                counting the rows it reads.
+            timeout: Default timeout in seconds of each call to the server
+                (default: None, no timeout). Methods accept a ``timeout``
+                argument overriding it.
+            result_cache: Cache of the results of read-only queries, keyed by
+                server, username, SQL text, catalog, schema and parameters
+                (default: None, disabled). Queries within a transaction
+                bypass it. A cache can be shared by several clients. Results
+                reading a table are invalidated when the client writes it with
+                ``execute``, ``ingest`` or a prepared update.
+            metadata_cache_ttl: Time in seconds the results of
+                ``get_catalogs``, ``get_schemas``, ``get_tables`` and
+                ``get_table_schemas`` are cached (default: None, disabled).
+                The cache is cleared when the client creates, replaces or
+                alters tables, by ``ingest`` or by DDL statements.
+            retry_policy: Policy retrying idempotent calls on transient
+                errors: planning, metadata lookups and result streams, which
+                resume where they broke off (default: None, no retries).
+                When set, result streams are always wrapped in a reader
+                resuming them.
         """
 
         # Build location URI
@@ -134,88 +400,567 @@ class Client:
         self._username = username
         self._password = password
         self._auto_commit = auto_commit
-        self._transaction = None
+        # Implicit transaction of the current thread or task, set by ``with transaction:``
+        self._current_transaction: contextvars.ContextVar[Optional[Transaction]] = (
+            contextvars.ContextVar("altertable_transaction", default=None)
+        )
+        self._catalog = catalog
+        self._schema = schema
+        self._compression = _get_codec(compression)
+        self._instrumentation = instrumentation
+        self._timeout = timeout
+        self._result_cache = result_cache
+        self._metadata_cache = MetadataCache(metadata_cache_ttl) if metadata_cache_ttl else None
+        # Transactions whose DDL invalidates the metadata cache again when they end
+        self._metadata_transactions: set[bytes] = set()
+        # Tables written by transactions, whose cached results are invalidated again on end
+        self._result_transactions: dict[bytes, set[Optional[str]]] = {}
+        # Transactions begun and not ended yet, rolled back when a pool takes the client back
+        self._open_transactions: dict[bytes, Transaction] = {}
+
+        self._auth_middleware = BearerAuthMiddlewareFactory()
+        self._middleware: list[flight.ClientMiddlewareFactory] = [self._auth_middleware]
+        if instrumentation is not None:
+            self._middleware.append(InstrumentationMiddlewareFactory(instrumentation))
+        self._retry_policy = retry_policy
+        self._client = _RetryingClient(
+            flight.FlightClient(location, middleware=self._middleware),
+            self._auth_middleware,
+            self._reauthenticate,
+            retry_policy,
+        )
+        self._endpoint_clients: dict[str, _RetryingClient] = {}
+        self._endpoint_clients_lock = threading.Lock()
+        self._prepared_statements = (
+            PreparedStatementCache(prepared_statement_cache_size)
+            if prepared_statement_cache_size
+            else None
+        )
+        self._result_compression = result_compression
+        self._result_batch_size = result_batch_size
+        self._client.authenticate_basic_token(self._username, self._password, self._call_options())
 
-        auth_middleware = BearerAuthMiddlewareFactory()
-        self._client = flight.FlightClient(location, middleware=[auth_middleware])
-        self._client.authenticate_basic_token(self._username, self._password)
+        if options := self._session_options():
+            self._set_options(options)
 
+    def _session_options(self) -> dict[str, sql_pb2.SessionOptionValue]:
+        """Get the session options set by the client, restored after re-authenticating."""
         options = {}
-        if catalog:
-            options["catalog"] = sql_pb2.SessionOptionValue(string_value=catalog)
+        if self._catalog:
+            options["catalog"] = sql_pb2.SessionOptionValue(string_value=self._catalog)
 
-        if schema:
-            options["schema"] = sql_pb2.SessionOptionValue(string_value=schema)
+        if self._schema:
+            options["schema"] = sql_pb2.SessionOptionValue(string_value=self._schema)
 
-        if options:
-            self._set_options(options)
+        if self._result_compression:
+            options["result_compression"] = sql_pb2.SessionOptionValue(
+                string_value=self._result_compression
+            )
 
-    def _set_options(self, options: Mapping[str, sql_pb2.SessionOptionValue]):
+        if self._result_batch_size:
+            options["result_batch_size"] = sql_pb2.SessionOptionValue(
+                int64_value=self._result_batch_size
+            )
+        return options
+
+    def _reauthenticate(self, expired_token: Optional[Union[str, bytes]]) -> None:
+        """Replace an expired token by running the handshake again, without reconnecting."""
+
+        def authenticate() -> None:
+            client = self._client.flight_client
+            client.authenticate_basic_token(self._username, self._password, self._call_options())
+            # The server may have dropped the session along with the token
+            if options := self._session_options():
+                cmd = sql_pb2.SetSessionOptionsRequest(session_options=options)
+                action = flight.Action("SetSessionOptions", _pack_command(cmd))
+                list(client.do_action(action, self._call_options()))
+
+        self._auth_middleware.refresh(expired_token, authenticate)
+
+    def _set_options(
+        self,
+        options: Mapping[str, sql_pb2.SessionOptionValue],
+        timeout: Optional[float] = None,
+    ):
         cmd = sql_pb2.SetSessionOptionsRequest(session_options=options)
         action = flight.Action("SetSessionOptions", _pack_command(cmd))
-        list(self._client.do_action(action))
+        self._client.do_action(action, self._call_options(timeout=timeout))
+
+    def _call_options(
+        self,
+        *,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> flight.FlightCallOptions:
+        """Build the options of a Flight call, falling back to the client defaults."""
+        codec = self._compression if compression is None else _get_codec(compression)
+        return flight.FlightCallOptions(
+            timeout=self._timeout if timeout is None else timeout,
+            write_options=pa.ipc.IpcWriteOptions(compression=codec),
+        )
 
-    def _execute_query_command(self, cmd) -> flight.FlightStreamReader:
+    def _execute_query_command(self, cmd, timeout: Optional[float] = None) -> "QueryResult":
         """Execute a Flight SQL query command and return the result stream."""
+        if self._metadata_cache is not None:
+            key = (type(cmd).__name__, cmd.SerializeToString(deterministic=True))
+            table = self._cached_metadata(
+                key, lambda: self._execute_query_command_uncached(cmd, timeout).read_all()
+            )
+            return QueryResult(self, None, _TableReader(table))
+        return self._execute_query_command_uncached(cmd, timeout)
+
+    def _execute_query_command_uncached(
+        self, cmd, timeout: Optional[float] = None
+    ) -> "QueryResult":
+        options = self._call_options(timeout=timeout)
         descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
-        info = self._client.get_flight_info(descriptor)
-        return self._client.do_get(info.endpoints[0].ticket)
+        info = self._client.get_flight_info(descriptor, options)
+        return self._read_flight_info(info, options=options)
+
+    def _cached_metadata(self, key: tuple, load: Callable[[], T]) -> T:
+        """Get a metadata lookup from the metadata cache, loading it on a miss."""
+        if self._metadata_cache is None:
+            return load()
+        # Lookups default to the session catalog and schema
+        key = (*key, self._catalog, self._schema)
+        value = self._metadata_cache.get(key)
+        if value is None:
+            value = load()
+            self._metadata_cache.put(key, value)
+        return value
+
+    def _invalidate_results(self, table: Optional[str], transaction_id: Optional[bytes]) -> None:
+        """
+        Remove the cached results of the queries reading a table after it was written.
+
+        Queries are matched on the table name appearing in their SQL text, so
+        that results are never served stale. Every result is removed when the
+        written table is unknown (None).
+        """
+        if self._result_cache is None:
+            return
+        if table is None:
+            self._result_cache.invalidate()
+        else:
+            pattern = re.compile(rf"\b{re.escape(table)}\b", re.IGNORECASE)
+            self._result_cache.invalidate(lambda key: bool(pattern.search(key[2])))
+        if transaction_id:
+            # Queries outside the transaction may cache the old rows until it commits
+            self._result_transactions.setdefault(transaction_id, set()).add(table)
+
+    def _invalidate_written(self, statement: str, transaction_id: Optional[bytes]) -> None:
+        """Invalidate the caches after a statement that may have written tables."""
+        if _DDL_STATEMENT.match(statement):
+            self._invalidate_metadata(transaction_id)
+        if not _READ_ONLY_QUERY.match(statement):
+            self._invalidate_results(_written_table(statement), transaction_id)
+
+    def _invalidate_metadata(self, transaction_id: Optional[bytes]) -> None:
+        """Clear the metadata cache after the tables of the server changed."""
+        if self._metadata_cache is None:
+            return
+        self._metadata_cache.clear()
+        if transaction_id:
+            # A rollback reverts the change, and other sessions only see it on commit
+            self._metadata_transactions.add(transaction_id)
+
+    def _get_endpoint_client(self, location: flight.Location) -> _RetryingClient:
+        """Get a client connected to an endpoint location, sharing this client's session."""
+        uri = location.uri.decode()
+        if uri.startswith("arrow-flight-reuse-connection:"):
+            return self._client
+
+        with self._endpoint_clients_lock:
+            if uri not in self._endpoint_clients:
+                self._endpoint_clients[uri] = _RetryingClient(
+                    flight.FlightClient(location, middleware=self._middleware),
+                    self._auth_middleware,
+                    self._reauthenticate,
+                    self._retry_policy,
+                )
+            return self._endpoint_clients[uri]
+
+    def _open_endpoint(
+        self,
+        endpoint: flight.FlightEndpoint,
+        options: Optional[flight.FlightCallOptions] = None,
+    ) -> flight.FlightStreamReader:
+        """Open the result stream of an endpoint, trying each of its locations in turn."""
+        if not endpoint.locations:
+            return self._client.do_get(endpoint.ticket, options)
+
+        error: Optional[Exception] = None
+        for location in endpoint.locations:
+            try:
+                return self._get_endpoint_client(location).do_get(endpoint.ticket, options)
+            except flight.FlightUnavailableError as e:
+                error = e
+        raise error
+
+    def _stream_opener(
+        self, options: Optional[flight.FlightCallOptions] = None
+    ) -> Callable[[flight.FlightEndpoint], Any]:
+        """
+        Get the callable opening endpoint streams.
+
+        Streams count the rows read when instrumented, and resume after
+        transient failures with the retry policy, if any.
+        """
+        if self._instrumentation is None:
+            open_stream = functools.partial(self._open_endpoint, options=options)
+        else:
+            open_stream = functools.partial(
+                self._open_counted_endpoint, current_operation(), options=options
+            )
+        return resumable(open_stream, self._retry_policy)
+
+    def _open_counted_endpoint(
+        self,
+        operation_name: Optional[str],
+        endpoint: flight.FlightEndpoint,
+        options: Optional[flight.FlightCallOptions] = None,
+    ) -> CountingReader:
+        with operation(operation_name):
+            reader = self._open_endpoint(endpoint, options)
+            return CountingReader(reader, current_span())
+
+    def _current_span(self) -> Optional[Span]:
+        """Get the span of the last call made by this client in the current context."""
+        if self._instrumentation is None:
+            return None
+        return current_span()
+
+    def _read_flight_info(
+        self,
+        info: flight.FlightInfo,
+        *,
+        parallel: bool = False,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+        options: Optional[flight.FlightCallOptions] = None,
+    ) -> "QueryResult":
+        """Read the result stream of every endpoint of a FlightInfo."""
+        if (
+            len(info.endpoints) == 1
+            and self._instrumentation is None
+            and self._retry_policy is None
+        ):
+            reader = self._open_endpoint(info.endpoints[0], options)
+        elif parallel:
+            reader = MultiEndpointReader(
+                info.schema,
+                info.endpoints,
+                self._stream_opener(options),
+                ordered=ordered,
+                max_workers=max_workers,
+            )
+        else:
+            reader = _SequentialEndpointReader(
+                info.schema, info.endpoints, self._stream_opener(options)
+            )
+        return QueryResult(self, info, reader)
+
+    def _cancel_query(self, info: flight.FlightInfo, timeout: Optional[float] = None) -> bool:
+        """Ask the server to cancel a query, returning whether it is cancelled or cancelling."""
+        request = sql_pb2.ActionCancelQueryRequest(info=info.serialize())
+        action = flight.Action("CancelQuery", _pack_command(request))
+        try:
+            results = self._client.do_action(action, self._call_options(timeout=timeout))
+        except pa.ArrowNotImplementedError:
+            return False
+
+        result = sql_pb2.ActionCancelQueryResult()
+        _unpack_command(results[0].body.to_pybytes(), result)
+        return result.result in (
+            sql_pb2.ActionCancelQueryResult.CANCEL_RESULT_CANCELLED,
+            sql_pb2.ActionCancelQueryResult.CANCEL_RESULT_CANCELLING,
+        )
+
+    def _result_cache_key(
+        self,
+        query: Optional[str],
+        transaction_id: Optional[bytes],
+        parameters: Optional[Union[pa.Table, pa.RecordBatch]] = None,
+    ) -> Optional[tuple]:
+        """Get the result cache key of a query, or None if its result must not be cached."""
+        if (
+            self._result_cache is None
+            or query is None
+            or transaction_id
+            or self._current_transaction.get() is not None
+            or not _READ_ONLY_QUERY.match(query)
+        ):
+            return None
+        digest = _ipc_digest(parameters) if parameters is not None else None
+        # Results are only shared by clients of the same user on the same server
+        return (self._location.uri, self._username, query, self._catalog, self._schema, digest)
+
+    def _cache_result(self, key: tuple, result: "QueryResult") -> "QueryResult":
+        """Read a whole result into the result cache."""
+        table = result.read_all()
+        self._result_cache.put(key, table)
+        return QueryResult(self, result.info, _TableReader(table))
 
     def _get_transaction_id(self, transaction: Optional["Transaction"]) -> Optional[bytes]:
         """Get transaction ID from explicit transaction or current transaction."""
-        if transaction:
-            return transaction._transaction_id
-        elif self._transaction:
-            return self._transaction._transaction_id
-        return None
+        transaction = transaction or self._current_transaction.get()
+        return transaction._transaction_id if transaction else None
+
+    def _query_descriptor(
+        self, query: str, transaction: Optional["Transaction"]
+    ) -> flight.FlightDescriptor:
+        """Build the Flight descriptor of a SQL query."""
+        # Create SQL query command
+        cmd = sql_pb2.CommandStatementQuery()
+        cmd.query = query
+        if txn_id := self._get_transaction_id(transaction):
+            cmd.transaction_id = txn_id
 
-    def set_catalog(self, catalog: str):
-        self._set_options({"catalog": sql_pb2.SessionOptionValue(string_value=catalog)})
+        # Create Flight descriptor
+        return flight.FlightDescriptor.for_command(_pack_command(cmd))
+
+    def set_catalog(self, catalog: str, *, timeout: Optional[float] = None):
+        self._set_options(
+            {"catalog": sql_pb2.SessionOptionValue(string_value=catalog)}, timeout=timeout
+        )
+        self._catalog = catalog
 
-    def set_schema(self, schema: str):
-        self._set_options({"schema": sql_pb2.SessionOptionValue(string_value=schema)})
+    def set_schema(self, schema: str, *, timeout: Optional[float] = None):
+        self._set_options(
+            {"schema": sql_pb2.SessionOptionValue(string_value=schema)}, timeout=timeout
+        )
+        self._schema = schema
 
+    @traced("query")
     def query(
         self,
         query: str,
         *,
         transaction: Optional["Transaction"] = None,
-    ) -> flight.FlightStreamReader:
+        parallel: bool = False,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> "QueryResult":
         """
         Execute a SQL query and return a result stream.
 
+        When the server splits the result across several endpoints, all of them
+        are read and merged into a single stream.
+
         Args:
             query: SQL query string to execute.
             transaction: Optional transaction to execute query within.
+            parallel: Whether to fetch the endpoints concurrently on a thread
+                pool (default: False, endpoints are fetched one after another).
+            ordered: Whether to return the endpoints in the order advertised by
+                the server (default: True). When False, batches are returned as
+                soon as any endpoint produces them.
+            max_workers: Maximum number of endpoints fetched concurrently when
+                ``parallel`` is set (default: one per endpoint, up to 8).
+            timeout: Timeout in seconds of each call to the server, overriding
+                the client default. Result streams must be fully read within
+                it.
+            use_cache: Whether to use the client's result cache, if any
+                (default: True). Results that are not cached yet are read
+                whole before being returned.
 
         Returns:
-            FlightStreamReader for reading query results.
+            QueryResult streaming the query results, which can also cancel
+            the query on the server.
+
+        Raises:
+            flight.FlightTimedOutError: If a call did not complete in time.
 
         Example:
             >>> reader = client.query("SELECT * FROM users WHERE age > 18")
             >>> for batch in reader:
             ...     print(batch.to_pandas())
+
+            >>> # Fetch every endpoint of a large scan at once
+            >>> table = client.query("SELECT * FROM events", parallel=True).read_all()
         """
-        # Create SQL query command
-        cmd = sql_pb2.CommandStatementQuery()
-        cmd.query = query
-        if txn_id := self._get_transaction_id(transaction):
-            cmd.transaction_id = txn_id
+        cache_key = (
+            self._result_cache_key(query, self._get_transaction_id(transaction))
+            if use_cache
+            else None
+        )
+        if cache_key is not None and (table := self._result_cache.get(cache_key)) is not None:
+            return QueryResult(self, None, _TableReader(table))
 
-        # Create Flight descriptor
-        descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
+        descriptor = self._query_descriptor(query, transaction)
+        options = self._call_options(timeout=timeout)
 
         # Get flight info and create reader
-        info = self._client.get_flight_info(descriptor)
-        endpoint = info.endpoints[0]
+        info = self._client.get_flight_info(descriptor, options)
+
+        result = self._read_flight_info(
+            info, parallel=parallel, ordered=ordered, max_workers=max_workers, options=options
+        )
+        return self._cache_result(cache_key, result) if cache_key is not None else result
+
+    @traced("submit_query")
+    def submit_query(
+        self,
+        query: str,
+        *,
+        transaction: Optional["Transaction"] = None,
+        timeout: Optional[float] = None,
+    ) -> "QueryHandle":
+        """
+        Submit a SQL query without waiting for the server to plan it.
+
+        The query is planned by a ``GetFlightInfo`` call made on a background
+        thread, and the returned handle reports when that call completed.
+        Endpoints are only known once the whole FlightInfo is returned;
+        results are then read with ``QueryHandle.result``.
+
+        Args:
+            query: SQL query string to execute.
+            transaction: Optional transaction to execute query within.
+            timeout: Timeout in seconds of each call to the server, see
+                ``query``.
+
+        Returns:
+            QueryHandle of the running query.
+
+        Example:
+            >>> handle = client.submit_query("SELECT * FROM events")
+            >>> while not handle.wait(timeout=1.0):
+            ...     print("still planning...")
+            >>> table = handle.result(parallel=True).read_all()
+        """
+        descriptor = self._query_descriptor(query, transaction)
+        options = self._call_options(timeout=timeout)
+
+        future: Future = Future()
+
+        def plan() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._client.get_flight_info(descriptor, options))
+            except BaseException as e:
+                future.set_exception(e)
+
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run, args=(plan,), name="altertable-submit", daemon=True
+        ).start()
+        return QueryHandle(self, future, options)
+
+    @traced("export")
+    def export(
+        self,
+        query: str,
+        path: Union[str, os.PathLike],
+        *,
+        format: str = "parquet",
+        transaction: Optional["Transaction"] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = None,
+        partitioned: bool = False,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Execute a SQL query and write its results to files.
+
+        Batches are written as they are received, so the memory used stays
+        bounded by ``row_group_size`` rows, whatever the size of the result.
+
+        Args:
+            query: SQL query string to execute.
+            path: Path of the written file, or of the directory of the written
+                files when ``partitioned`` is set.
+            format: File format, "parquet", "arrow" (IPC file) or "csv"
+                (default: "parquet").
+            transaction: Optional transaction to execute query within.
+            row_group_size: Number of rows per Parquet row group or IPC record
+                batch (default: 1048576).
+            compression: Compression codec of Parquet and IPC files, or of
+                CSV files as a whole, see ``ExportWriter``.
+            partitioned: Whether to write one file per result endpoint, named
+                ``part-<n>.<format>`` in the ``path`` directory, with the
+                extension of the compression for CSV files (default: False, a
+                single file).
+            parallel: Whether to fetch the endpoints concurrently, see
+                ``query``. Partitioned exports write the files concurrently.
+            max_workers: Maximum number of endpoints fetched concurrently when
+                ``parallel`` is set (default: one per endpoint, up to 8).
+            timeout: Timeout in seconds of each call to the server, see
+                ``query``. Result streams must be fully written within it.
+
+        Returns:
+            Number of rows written.
 
-        return self._client.do_get(endpoint.ticket)
+        Example:
+            >>> client.export("SELECT * FROM events", "events.parquet")
 
+            >>> # One file per endpoint, written concurrently
+            >>> client.export(
+            ...     "SELECT * FROM events", "events/", partitioned=True, parallel=True
+            ... )
+        """
+        extension = get_extension(format, compression)
+        writer_options = {
+            "format": format,
+            "row_group_size": row_group_size,
+            "compression": compression,
+        }
+
+        if not partitioned:
+            result = self.query(
+                query,
+                transaction=transaction,
+                parallel=parallel,
+                max_workers=max_workers,
+                timeout=timeout,
+                use_cache=False,
+            )
+            with ExportWriter(path, result.schema, **writer_options) as writer:
+                for chunk in result:
+                    writer.write_batch(chunk.data)
+            return writer.rows_written
+
+        options = self._call_options(timeout=timeout)
+        info = self._client.get_flight_info(self._query_descriptor(query, transaction), options)
+        open_stream = self._stream_opener(options)
+        os.makedirs(path, exist_ok=True)
+
+        def export_endpoint(index: int, endpoint: flight.FlightEndpoint) -> int:
+            reader = open_stream(endpoint)
+            file_path = os.path.join(path, f"part-{index:05d}{extension}")
+            with ExportWriter(file_path, info.schema, **writer_options) as writer:
+                while True:
+                    try:
+                        chunk = reader.read_chunk()
+                    except StopIteration:
+                        break
+                    writer.write_batch(chunk.data)
+            return writer.rows_written
+
+        endpoints = list(info.endpoints)
+        workers = (max_workers or min(len(endpoints), _DEFAULT_FETCH_WORKERS)) if parallel else 1
+        with ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="altertable-export"
+        ) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, export_endpoint, index, endpoint)
+                for index, endpoint in enumerate(endpoints)
+            ]
+            return sum(future.result() for future in futures)
+
+    @traced("execute")
     def execute(
         self,
         query: str,
         *,
         transaction: Optional["Transaction"] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
     ) -> int:
         """
         Execute a SQL update statement (INSERT, UPDATE, DELETE, etc.).
@@ -223,6 +968,9 @@ class Client:
         Args:
             query: SQL update statement to execute.
             transaction: Optional transaction to execute within.
+            compression: IPC compression of the upload, overriding the client
+                default ("uncompressed" disables it).
+            timeout: Timeout in seconds, see ``query``.
 
         Returns:
             Number of rows affected.
@@ -241,21 +989,30 @@ class Client:
         descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
 
         # Execute via DoPut
-        writer, reader = self._client.do_put(descriptor, pa.schema([]))
-        # Signal end of upload while keeping the read side open to receive the
-        # server's DoPutUpdateResult metadata. writer.close() would close both
-        # sides prematurely, causing reader.read() to return None.
-        writer.done_writing()
+        def put() -> Optional[pa.Buffer]:
+            writer, reader = self._client.do_put(
+                descriptor,
+                pa.schema([]),
+                options=self._call_options(compression=compression, timeout=timeout),
+            )
+            # Signal end of upload while keeping the read side open to receive the
+            # server's DoPutUpdateResult metadata. writer.close() would close both
+            # sides prematurely, causing reader.read() to return None.
+            writer.done_writing()
+            metadata = reader.read()
+            writer.close()
+            return metadata
 
-        # Read result from metadata
+        # Read result from metadata. The server may have applied the statement before
+        # the call failed, so it is not run again after re-authenticating.
         result = sql_pb2.DoPutUpdateResult()
-        metadata = reader.read()
-        if metadata:
+        if metadata := self._client.call_once(put):
             result.ParseFromString(bytes(metadata))
 
-        writer.close()
+        self._invalidate_written(query, txn_id)
         return result.record_count
 
+    @traced("ingest")
     def ingest(
         self,
         *,
@@ -266,6 +1023,8 @@ class Client:
         mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
         incremental_options: Optional[IngestIncrementalOptions] = None,
         transaction: Optional["Transaction"] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
     ) -> flight.FlightStreamWriter:
         """
         Bulk ingest data into a table using Apache Arrow Flight.
@@ -290,6 +1049,11 @@ class Client:
                 - primary_key: Columns to use as primary key
                 - cursor_field: Columns used to determine which row to keep in case of conflict on primary key
             transaction: Optional transaction to execute ingestion within.
+            compression: IPC buffer compression of the uploaded batches
+                ("lz4" or "zstd"), overriding the client default
+                ("uncompressed" disables it).
+            timeout: Timeout in seconds of the upload stream, which must be
+                closed within it, overriding the client default.
 
         Returns:
             FlightStreamWriter for writing record batches to the table.
@@ -337,9 +1101,357 @@ class Client:
             cmd.options["cursor_field"] = json.dumps(incremental_options.cursor_field)
 
         descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
-        writer, _ = self._client.do_put(descriptor, schema)
+        writer, _ = self._client.do_put(
+            descriptor, schema, options=self._call_options(compression=compression, timeout=timeout)
+        )
+        if self._instrumentation is not None:
+            writer = CountingWriter(writer, current_span())
+
+        if self._metadata_cache is None and self._result_cache is None:
+            return writer
+
+        def on_close() -> None:
+            # The table is created, replaced or appended to once the upload completes
+            if mode != IngestTableMode.APPEND:
+                self._invalidate_metadata(txn_id)
+            self._invalidate_results(table_name, txn_id)
+
+        return _ClosingWriter(writer, on_close)
+
+    def ingestor(
+        self,
+        *,
+        table_name: str,
+        schema: pa.Schema,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional["Transaction"] = None,
+        max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        flush_interval: Optional[float] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> Ingestor:
+        """
+        Bulk ingest data into a table, coalescing small writes into larger batches.
+
+        Streaming many tiny record batches is much slower than streaming a few
+        well-sized ones. The returned ingestor buffers rows and batches and
+        sends them once ``max_rows`` rows or ``max_bytes`` bytes are pending,
+        after ``flush_interval`` seconds, or when it is closed.
+
+        Args:
+            table_name: Name of the table to ingest data into.
+            schema: PyArrow schema defining the table structure.
+            schema_name: Optional schema name, see ``ingest``.
+            catalog_name: Optional catalog name, see ``ingest``.
+            mode: Table creation/append mode, see ``ingest``.
+            incremental_options: Options for incremental ingestion, see ``ingest``.
+            transaction: Optional transaction to execute ingestion within.
+            max_rows: Number of pending rows triggering a flush (default: 100000).
+            max_bytes: Number of pending bytes triggering a flush (default: 4 MiB).
+            flush_interval: Maximum time in seconds data stays buffered
+                (default: None, only flush on size and close).
+            compression: IPC buffer compression, see ``ingest``.
+            timeout: Timeout in seconds of the upload stream, see ``ingest``.
+
+        Returns:
+            Ingestor for writing rows and record batches to the table. It
+            should be closed after all data is written, or used as a context
+            manager.
+
+        Example:
+            >>> with client.ingestor(table_name="events", schema=schema) as ingestor:
+            ...     for event in events:
+            ...         ingestor.write_row(event)
+            >>> print(f"Ingested {ingestor.rows_written} rows")
+        """
+        writer = self.ingest(
+            table_name=table_name,
+            schema=schema,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            mode=mode,
+            incremental_options=incremental_options,
+            transaction=transaction,
+            compression=compression,
+            timeout=timeout,
+        )
+        return Ingestor(
+            writer,
+            schema,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            flush_interval=flush_interval,
+        )
+
+    @traced("ingest_parallel")
+    def ingest_parallel(
+        self,
+        *,
+        table_name: str,
+        source: Union[pa.Table, pa.RecordBatchReader, Iterable[pa.RecordBatch], Any],
+        parallelism: int = 4,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional["Transaction"] = None,
+        batch_size: int = 65536,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Bulk ingest data into a table over several concurrent streams.
+
+        The table definition (``mode``) is applied by a first stream carrying
+        the first batch, then the remaining batches are spread across
+        ``parallelism`` streams appending to the table. All streams run
+        within a single transaction, committed only if every stream
+        succeeded. When a transaction is given, or a transaction is active on
+        the client, it is used instead and left open.
+
+        Args:
+            table_name: Name of the table to ingest data into.
+            source: Data to ingest. Can be:
+                - pyarrow.Table: Split into batches of ``batch_size`` rows
+                - pyarrow.dataset.Dataset or Scanner: Scanned batch by batch
+                - pyarrow.RecordBatchReader or an iterable of RecordBatches
+            parallelism: Number of concurrent ingestion streams (default: 4).
+            schema_name: Optional schema name, see ``ingest``.
+            catalog_name: Optional catalog name, see ``ingest``.
+            mode: Table creation/append mode, see ``ingest``.
+            incremental_options: Options for incremental ingestion, see ``ingest``.
+            transaction: Optional transaction to execute ingestion within.
+            batch_size: Number of rows per batch when splitting a table
+                (default: 65536).
+            compression: IPC buffer compression, see ``ingest``.
+            timeout: Timeout in seconds of each call to the server, including
+                each upload stream, overriding the client default.
+
+        Returns:
+            Number of rows sent to the server.
+
+        Example:
+            >>> import pyarrow.dataset as ds
+            >>> dataset = ds.dataset("s3://bucket/events/", format="parquet")
+            >>> rows = client.ingest_parallel(
+            ...     table_name="events", source=dataset, parallelism=8
+            ... )
+        """
+        if parallelism < 1:
+            raise ValueError(f"parallelism must be at least 1, got {parallelism}")
+
+        schema, batches = _get_source_batches(source, batch_size)
+
+        active_transaction = transaction or self._current_transaction.get()
+        owns_transaction = active_transaction is None
+        if owns_transaction:
+            active_transaction = self.begin_transaction(timeout=timeout)
+
+        ingest = functools.partial(
+            self.ingest,
+            table_name=table_name,
+            schema=schema,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            incremental_options=incremental_options,
+            transaction=active_transaction,
+            compression=compression,
+            timeout=timeout,
+        )
+
+        try:
+            rows = self._ingest_shards(ingest, mode, batches, parallelism)
+        except BaseException:
+            if owns_transaction:
+                self.rollback_transaction(active_transaction, timeout=timeout)
+            raise
+
+        if owns_transaction:
+            self.commit_transaction(active_transaction, timeout=timeout)
+        return rows
+
+    @traced("ingest_files")
+    def ingest_files(
+        self,
+        *,
+        table_name: str,
+        source: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]], Any],
+        format: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filter: Optional[Any] = None,
+        parallelism: int = 4,
+        schema_name: str = "",
+        catalog_name: str = "",
+        mode: IngestTableMode = IngestTableMode.CREATE_APPEND,
+        incremental_options: Optional[IngestIncrementalOptions] = None,
+        transaction: Optional["Transaction"] = None,
+        batch_size: int = 65536,
+        batch_readahead: int = 16,
+        fragment_readahead: int = 4,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[IngestProgress], None]] = None,
+        progress_interval: float = 1.0,
+    ) -> int:
+        """
+        Bulk ingest Parquet, Arrow IPC (Feather) or CSV files into a table.
+
+        Files are scanned with ``pyarrow.dataset``, reading ahead while the
+        batches are sent over ``parallelism`` concurrent streams, as with
+        ``ingest_parallel``. Local IPC files are memory-mapped, so their
+        batches are sent without being copied.
+
+        Args:
+            table_name: Name of the table to ingest data into.
+            source: File or directory path, list of file paths, or a
+                ``pyarrow.dataset.Dataset``.
+            format: File format, "parquet", "ipc" (or "arrow"/"feather") or
+                "csv" (default: inferred from the file extensions, Parquet for
+                directories).
+            columns: Columns to read (default: all columns).
+            filter: ``pyarrow.dataset.Expression`` selecting the rows to
+                ingest, pushed down to the file reader when possible.
+            parallelism: Number of concurrent ingestion streams (default: 4).
+            schema_name: Optional schema name, see ``ingest``.
+            catalog_name: Optional catalog name, see ``ingest``.
+            mode: Table creation/append mode, see ``ingest``.
+            incremental_options: Options for incremental ingestion, see ``ingest``.
+            transaction: Optional transaction to execute ingestion within, see
+                ``ingest_parallel``.
+            batch_size: Maximum number of rows per scanned batch (default: 65536).
+            batch_readahead: Number of batches read ahead per file (default: 16).
+            fragment_readahead: Number of files read ahead (default: 4).
+            compression: IPC buffer compression, see ``ingest``.
+            timeout: Timeout in seconds of each call to the server, see
+                ``ingest_parallel``.
+            progress: Callable receiving an ``IngestProgress`` with the rows
+                and bytes read so far and the throughput, every
+                ``progress_interval`` seconds and once done.
+            progress_interval: Time in seconds between progress reports
+                (default: 1).
+
+        Returns:
+            Number of rows sent to the server.
+
+        Example:
+            >>> import pyarrow.dataset as ds
+            >>> rows = client.ingest_files(
+            ...     table_name="events",
+            ...     source="exports/2024/",
+            ...     columns=["id", "kind", "created_at"],
+            ...     filter=ds.field("kind") != "debug",
+            ...     progress=lambda p: print(f"{p.rows_per_second:,.0f} rows/s"),
+            ... )
+        """
+        import pyarrow.dataset as ds
+
+        if isinstance(source, ds.Dataset):
+            dataset = source
+        else:
+            paths = (
+                [os.fspath(path) for path in source]
+                if isinstance(source, Sequence) and not isinstance(source, str)
+                else os.fspath(source)
+            )
+            dataset_format = _get_file_format(paths, format)
+            filesystem = None
+            if dataset_format == "ipc" and all(
+                "://" not in path for path in ([paths] if isinstance(paths, str) else paths)
+            ):
+                import pyarrow.fs
+
+                filesystem = pyarrow.fs.LocalFileSystem(use_mmap=True)
+            dataset = ds.dataset(paths, format=dataset_format, filesystem=filesystem)
+
+        scanner = dataset.scanner(
+            columns=list(columns) if columns is not None else None,
+            filter=filter,
+            batch_size=batch_size,
+            batch_readahead=batch_readahead,
+            fragment_readahead=fragment_readahead,
+        )
+        batches: Iterable[pa.RecordBatch] = scanner.to_batches()
+        if progress is not None:
+            batches = report_progress(batches, progress, progress_interval)
+
+        return self.ingest_parallel(
+            table_name=table_name,
+            source=pa.RecordBatchReader.from_batches(scanner.projected_schema, batches),
+            parallelism=parallelism,
+            schema_name=schema_name,
+            catalog_name=catalog_name,
+            mode=mode,
+            incremental_options=incremental_options,
+            transaction=transaction,
+            compression=compression,
+            timeout=timeout,
+        )
 
-        return writer
+    def _ingest_shards(
+        self,
+        ingest: Callable[..., flight.FlightStreamWriter],
+        mode: IngestTableMode,
+        batches: Iterator[pa.RecordBatch],
+        parallelism: int,
+    ) -> int:
+        """Send batches across concurrent ingestion streams, returning the number of rows sent."""
+        rows = 0
+
+        # Apply the table definition once before fanning out appends
+        if mode != IngestTableMode.APPEND:
+            with ingest(mode=mode) as writer:
+                if (first_batch := next(batches, None)) is not None:
+                    writer.write_batch(first_batch)
+                    rows += first_batch.num_rows
+
+        batch_queue: queue.Queue = queue.Queue(parallelism * 2)
+        stop = threading.Event()
+
+        def shard() -> int:
+            writer = None
+            shard_rows = 0
+            try:
+                while not stop.is_set():
+                    try:
+                        batch = batch_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if batch is _END_OF_STREAM:
+                        break
+                    if writer is None:
+                        writer = ingest(mode=IngestTableMode.APPEND)
+                    writer.write_batch(batch)
+                    shard_rows += batch.num_rows
+            except BaseException:
+                stop.set()
+                raise
+            finally:
+                if writer is not None:
+                    writer.close()
+            return shard_rows
+
+        with ThreadPoolExecutor(parallelism, thread_name_prefix="altertable-ingest") as executor:
+            # Each shard runs in a copy of the context, to keep the current operation
+            shards = [
+                executor.submit(contextvars.copy_context().run, shard) for _ in range(parallelism)
+            ]
+            try:
+                for batch in batches:
+                    if not _put_until_stopped(batch_queue, batch, stop):
+                        break
+            except BaseException:
+                stop.set()
+                raise
+            finally:
+                for _ in shards:
+                    _put_until_stopped(batch_queue, _END_OF_STREAM, stop)
+
+        # Raises the error of the first failed shard
+        return rows + sum(future.result() for future in shards)
 
     def _ingest_mode_to_table_definition_options(
         self, mode: IngestTableMode
@@ -365,11 +1477,13 @@ class Client:
                 if_exists=sql_pb2.CommandStatementIngest.TableDefinitionOptions.TableExistsOption.TABLE_EXISTS_OPTION_REPLACE,
             )
 
+    @traced("prepare")
     def prepare(
         self,
         query: str,
         *,
         transaction: Optional["Transaction"] = None,
+        timeout: Optional[float] = None,
     ) -> "PreparedStatement":
         """
         Create a prepared statement.
@@ -377,22 +1491,35 @@ class Client:
         Args:
             query: SQL query to prepare.
             transaction: Optional transaction to prepare within.
+            timeout: Timeout in seconds, see ``query``.
 
         Returns:
-            PreparedStatement object.
+            PreparedStatement object. When the prepared statement cache is
+            enabled, a previously prepared statement may be returned. Cached
+            statements are shared: every caller preparing the same SQL text in
+            the same transaction, catalog and schema gets the same object,
+            including callers on other threads, and closing it releases the
+            caller's lease. The statement is closed on the server once it is
+            evicted from the cache and every lease is released.
 
         Example:
             >>> stmt = client.prepare("SELECT * FROM users WHERE id = ?")
             >>> result = stmt.query(parameters={"id": 42})
         """
+        txn_id = self._get_transaction_id(transaction)
+        cache_key = (query, txn_id, self._catalog, self._schema)
+        if self._prepared_statements is not None:
+            if statement := self._prepared_statements.get(cache_key):
+                return statement
+
         # Create prepared statement request
         request = sql_pb2.ActionCreatePreparedStatementRequest(query=query)
-        if txn_id := self._get_transaction_id(transaction):
+        if txn_id:
             request.transaction_id = txn_id
 
         # Execute action
         action = flight.Action("CreatePreparedStatement", _pack_command(request))
-        results = list(self._client.do_action(action))
+        results = self._client.do_action(action, self._call_options(timeout=timeout))
 
         # Parse result
         result = sql_pb2.ActionCreatePreparedStatementResult()
@@ -403,35 +1530,94 @@ class Client:
         if result.parameter_schema:
             parameter_schema = pa.ipc.read_schema(pa.py_buffer(result.parameter_schema))
 
-        return PreparedStatement(
-            self._client, result.prepared_statement_handle, parameter_schema=parameter_schema
+        statement = PreparedStatement(
+            self,
+            result.prepared_statement_handle,
+            parameter_schema=parameter_schema,
+            query=query,
+            transaction_id=txn_id,
         )
+        if self._prepared_statements is not None:
+            statement = self._prepared_statements.put(cache_key, statement)
+
+        return statement
+
+    def prepared_statement_cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the prepared statement cache.
+
+        Returns:
+            CacheInfo with the hit and miss counters and the cache size.
+        """
+        if self._prepared_statements is None:
+            return CacheInfo(hits=0, misses=0, size=0, maxsize=0)
+        return self._prepared_statements.info()
+
+    def result_cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the result cache.
+
+        Returns:
+            CacheInfo with the hit and miss counters, and the cache size in bytes.
+        """
+        if self._result_cache is None:
+            return CacheInfo(hits=0, misses=0, size=0, maxsize=0)
+        return self._result_cache.info()
+
+    def metadata_cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the metadata cache.
+
+        Returns:
+            CacheInfo with the hit and miss counters and the number of entries.
+        """
+        if self._metadata_cache is None:
+            return CacheInfo(hits=0, misses=0, size=0, maxsize=0)
+        return self._metadata_cache.info()
+
+    def invalidate_result_cache(self, query: Optional[str] = None) -> None:
+        """
+        Remove results from the result cache.
+
+        Args:
+            query: SQL text whose results are removed, for every catalog,
+                schema and parameters (default: None, remove every result).
+        """
+        if self._result_cache is not None:
+            self._result_cache.invalidate(None if query is None else lambda key: key[2] == query)
 
-    def get_catalogs(self) -> flight.FlightStreamReader:
+    @traced("get_catalogs")
+    def get_catalogs(self, *, timeout: Optional[float] = None) -> "QueryResult":
         """
         Get list of catalogs from the server.
 
+        Args:
+            timeout: Timeout in seconds, see ``query``.
+
         Returns:
-            FlightStreamReader with catalog information.
+            QueryResult with catalog information.
         """
         cmd = sql_pb2.CommandGetCatalogs()
-        return self._execute_query_command(cmd)
+        return self._execute_query_command(cmd, timeout)
 
+    @traced("get_schemas")
     def get_schemas(
         self,
         *,
         catalog: Optional[str] = None,
         schema_pattern: Optional[str] = None,
-    ) -> flight.FlightStreamReader:
+        timeout: Optional[float] = None,
+    ) -> "QueryResult":
         """
         Get list of schemas from the server.
 
         Args:
             catalog: Optional catalog name filter (defaults to client catalog).
             schema_pattern: Optional schema name pattern (SQL LIKE syntax).
+            timeout: Timeout in seconds, see ``query``.
 
         Returns:
-            FlightStreamReader with schema information.
+            QueryResult with schema information.
         """
         cmd = sql_pb2.CommandGetDbSchemas()
         if catalog:
@@ -439,8 +1625,9 @@ class Client:
         if schema_pattern:
             cmd.db_schema_filter_pattern = schema_pattern
 
-        return self._execute_query_command(cmd)
+        return self._execute_query_command(cmd, timeout)
 
+    @traced("get_tables")
     def get_tables(
         self,
         *,
@@ -448,7 +1635,8 @@ class Client:
         schema_pattern: Optional[str] = None,
         table_pattern: Optional[str] = None,
         include_schema: bool = False,
-    ) -> flight.FlightStreamReader:
+        timeout: Optional[float] = None,
+    ) -> "QueryResult":
         """
         Get list of tables from the server.
 
@@ -457,9 +1645,10 @@ class Client:
             schema_pattern: Optional schema name pattern (defaults to client schema).
             table_pattern: Optional table name pattern.
             include_schema: Whether to include table schema in results.
+            timeout: Timeout in seconds, see ``query``.
 
         Returns:
-            FlightStreamReader with table information.
+            QueryResult with table information.
         """
         cmd = sql_pb2.CommandGetTables()
         if catalog:
@@ -470,19 +1659,72 @@ class Client:
             cmd.table_name_filter_pattern = table_pattern
         cmd.include_schema = include_schema
 
-        return self._execute_query_command(cmd)
+        return self._execute_query_command(cmd, timeout)
 
-    def begin_transaction(self) -> "Transaction":
+    @traced("get_table_schemas")
+    def get_table_schemas(
+        self,
+        *,
+        catalog: Optional[str] = None,
+        schema: Optional[str] = None,
+        table_pattern: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, pa.Schema]:
         """
-        Begin a new transaction.
+        Get the Arrow schemas of the tables of a schema.
+
+        Args:
+            catalog: Catalog name (defaults to client catalog).
+            schema: Schema name (defaults to client schema). When neither is
+                set, the tables of every schema are returned.
+            table_pattern: Optional table name pattern (SQL LIKE syntax).
+            timeout: Timeout in seconds, see ``query``.
 
         Returns:
-            Transaction context manager.
+            Mapping from table names to their schemas. Without a schema,
+            tables sharing a name in several schemas appear once.
 
         Example:
-            >>> # Using a transaction object
-            >>> txn = client.begin_transaction()
-            >>> client.execute("INSERT INTO users (name) VALUES ('Alice')", transaction=txn)
+            >>> schemas = client.get_table_schemas()
+            >>> if "users" not in schemas:
+            ...     client.execute("CREATE TABLE users (id INT, name VARCHAR)")
+        """
+        catalog = catalog or self._catalog
+        schema = schema or self._schema
+
+        def load() -> dict[str, pa.Schema]:
+            cmd = sql_pb2.CommandGetTables(include_schema=True)
+            if catalog:
+                cmd.catalog = catalog
+            if schema:
+                cmd.db_schema_filter_pattern = schema
+            if table_pattern:
+                cmd.table_name_filter_pattern = table_pattern
+            tables = self._execute_query_command_uncached(cmd, timeout).read_all()
+            return {
+                row["table_name"]: pa.ipc.read_schema(pa.py_buffer(row["table_schema"]))
+                for row in tables.to_pylist()
+                # The schema filter is a pattern, where "_" matches any character
+                if not schema or row["db_schema_name"] == schema
+            }
+
+        return dict(self._cached_metadata(("table_schemas", catalog, schema, table_pattern), load))
+
+    @traced("begin_transaction")
+    def begin_transaction(self, *, timeout: Optional[float] = None) -> "Transaction":
+        """
+        Begin a new transaction.
+
+        Args:
+            timeout: Timeout in seconds, see ``query``.
+
+        Returns:
+            Transaction context manager.
+
+        Example:
+            >>> # Using a transaction object
+            >>> txn = client.begin_transaction()
+            >>> client.execute("INSERT INTO users (name) VALUES ('Alice')", transaction=txn)
             >>> client.execute("INSERT INTO users (name) VALUES ('Bob')", transaction=txn)
             >>> client.commit_transaction(txn)
 
@@ -493,38 +1735,62 @@ class Client:
         """
         request = sql_pb2.ActionBeginTransactionRequest()
         action = flight.Action("BeginTransaction", _pack_command(request))
-        results = list(self._client.do_action(action))
+        results = self._client.do_action(action, self._call_options(timeout=timeout))
 
         result = sql_pb2.ActionBeginTransactionResult()
         _unpack_command(results[0].body.to_pybytes(), result)
         transaction = Transaction(self, result.transaction_id)
+        self._open_transactions[transaction._transaction_id] = transaction
         return transaction
 
-    def commit_transaction(self, transaction: "Transaction") -> None:
+    @traced("commit_transaction")
+    def commit_transaction(
+        self, transaction: "Transaction", *, timeout: Optional[float] = None
+    ) -> None:
         """
         Commit a transaction.
 
         Args:
             transaction: Transaction to commit.
+            timeout: Timeout in seconds, see ``query``.
         """
-        self._end_transaction(transaction, commit=True)
+        self._end_transaction(transaction, commit=True, timeout=timeout)
 
-    def rollback_transaction(self, transaction: "Transaction") -> None:
+    @traced("rollback_transaction")
+    def rollback_transaction(
+        self, transaction: "Transaction", *, timeout: Optional[float] = None
+    ) -> None:
         """
         Rollback a transaction.
 
         Args:
             transaction: Transaction to rollback.
+            timeout: Timeout in seconds, see ``query``.
         """
-        self._end_transaction(transaction, commit=False)
+        self._end_transaction(transaction, commit=False, timeout=timeout)
 
-    def _end_transaction(self, transaction: "Transaction", commit: bool) -> None:
+    def _end_transaction(
+        self, transaction: "Transaction", commit: bool, timeout: Optional[float] = None
+    ) -> None:
         """Internal method to end a transaction."""
         request = sql_pb2.ActionEndTransactionRequest()
         request.transaction_id = transaction._transaction_id
         transaction._closed = True
-        if self._transaction and self._transaction._transaction_id == transaction._transaction_id:
-            self._transaction = None
+        self._open_transactions.pop(transaction._transaction_id, None)
+        if self._prepared_statements is not None:
+            # Statements prepared within the transaction cannot outlive it
+            self._prepared_statements.evict(lambda key: key[1] == transaction._transaction_id)
+        current_transaction = self._current_transaction.get()
+        if (
+            current_transaction
+            and current_transaction._transaction_id == transaction._transaction_id
+        ):
+            self._current_transaction.set(None)
+        if transaction._transaction_id in self._metadata_transactions:
+            self._metadata_transactions.discard(transaction._transaction_id)
+            self._metadata_cache.clear()
+        for table in self._result_transactions.pop(transaction._transaction_id, ()):
+            self._invalidate_results(table, None)
 
         request.action = (
             sql_pb2.ActionEndTransactionRequest.END_TRANSACTION_COMMIT
@@ -533,10 +1799,17 @@ class Client:
         )
 
         action = flight.Action("EndTransaction", _pack_command(request))
-        list(self._client.do_action(action))
+        self._client.do_action(action, self._call_options(timeout=timeout))
 
     def close(self) -> None:
         """Close the client connection."""
+        if self._prepared_statements is not None:
+            self._prepared_statements.clear()
+        with self._endpoint_clients_lock:
+            endpoint_clients = list(self._endpoint_clients.values())
+            self._endpoint_clients.clear()
+        for endpoint_client in endpoint_clients:
+            endpoint_client.close()
         self._client.close()
 
     def __enter__(self) -> "Client":
@@ -553,23 +1826,34 @@ class Transaction:
         self._client = client
         self._transaction_id = transaction_id
         self._closed = False
+        self._context_token: Optional[contextvars.Token] = None
 
     def __enter__(self) -> "Transaction":
-        self._client._transaction = self
+        # Only the current thread or task uses the transaction implicitly
+        self._context_token = self._client._current_transaction.set(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        if not self._closed:
-            if exc_type is not None:
-                self.rollback()
-            else:
-                self.commit()
+        try:
+            if not self._closed:
+                if exc_type is not None:
+                    self.rollback()
+                else:
+                    self.commit()
+        finally:
+            self._reset_context()
+
+    def _reset_context(self) -> None:
+        """Restore the implicit transaction the current context had before entering."""
+        if self._context_token is not None:
+            self._client._current_transaction.reset(self._context_token)
+            self._context_token = None
 
-    def commit(self) -> None:
-        self._client.commit_transaction(self)
+    def commit(self, *, timeout: Optional[float] = None) -> None:
+        self._client.commit_transaction(self, timeout=timeout)
 
-    def rollback(self) -> None:
-        self._client.rollback_transaction(self)
+    def rollback(self, *, timeout: Optional[float] = None) -> None:
+        self._client.rollback_transaction(self, timeout=timeout)
 
 
 class PreparedStatement:
@@ -577,45 +1861,82 @@ class PreparedStatement:
     Represents a prepared SQL statement.
 
     Prepared statements can be executed multiple times with different parameters.
+    They can be shared by several threads. Since the result tickets of a
+    query may depend on the parameters bound to the statement on the server,
+    a statement has at most one result stream open: a call binding new
+    parameters first reads the rest of the previous stream into memory, so
+    that concurrent calls never read results of each other's parameters.
     """
 
     def __init__(
         self,
-        client: flight.FlightClient,
+        client: Client,
         handle: bytes,
         parameter_schema: Optional[pa.Schema] = None,
+        query: Optional[str] = None,
+        transaction_id: Optional[bytes] = None,
     ):
         """
         Initialize a prepared statement.
 
         Args:
-            client: FlightClient instance.
+            client: Client the statement was prepared with.
             handle: Prepared statement handle from server.
             parameter_schema: Optional parameter schema for the prepared statement.
+            query: SQL text of the statement, used to cache its results.
+            transaction_id: Transaction the statement was prepared within.
         """
-        self._client = client
+        self._owner = client
+        self._client = client._client
+        self._instrumentation = client._instrumentation
         self._handle = handle
         self._parameter_schema = parameter_schema
-
+        self._query = query
+        self._transaction_id = transaction_id
+        # Cache holding the statement, if any, with the number of callers it is leased to
+        self._cache: Optional[PreparedStatementCache] = None
+        self._cached = False
+        self._leases = 0
+        # Held from binding parameters until the query is planned with them
+        self._lock = threading.Lock()
+        # Held by the caller binding parameters, from releasing the open result until
+        # holding its own
+        self._claim_lock = threading.Lock()
+        # Result stream reading the parameters currently bound, if any
+        self._open_result: Optional[weakref.ref] = None
+
+    @traced("prepared_statement.query")
     def query(
         self,
         *,
         parameters: Optional[
             Union[pa.Table, pa.RecordBatch, Mapping[str, Any], Sequence[Any]]
         ] = None,
-    ) -> flight.FlightStreamReader:
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> "QueryResult":
         """
         Execute the prepared statement query.
 
+        Parameters are bound before the query is executed, so the results
+        always reflect the given parameters.
+
         Args:
             parameters: Optional parameters for the query. Can be:
                 - pyarrow.Table: A table of parameter values
                 - pyarrow.RecordBatch: A batch of parameter values
                 - Mapping[str, Any]: A dictionary mapping parameter names to values
                 - Sequence[Any]: A list of positional parameter values
+            compression: IPC compression of the parameter upload, overriding
+                the client default ("uncompressed" disables it).
+            timeout: Timeout in seconds of each call to the server, see
+                ``Client.query``.
+            use_cache: Whether to use the client's result cache, see
+                ``Client.query``.
 
         Returns:
-            FlightStreamReader with query results.
+            QueryResult with query results.
 
         Example:
             >>> # Using a dictionary
@@ -628,28 +1949,330 @@ class PreparedStatement:
             >>> batch = pa.record_batch({"id": [42], "name": ["Alice"]})
             >>> stmt.query(parameters=batch)
         """
-        cmd = sql_pb2.CommandPreparedStatementQuery()
-        cmd.prepared_statement_handle = self._handle
+        as_pyarrow = None if parameters is None else self._get_parameter_as_pyarrow(parameters)
+        cache_key = (
+            self._owner._result_cache_key(self._query, self._transaction_id, as_pyarrow)
+            if use_cache
+            else None
+        )
+        if (
+            cache_key is not None
+            and (table := self._owner._result_cache.get(cache_key)) is not None
+        ):
+            return QueryResult(self._owner, None, _TableReader(table))
+
+        options = self._owner._call_options(compression=compression, timeout=timeout)
+        with self._claim_lock:
+            self._claim()
+            info = self._bind_and_plan(as_pyarrow, options)
+            reader = _StatementResultReader(self, info.schema)
+            self._hold(reader)
+            reader._reader = self._owner._read_flight_info(info, options=options)._reader
+        result = QueryResult(self._owner, info, reader)
+        return self._owner._cache_result(cache_key, result) if cache_key is not None else result
+
+    @traced("prepared_statement.querymany")
+    def querymany(
+        self,
+        parameters: Union[
+            pa.Table,
+            pa.RecordBatch,
+            pa.RecordBatchReader,
+            Iterable[Union[pa.RecordBatch, Mapping[str, Any], Sequence[Any]]],
+        ],
+        *,
+        batch_size: int = 65536,
+        pipeline: bool = False,
+        max_workers: Optional[int] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> "QueryResult":
+        """
+        Execute the prepared statement query for many parameter batches.
+
+        The results of every parameter batch are returned as a single stream,
+        in the order of the batches. By default, the results of a batch are
+        read to the end before the next batch is bound, since binding changes
+        the parameters of the statement on the server.
 
+        With ``pipeline=True``, binding and planning the next batch overlaps
+        with fetching the results of the previous ones, so there is no serial
+        wait per batch. This is only correct with servers whose tickets do not
+        depend on the parameters bound to the statement once planned, for
+        instance because they hold the result or its own copy of the
+        parameters.
+
+        Args:
+            parameters: Parameter batches, see ``executemany``. Each batch is
+                bound and executed as a whole.
+            batch_size: Number of rows per batch when converting Python rows
+                (default: 65536).
+            pipeline: Whether to bind the next batches while the results of
+                the previous ones are fetched (default: False).
+            max_workers: Maximum number of result streams fetched concurrently
+                when pipelining (default: 8).
+            compression: IPC compression of the parameter uploads, see ``query``.
+            timeout: Timeout in seconds of each call to the server, see ``query``.
+
+        Returns:
+            QueryResult with the results of all batches, without ``info``.
+
+        Example:
+            >>> stmt = client.prepare("SELECT * FROM users WHERE id = $id")
+            >>> batches = (pa.record_batch({"id": [i]}) for i in range(100))
+            >>> table = stmt.querymany(batches).read_all()
+        """
+        options = self._owner._call_options(compression=compression, timeout=timeout)
+        batches = self._get_parameter_batches(parameters, batch_size)
+        first_batch = next(batches, None)
+        with self._claim_lock:
+            self._claim()
+            info = self._bind_and_plan(first_batch, options)
+            result = _StatementResultReader(self, info.schema)
+            result_ref = self._hold(result)
+
+            def endpoints() -> Iterator[flight.FlightEndpoint]:
+                yield from info.endpoints
+                for batch in batches:
+                    batch_info = self._bind_and_plan(batch, options, result_ref)
+                    if batch_info is None:
+                        # Released by closing the result, other callers may bind the statement
+                        return
+                    yield from batch_info.endpoints
+
+            if pipeline:
+                result._reader = MultiEndpointReader(
+                    info.schema,
+                    endpoints(),
+                    self._owner._stream_opener(options),
+                    max_workers=max_workers,
+                )
+            else:
+                # Endpoints are requested once the previous ones are read to the end
+                result._reader = _SequentialEndpointReader(
+                    info.schema, endpoints(), self._owner._stream_opener(options)
+                )
+        return QueryResult(self._owner, None, result)
+
+    def _bind(
+        self,
+        parameters: Union[pa.Table, pa.RecordBatch],
+        options: flight.FlightCallOptions,
+    ) -> None:
+        """Upload parameter values, switching to the updated handle if the server returns one."""
+        cmd = sql_pb2.CommandPreparedStatementQuery(prepared_statement_handle=self._handle)
         descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
-        info = self._client.get_flight_info(descriptor)
 
-        if parameters is not None:
+        def put() -> Optional[pa.Buffer]:
+            writer, reader = self._client.do_put(descriptor, parameters.schema, options=options)
+            writer.write(parameters)
+            if span := self._owner._current_span():
+                span.add(parameters.num_rows, parameters.nbytes)
+            # Keep the read side open to receive the DoPutPreparedStatementResult metadata.
+            writer.done_writing()
+            metadata = reader.read()
+            writer.close()
+            return metadata
+
+        if metadata := self._client.call(put):
+            result = sql_pb2.DoPutPreparedStatementResult()
+            result.ParseFromString(bytes(metadata))
+            if result.HasField("prepared_statement_handle"):
+                self._handle = result.prepared_statement_handle
+
+    def _claim(self) -> None:
+        """Release the statement from the open result, reading the rest of it into memory."""
+        with self._lock:
+            result = self._open_result() if self._open_result is not None else None
+            if result is None:
+                self._open_result = None
+        if result is not None:
+            result.drain()
+
+    def _hold(self, result: "_StatementResultReader") -> weakref.ref:
+        """Make a result stream the open result of the statement."""
+        result_ref = weakref.ref(result)
+        with self._lock:
+            self._open_result = result_ref
+        return result_ref
+
+    def _bind_and_plan(
+        self,
+        parameters: Optional[Union[pa.Table, pa.RecordBatch]],
+        options: flight.FlightCallOptions,
+        result_ref: Optional[weakref.ref] = None,
+    ) -> Optional[flight.FlightInfo]:
+        """
+        Bind parameters, if any, and plan the query with them, as one step.
+
+        Callers binding the statement on behalf of a result stream pass it as
+        ``result_ref``, and get None once the stream has been released.
+        """
+        with self._lock:
+            if result_ref is not None and self._open_result is not result_ref:
+                return None
+            if parameters is not None:
+                self._bind(parameters, options)
+            return self._get_flight_info(options)
+
+    def _get_flight_info(self, options: flight.FlightCallOptions) -> flight.FlightInfo:
+        """Execute the prepared statement with the currently bound parameters."""
+        cmd = sql_pb2.CommandPreparedStatementQuery(prepared_statement_handle=self._handle)
+        descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
+        return self._client.get_flight_info(descriptor, options)
+
+    @traced("prepared_statement.executemany")
+    def executemany(
+        self,
+        parameters: Union[
+            pa.Table,
+            pa.RecordBatch,
+            pa.RecordBatchReader,
+            Iterable[Union[pa.RecordBatch, Mapping[str, Any], Sequence[Any]]],
+        ],
+        *,
+        batch_size: int = 65536,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> list[int]:
+        """
+        Execute the prepared statement as an update for many parameter sets.
+
+        All parameter rows are streamed to the server in a single upload, so
+        the statement is executed for every row without a round trip per row.
+
+        Args:
+            parameters: Parameter sets. Can be:
+                - pyarrow.Table or pyarrow.RecordBatch: One row per parameter set
+                - pyarrow.RecordBatchReader or an iterable of RecordBatches
+                - An iterable of Mapping[str, Any] or Sequence[Any] rows
+            batch_size: Number of rows per batch when converting Python rows
+                (default: 65536).
+            compression: IPC compression of the parameter upload, see ``query``.
+            timeout: Timeout in seconds of the upload stream, see ``query``.
+
+        Returns:
+            Affected row counts reported by the server. Servers reporting one
+            count per uploaded batch return one entry per batch, otherwise a
+            single entry covers all parameter sets. A count of -1 means unknown.
+
+        Example:
+            >>> stmt = client.prepare("INSERT INTO users (id, name) VALUES (?, ?)")
+            >>> counts = stmt.executemany([(1, "Alice"), (2, "Bob")])
+            >>> print(f"Inserted {sum(counts)} rows")
+        """
+        batches = self._get_parameter_batches(parameters, batch_size)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return []
+
+        record_counts = self._execute_update(
+            first_batch.schema,
+            itertools.chain([first_batch], batches),
+            self._owner._call_options(compression=compression, timeout=timeout),
+        )
+        if self._query is not None:
+            self._owner._invalidate_written(
+                self._query, self._transaction_id or self._owner._get_transaction_id(None)
+            )
+        return record_counts
+
+    @traced("prepared_statement.execute")
+    def execute(
+        self,
+        *,
+        parameters: Optional[
+            Union[pa.Table, pa.RecordBatch, Mapping[str, Any], Sequence[Any]]
+        ] = None,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Execute the prepared statement as an update (INSERT, UPDATE, DELETE, etc.).
+
+        The server reuses the plan of the prepared statement, so the SQL text
+        is neither sent nor parsed again.
+
+        Args:
+            parameters: Optional parameters for the statement, see ``query``.
+            compression: IPC compression of the parameter upload, see ``query``.
+            timeout: Timeout in seconds, see ``query``.
+
+        Returns:
+            Number of rows affected, or -1 if unknown.
+
+        Example:
+            >>> stmt = client.prepare("UPDATE users SET age = $age WHERE id = $id")
+            >>> rows = stmt.execute(parameters={"id": 42, "age": 30})
+        """
+        options = self._owner._call_options(compression=compression, timeout=timeout)
+        if parameters is None:
+            record_counts = self._execute_update(pa.schema([]), [], options)
+        else:
             as_pyarrow = self._get_parameter_as_pyarrow(parameters)
-            writer, _ = self._client.do_put(descriptor, as_pyarrow.schema)
-            writer.write(as_pyarrow)
+            batches = as_pyarrow.to_batches() if isinstance(as_pyarrow, pa.Table) else [as_pyarrow]
+            record_counts = self._execute_update(as_pyarrow.schema, batches, options)
+
+        if self._query is not None:
+            self._owner._invalidate_written(
+                self._query, self._transaction_id or self._owner._get_transaction_id(None)
+            )
+        if any(count < 0 for count in record_counts):
+            return -1
+        return sum(record_counts)
+
+    def _execute_update(
+        self,
+        schema: pa.Schema,
+        batches: Iterable[pa.RecordBatch],
+        options: flight.FlightCallOptions,
+    ) -> list[int]:
+        """Upload parameter batches for a prepared update and read the update results."""
+        with self._claim_lock:
+            # Updates bind their parameters to the statement too
+            self._claim()
+            cmd = sql_pb2.CommandPreparedStatementUpdate(prepared_statement_handle=self._handle)
+            descriptor = flight.FlightDescriptor.for_command(_pack_command(cmd))
+
+            writer, reader = self._client.do_put(descriptor, schema, options=options)
+            span = self._owner._current_span()
+            for batch in batches:
+                writer.write_batch(batch)
+                if span:
+                    span.add(batch.num_rows, batch.nbytes)
+            # Keep the read side open to receive the DoPutUpdateResult metadata.
+            writer.done_writing()
+
+            record_counts = []
+            while (metadata := reader.read()) is not None:
+                result = sql_pb2.DoPutUpdateResult()
+                result.ParseFromString(bytes(metadata))
+                record_counts.append(result.record_count)
+
             writer.close()
+            return record_counts
 
-        return self._client.do_get(info.endpoints[0].ticket)
+    @traced("prepared_statement.close")
+    def close(self, *, timeout: Optional[float] = None) -> None:
+        """
+        Close the prepared statement and release server resources.
+
+        Statements handed out by the client's prepared statement cache are
+        only released by the caller; they are closed once evicted from the
+        cache and released by every caller.
+
+        Args:
+            timeout: Timeout in seconds, see ``query``.
+        """
+        if self._cache is not None and not self._cache.release(self):
+            return
 
-    def close(self) -> None:
-        """Close the prepared statement and release server resources."""
         request = sql_pb2.ActionClosePreparedStatementRequest(
             prepared_statement_handle=self._handle
         )
 
         action = flight.Action("ClosePreparedStatement", _pack_command(request))
-        list(self._client.do_action(action))
+        self._client.do_action(action, self._owner._call_options(timeout=timeout))
 
     def __enter__(self) -> "PreparedStatement":
         """Context manager entry."""
@@ -690,3 +2313,1270 @@ class PreparedStatement:
                 f"Unsupported parameter type: {type(parameters)}. "
                 "Expected Table, RecordBatch, Mapping, or Sequence."
             )
+
+    def _get_parameter_batches(
+        self,
+        parameters: Union[
+            pa.Table,
+            pa.RecordBatch,
+            pa.RecordBatchReader,
+            Iterable[Union[pa.RecordBatch, Mapping[str, Any], Sequence[Any]]],
+        ],
+        batch_size: int,
+    ) -> Iterator[pa.RecordBatch]:
+        """Convert parameter sets to a stream of record batches with a consistent schema."""
+        if isinstance(parameters, pa.Table):
+            yield from parameters.to_batches()
+            return
+        if isinstance(parameters, pa.RecordBatch):
+            yield parameters
+            return
+
+        rows: list = []
+        schema: Optional[pa.Schema] = None
+        for item in parameters:
+            if isinstance(item, pa.RecordBatch):
+                # Rows before the batch are sent first, keeping the parameter sets in order
+                if rows:
+                    batch = self._get_rows_as_pyarrow(rows, schema)
+                    schema = batch.schema
+                    rows = []
+                    yield batch
+                yield item
+            elif isinstance(item, (Mapping, Sequence)) and not isinstance(item, (str, bytes)):
+                rows.append(item)
+                if len(rows) >= batch_size:
+                    batch = self._get_rows_as_pyarrow(rows, schema)
+                    schema = batch.schema
+                    rows = []
+                    yield batch
+            else:
+                raise TypeError(
+                    f"Unsupported parameter set type: {type(item)}. "
+                    "Expected RecordBatch, Mapping, or Sequence."
+                )
+
+        if rows:
+            yield self._get_rows_as_pyarrow(rows, schema)
+
+    def _get_rows_as_pyarrow(
+        self, rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]], schema: Optional[pa.Schema]
+    ) -> pa.RecordBatch:
+        """Convert parameter rows to a record batch, reusing the schema of previous batches."""
+        if all(isinstance(row, Mapping) for row in rows):
+            return pa.RecordBatch.from_pylist(list(rows), schema=schema)
+
+        if self._parameter_schema is None:
+            raise ValueError(
+                "Cannot use positional parameters without parameter schema. "
+                "Use a dictionary (Mapping[str, Any]) instead."
+            )
+
+        for row in rows:
+            if len(row) != len(self._parameter_schema):
+                raise ValueError(
+                    f"Expected {len(self._parameter_schema)} parameters, but got {len(row)}"
+                )
+        columns = zip(*rows)
+        param_dict = {
+            field.name: list(column) for field, column in zip(self._parameter_schema, columns)
+        }
+
+        return pa.record_batch(param_dict, schema=schema)
+
+
+# File formats of pyarrow.dataset by file extension
+_FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+    ".csv": "csv",
+}
+
+
+def _get_file_format(paths: Union[str, list[str]], format: Optional[str]) -> str:
+    """Get the ``pyarrow.dataset`` format of files, inferring it from their extensions."""
+    if format is not None:
+        if format in ("arrow", "feather"):
+            return "ipc"
+        if format not in ("parquet", "ipc", "csv"):
+            raise ValueError(f"Unsupported file format: {format!r}")
+        return format
+
+    formats = {
+        _FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+        for path in ([paths] if isinstance(paths, str) else paths)
+    }
+    if formats == {None} and isinstance(paths, str):
+        # A directory
+        return "parquet"
+    if None in formats or len(formats) != 1:
+        raise ValueError("Cannot infer the format of the files, pass format explicitly")
+    return formats.pop()
+
+
+def _get_source_batches(
+    source: Union[pa.Table, pa.RecordBatchReader, Iterable[pa.RecordBatch], Any],
+    batch_size: int,
+) -> tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """Get the schema and a batch iterator of an ingestion source."""
+    if isinstance(source, pa.Table):
+        return source.schema, iter(source.to_batches(max_chunksize=batch_size))
+    if isinstance(source, pa.RecordBatch):
+        return source.schema, iter([source])
+    if hasattr(source, "to_batches") and hasattr(source, "projected_schema"):
+        # pyarrow.dataset.Scanner
+        return source.projected_schema, iter(source.to_batches())
+    if hasattr(source, "to_batches") and hasattr(source, "schema"):
+        # pyarrow.dataset.Dataset
+        return source.schema, iter(source.to_batches(batch_size=batch_size))
+    if isinstance(source, pa.RecordBatchReader):
+        return source.schema, iter(source)
+
+    batches = iter(source)
+    first_batch = next(batches, None)
+    if first_batch is None:
+        raise ValueError("Cannot infer the schema of an empty batch iterator")
+    return first_batch.schema, itertools.chain([first_batch], batches)
+
+
+class _ClosingWriter:
+    """Stream writer wrapper running a callback once the stream is closed."""
+
+    def __init__(self, writer: flight.FlightStreamWriter, on_close: Callable[[], None]):
+        self._writer = writer
+        self._on_close = on_close
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._writer, name)
+
+    def close(self) -> None:
+        self._writer.close()
+        self._on_close()
+
+    def __enter__(self) -> "_ClosingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_DEFAULT_FETCH_WORKERS = 8
+DEFAULT_READAHEAD_BYTES = 64 * 1024 * 1024
+_END_OF_STREAM = object()
+
+
+class _StreamFailure:
+    """Exception raised by a fetch worker, handed over to the consuming thread."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put_until_stopped(chunk_queue: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up once the reader is stopped."""
+    while not stop.is_set():
+        try:
+            chunk_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _EndpointCount:
+    """Number of endpoints dispatched to a shared queue, sent once all are known."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+
+def _dispatch_endpoints(
+    endpoints: Iterable[flight.FlightEndpoint],
+    submit: Callable[[flight.FlightEndpoint, queue.Queue], Any],
+    streams: queue.Queue,
+    shared_queue: Optional[queue.Queue],
+    max_buffered_chunks: int,
+    stop: threading.Event,
+) -> None:
+    """Submit a fetch worker for each endpoint, recording the order of their queues."""
+    count = 0
+    try:
+        for endpoint in endpoints:
+            if stop.is_set():
+                break
+            chunk_queue = shared_queue or queue.Queue(max_buffered_chunks)
+            if shared_queue is None:
+                streams.put(chunk_queue)
+            submit(endpoint, chunk_queue)
+            count += 1
+    except BaseException as e:
+        if shared_queue is None:
+            failed_queue = queue.Queue()
+            failed_queue.put(_StreamFailure(e))
+            streams.put(failed_queue)
+        else:
+            _put_until_stopped(shared_queue, _StreamFailure(e), stop)
+    finally:
+        if shared_queue is None:
+            streams.put(_END_OF_STREAM)
+        else:
+            _put_until_stopped(shared_queue, _EndpointCount(count), stop)
+
+
+def _fetch_endpoint(
+    open_stream: Callable[[flight.FlightEndpoint], flight.FlightStreamReader],
+    endpoint: flight.FlightEndpoint,
+    chunk_queue: queue.Queue,
+    *,
+    stop: threading.Event,
+    opened: list,
+) -> None:
+    """Fetch worker: stream the chunks of one endpoint into a queue."""
+    try:
+        if stop.is_set():
+            return
+        reader = open_stream(endpoint)
+        opened.append(reader)
+        while not stop.is_set():
+            try:
+                chunk = reader.read_chunk()
+            except StopIteration:
+                break
+            if not _put_until_stopped(chunk_queue, chunk, stop):
+                break
+    except BaseException as e:
+        _put_until_stopped(chunk_queue, _StreamFailure(e), stop)
+    finally:
+        _put_until_stopped(chunk_queue, _END_OF_STREAM, stop)
+
+
+class MultiEndpointReader:
+    """
+    Reader merging the result streams of several Flight endpoints.
+
+    Each endpoint is fetched with its own ``do_get`` call on a thread pool, and
+    the resulting chunks are handed back through a single stream. The reader
+    mirrors the ``FlightStreamReader`` API, so it can be iterated or drained
+    with ``read_all``/``read_pandas`` in the same way.
+
+    When ``ordered`` is true, chunks are returned endpoint by endpoint in the
+    order advertised by the server, while later endpoints are prefetched in the
+    background. Otherwise chunks are returned as soon as any endpoint produces
+    them.
+    """
+
+    def __init__(
+        self,
+        schema: pa.Schema,
+        endpoints: Iterable[flight.FlightEndpoint],
+        open_stream: Callable[[flight.FlightEndpoint], flight.FlightStreamReader],
+        *,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+        max_buffered_chunks: int = 8,
+    ):
+        """
+        Initialize the reader and start fetching the endpoints.
+
+        Args:
+            schema: Schema of the merged result.
+            endpoints: Endpoints to fetch. Endpoints can be produced lazily by
+                an iterator, in which case it is consumed on a background
+                thread while the first endpoints are already being fetched.
+            open_stream: Callable opening the ``do_get`` stream of an endpoint.
+            ordered: Whether to preserve the endpoint order (default: True).
+            max_workers: Maximum number of endpoints fetched concurrently
+                (default: one per endpoint, up to 8).
+            max_buffered_chunks: Maximum number of chunks buffered per queue
+                before the fetch workers wait for the consumer (default: 8).
+        """
+        self._schema = schema
+        self._stop = threading.Event()
+        self._opened: list[flight.FlightStreamReader] = []
+        # Chunk queues in endpoint order when ordered, a single shared queue otherwise
+        self._streams: queue.Queue = queue.Queue()
+        self._shared_queue = None if ordered else queue.Queue(max_buffered_chunks)
+
+        if max_workers is None:
+            max_workers = (
+                min(len(endpoints), _DEFAULT_FETCH_WORKERS)
+                if isinstance(endpoints, Sequence)
+                else _DEFAULT_FETCH_WORKERS
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(max_workers, 1), thread_name_prefix="altertable-fetch"
+        )
+
+        dispatch = functools.partial(
+            _dispatch_endpoints,
+            endpoints,
+            functools.partial(
+                self._executor.submit,
+                _fetch_endpoint,
+                open_stream,
+                stop=self._stop,
+                opened=self._opened,
+            ),
+            self._streams,
+            self._shared_queue,
+            max_buffered_chunks,
+            self._stop,
+        )
+        # Unordered dispatch ends by queuing the endpoint count behind the chunks, which
+        # can only happen once the consumer drains the shared queue
+        if isinstance(endpoints, Sequence) and ordered:
+            dispatch()
+        else:
+            threading.Thread(target=dispatch, name="altertable-dispatch", daemon=True).start()
+
+        self._chunks = self._iter_ordered() if ordered else self._iter_unordered()
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the merged result."""
+        return self._schema
+
+    def _get(self, chunk_queue: queue.Queue) -> Any:
+        item = chunk_queue.get()
+        if isinstance(item, _StreamFailure):
+            self.cancel()
+            raise item.error
+        return item
+
+    def _iter_ordered(self) -> Iterator[flight.FlightStreamChunk]:
+        while (chunk_queue := self._streams.get()) is not _END_OF_STREAM:
+            while (item := self._get(chunk_queue)) is not _END_OF_STREAM:
+                yield item
+        self.close()
+
+    def _iter_unordered(self) -> Iterator[flight.FlightStreamChunk]:
+        endpoint_count = None
+        finished = 0
+        while endpoint_count is None or finished < endpoint_count:
+            item = self._get(self._shared_queue)
+            if item is _END_OF_STREAM:
+                finished += 1
+            elif isinstance(item, _EndpointCount):
+                endpoint_count = item.count
+            else:
+                yield item
+        self.close()
+
+    def __iter__(self) -> Iterator[flight.FlightStreamChunk]:
+        return self._chunks
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        """Read the next chunk, raising StopIteration at the end of the stream."""
+        return next(self._chunks)
+
+    def read_all(self) -> pa.Table:
+        """Read all remaining chunks into a table."""
+        return pa.Table.from_batches([chunk.data for chunk in self._chunks], schema=self._schema)
+
+    def read_pandas(self, **options) -> Any:
+        """Read all remaining chunks into a pandas DataFrame."""
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        """Convert the stream to a ``pyarrow.RecordBatchReader``."""
+        return pa.RecordBatchReader.from_batches(
+            self._schema, (chunk.data for chunk in self._chunks)
+        )
+
+    def cancel(self) -> None:
+        """Stop fetching and cancel the endpoint streams that are still open."""
+        self._stop.set()
+        for reader in list(self._opened):
+            reader.cancel()
+        self.close()
+
+    def close(self) -> None:
+        """Release the fetch workers."""
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def __del__(self) -> None:
+        # Unblock the fetch workers if the reader is dropped before being drained.
+        self._stop.set()
+
+    def __enter__(self) -> "MultiEndpointReader":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.cancel()
+
+
+class _SequentialEndpointReader:
+    """
+    Reader of the result streams of several endpoints, one after the other.
+
+    Each endpoint is opened on the calling thread once the previous one is
+    exhausted, without fetch workers. Used when endpoints are not fetched in
+    parallel.
+    """
+
+    def __init__(
+        self,
+        schema: pa.Schema,
+        endpoints: Iterable[flight.FlightEndpoint],
+        open_stream: Callable[[flight.FlightEndpoint], flight.FlightStreamReader],
+    ):
+        self._schema = schema
+        self._endpoints = iter(endpoints)
+        self._open_stream = open_stream
+        self._reader: Optional[flight.FlightStreamReader] = None
+        self._cancelled = False
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._schema
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        while not self._cancelled:
+            if self._reader is None:
+                # Raises StopIteration after the last endpoint
+                self._reader = self._open_stream(next(self._endpoints))
+            try:
+                return self._reader.read_chunk()
+            except StopIteration:
+                self._reader = None
+        raise StopIteration
+
+    def __iter__(self) -> Iterator[flight.FlightStreamChunk]:
+        while True:
+            try:
+                yield self.read_chunk()
+            except StopIteration:
+                return
+
+    def read_all(self) -> pa.Table:
+        return pa.Table.from_batches([chunk.data for chunk in self], schema=self._schema)
+
+    def read_pandas(self, **options) -> Any:
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        return pa.RecordBatchReader.from_batches(self._schema, (chunk.data for chunk in self))
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        if self._reader is not None:
+            self._reader.cancel()
+
+    def __enter__(self) -> "_SequentialEndpointReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cancel()
+
+
+class _StatementResultReader:
+    """
+    Reader of a result stream of a prepared statement.
+
+    Tickets may depend on the parameters bound to the statement on the
+    server, so the statement has at most one such stream open: before
+    binding new parameters, it reads the rest of the previous stream into
+    memory with ``drain``.
+    """
+
+    def __init__(self, statement: "PreparedStatement", schema: pa.Schema):
+        self._statement = statement
+        self._schema = schema
+        self._reader: Any = None
+        # Held while reading, so that draining waits for the chunk being read
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._schema
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            try:
+                return self._reader.read_chunk()
+            except BaseException:
+                self._release()
+                raise
+
+    def drain(self) -> None:
+        """Read the rest of the stream into memory, releasing the statement."""
+        with self._lock:
+            if self._error is None:
+                try:
+                    self._reader = _TableReader(self._reader.read_all())
+                except Exception as e:
+                    # Raised to the owner of the stream with its next read
+                    self._error = e
+            self._release()
+
+    def __iter__(self) -> Iterator[flight.FlightStreamChunk]:
+        while True:
+            try:
+                yield self.read_chunk()
+            except StopIteration:
+                return
+
+    def read_all(self) -> pa.Table:
+        return pa.Table.from_batches([chunk.data for chunk in self], schema=self._schema)
+
+    def read_pandas(self, **options) -> Any:
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        return pa.RecordBatchReader.from_batches(self._schema, (chunk.data for chunk in self))
+
+    def cancel(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        self._release()
+
+    def _release(self) -> None:
+        statement = self._statement
+        with statement._lock:
+            if statement._open_result is not None and statement._open_result() is self:
+                statement._open_result = None
+
+    def __enter__(self) -> "_StatementResultReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cancel()
+
+
+class _ReadaheadBuffer:
+    """Bounded chunk buffer, filled by the background thread of a ``ReadaheadReader``."""
+
+    def __init__(self, max_chunks: int, max_bytes: int):
+        self._max_chunks = max_chunks
+        self._max_bytes = max_bytes
+        self._condition = threading.Condition()
+        self._chunks: deque[tuple[Any, int]] = deque()
+        self._bytes = 0
+        self._done = False
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+
+    def _is_full(self) -> bool:
+        return bool(self._chunks) and (
+            len(self._chunks) >= self._max_chunks or self._bytes >= self._max_bytes
+        )
+
+    def fill(self, reader: Any) -> None:
+        """Read chunks into the buffer until the end of the stream, waiting while it is full."""
+        try:
+            while True:
+                with self._condition:
+                    while self._is_full() and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                try:
+                    chunk = reader.read_chunk()
+                except StopIteration:
+                    return
+                nbytes = chunk.data.nbytes if chunk.data is not None else 0
+                with self._condition:
+                    self._chunks.append((chunk, nbytes))
+                    self._bytes += nbytes
+                    self._condition.notify_all()
+        except BaseException as e:
+            with self._condition:
+                self._error = e
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def get(self) -> Any:
+        """Take the next chunk, raising StopIteration at the end of the stream."""
+        with self._condition:
+            while not self._chunks and not self._done and not self._stopped:
+                self._condition.wait()
+            if self._chunks:
+                chunk, nbytes = self._chunks.popleft()
+                self._bytes -= nbytes
+                self._condition.notify_all()
+                return chunk
+            if self._error is not None and not self._stopped:
+                raise self._error
+        raise StopIteration
+
+    def stop(self) -> None:
+        """Stop filling the buffer and drop the buffered chunks."""
+        with self._condition:
+            self._stopped = True
+            self._chunks.clear()
+            self._bytes = 0
+            self._condition.notify_all()
+
+
+class ReadaheadReader:
+    """
+    Reader prefetching the chunks of a stream on a background thread.
+
+    Chunks are read ahead while the consumer processes the previous ones,
+    overlapping network waits with processing. The read-ahead buffer is
+    bounded in chunks and in bytes: the background thread stops reading once
+    either bound is reached, until the consumer catches up, so memory stays
+    capped whatever the pace of the consumer. A single chunk larger than
+    ``max_bytes`` is still read ahead, on its own.
+
+    Example:
+        >>> reader = ReadaheadReader(client.query("SELECT * FROM events"), max_chunks=16)
+        >>> for chunk in reader:
+        ...     transform(chunk.data)
+    """
+
+    def __init__(
+        self,
+        reader: Any,
+        *,
+        max_chunks: int = 8,
+        max_bytes: int = DEFAULT_READAHEAD_BYTES,
+    ):
+        """
+        Initialize the reader and start reading ahead.
+
+        Args:
+            reader: Stream reader to prefetch, with the ``FlightStreamReader``
+                interface.
+            max_chunks: Maximum number of chunks buffered (default: 8).
+            max_bytes: Number of buffered bytes at which reading pauses
+                (default: 64 MiB).
+        """
+        if max_chunks < 1:
+            raise ValueError(f"max_chunks must be at least 1, got {max_chunks}")
+
+        self._reader = reader
+        self._schema = reader.schema
+        # The thread only holds the buffer, so that dropping the reader stops it
+        self._buffer = _ReadaheadBuffer(max_chunks, max_bytes)
+        # Runs in a copy of the context, to keep the current operation
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._buffer.fill, reader),
+            name="altertable-readahead",
+            daemon=True,
+        ).start()
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the stream."""
+        return self._schema
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        """Read the next chunk, raising StopIteration at the end of the stream."""
+        return self._buffer.get()
+
+    def __iter__(self) -> Iterator[flight.FlightStreamChunk]:
+        while True:
+            try:
+                yield self._buffer.get()
+            except StopIteration:
+                return
+
+    def read_all(self) -> pa.Table:
+        """Read all remaining chunks into a table."""
+        return pa.Table.from_batches([chunk.data for chunk in self], schema=self._schema)
+
+    def read_pandas(self, **options) -> Any:
+        """Read all remaining chunks into a pandas DataFrame."""
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        """Convert the stream to a ``pyarrow.RecordBatchReader``."""
+        return pa.RecordBatchReader.from_batches(self._schema, (chunk.data for chunk in self))
+
+    def cancel(self) -> None:
+        """Stop reading ahead, drop the buffered chunks and cancel the stream."""
+        self._buffer.stop()
+        self._reader.cancel()
+
+    def __del__(self) -> None:
+        # Unblock the background thread if the reader is dropped before being drained
+        if (buffer := getattr(self, "_buffer", None)) is not None:
+            buffer.stop()
+
+    def __enter__(self) -> "ReadaheadReader":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.cancel()
+
+
+class RechunkReader:
+    """
+    Reader resizing the record batches of a stream.
+
+    Batches smaller than the target are coalesced with the following ones,
+    and batches larger than it are split with ``RecordBatch.slice``, without
+    copying. Only coalesced batches are copied, into a single contiguous
+    batch. The target is a maximum number of rows, of bytes, or both; a single
+    row larger than ``max_bytes`` still makes a batch on its own. Chunks
+    returned have no ``app_metadata``.
+
+    Example:
+        >>> reader = RechunkReader(client.query("SELECT * FROM events"), max_rows=65_536)
+        >>> for chunk in reader:
+        ...     model.predict(chunk.data)
+    """
+
+    def __init__(
+        self,
+        reader: Any,
+        *,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            reader: Stream reader to resize the batches of, with the
+                ``FlightStreamReader`` interface.
+            max_rows: Maximum number of rows per batch (default: None, no limit).
+            max_bytes: Maximum number of bytes per batch, estimated from the
+                average row size of the incoming batches (default: None, no
+                limit).
+
+        Raises:
+            ValueError: If neither ``max_rows`` nor ``max_bytes`` is set, or if
+                either is not positive.
+        """
+        if max_rows is None and max_bytes is None:
+            raise ValueError("Either max_rows or max_bytes must be set")
+        if max_rows is not None and max_rows < 1:
+            raise ValueError(f"max_rows must be at least 1, got {max_rows}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+
+        self._reader = reader
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._chunks = self._rechunk()
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the stream."""
+        return self._reader.schema
+
+    def _rechunk(self) -> Iterator["_TableChunk"]:
+        pending: list[pa.RecordBatch] = []
+        pending_rows = 0
+        pending_bytes = 0.0
+        while True:
+            try:
+                batch = self._reader.read_chunk().data
+            except StopIteration:
+                break
+
+            row_bytes = batch.nbytes / batch.num_rows if batch.num_rows else 0
+            offset = 0
+            while offset < batch.num_rows:
+                remaining = batch.num_rows - offset
+                fit = remaining
+                if self._max_rows is not None:
+                    fit = min(fit, self._max_rows - pending_rows)
+                if self._max_bytes is not None and row_bytes:
+                    fit = min(fit, int((self._max_bytes - pending_bytes) // row_bytes))
+                if fit < 1 and not pending:
+                    # A single row over max_bytes
+                    fit = 1
+
+                if fit >= 1:
+                    pending.append(batch if fit == batch.num_rows else batch.slice(offset, fit))
+                    pending_rows += fit
+                    pending_bytes += fit * row_bytes
+                    offset += fit
+                if fit < remaining or pending_rows == self._max_rows:
+                    yield _TableChunk(self._concat(pending))
+                    pending, pending_rows, pending_bytes = [], 0, 0.0
+
+        if pending:
+            yield _TableChunk(self._concat(pending))
+
+    def _concat(self, batches: list[pa.RecordBatch]) -> pa.RecordBatch:
+        if len(batches) == 1:
+            return batches[0]
+        return pa.Table.from_batches(batches, schema=self.schema).combine_chunks().to_batches()[0]
+
+    def read_chunk(self) -> "_TableChunk":
+        """Read the next chunk, raising StopIteration at the end of the stream."""
+        return next(self._chunks)
+
+    def __iter__(self) -> Iterator["_TableChunk"]:
+        return self._chunks
+
+    def read_all(self) -> pa.Table:
+        """Read all remaining chunks into a table."""
+        return pa.Table.from_batches([chunk.data for chunk in self], schema=self.schema)
+
+    def read_pandas(self, **options) -> Any:
+        """Read all remaining chunks into a pandas DataFrame."""
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        """Convert the stream to a ``pyarrow.RecordBatchReader``."""
+        return pa.RecordBatchReader.from_batches(self.schema, (chunk.data for chunk in self))
+
+    def cancel(self) -> None:
+        """Cancel the stream."""
+        self._reader.cancel()
+
+    def __enter__(self) -> "RechunkReader":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.cancel()
+
+
+class QueryResult:
+    """
+    Result stream of a query.
+
+    Wraps the ``FlightStreamReader`` (or the reader of every endpoint when
+    the result spans several) reading the results, with the same
+    interface, and keeps the ``FlightInfo`` of the query so that it can be
+    cancelled on the server.
+
+    Example:
+        >>> result = client.query("SELECT * FROM events", timeout=30)
+        >>> for chunk in result:
+        ...     if should_stop(chunk.data):
+        ...         result.cancel()
+        ...         break
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        info: Optional[flight.FlightInfo],
+        reader: Union[
+            flight.FlightStreamReader,
+            MultiEndpointReader,
+            "_SequentialEndpointReader",
+            "_StatementResultReader",
+            ReadaheadReader,
+            RechunkReader,
+            "_TableReader",
+        ],
+    ):
+        """
+        Initialize a query result.
+
+        Args:
+            client: Client that executed the query.
+            info: FlightInfo returned by the server for the query, None for
+                results served from the result cache or planned several times
+                by ``PreparedStatement.querymany``.
+            reader: Reader of the result streams.
+        """
+        self._owner = client
+        self._instrumentation = client._instrumentation
+        self._info = info
+        self._reader = reader
+
+    @property
+    def info(self) -> Optional[flight.FlightInfo]:
+        """FlightInfo returned by the server for the query, None if cached or from querymany."""
+        return self._info
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the result."""
+        return self._reader.schema
+
+    def __iter__(self) -> Iterator[flight.FlightStreamChunk]:
+        return iter(self._reader)
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        """Read the next chunk, raising StopIteration at the end of the stream."""
+        return self._reader.read_chunk()
+
+    def read_all(self) -> pa.Table:
+        """Read all remaining chunks into a table."""
+        return self._reader.read_all()
+
+    def read_pandas(self, **options) -> Any:
+        """Read all remaining chunks into a pandas DataFrame."""
+        return self._reader.read_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        """Convert the stream to a ``pyarrow.RecordBatchReader``."""
+        return self._reader.to_reader()
+
+    def to_table(self) -> pa.Table:
+        """
+        Read the remaining results into a table.
+
+        The record batches received from the server are kept as the chunks
+        of the table, without being copied or concatenated.
+        """
+        return self._reader.read_all()
+
+    def to_pandas(self, *, self_destruct: bool = True, split_blocks: bool = True, **options) -> Any:
+        """
+        Read the remaining results into a pandas DataFrame.
+
+        The whole result is read into an Arrow table first, then converted;
+        batches are not converted one at a time. With ``self_destruct``, each
+        Arrow column is released once converted, which lowers the peak memory
+        below the Arrow and pandas copies held together, but the Arrow table
+        is still fully materialized before the conversion starts.
+
+        Args:
+            self_destruct: Release each Arrow column once converted
+                (default: True).
+            split_blocks: Create one pandas block per column instead of
+                consolidating the columns of a type, avoiding copies
+                (default: True).
+            **options: Other options of ``pyarrow.Table.to_pandas``.
+
+        Returns:
+            pandas DataFrame with the results.
+        """
+        table = self.to_table()
+        return table.to_pandas(self_destruct=self_destruct, split_blocks=split_blocks, **options)
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Read the remaining results into NumPy arrays, one per column.
+
+        Only columns of primitive types (booleans, numbers and temporal types)
+        are supported. Batches are copied into the arrays as they are read and
+        released right away, and the arrays are sized upfront when the server
+        reported the number of rows.
+
+        Returns:
+            Mapping from column names to NumPy arrays.
+
+        Raises:
+            ValueError: If a column is not of a primitive type, or an integer or
+                boolean column contains nulls.
+        """
+        import numpy as np
+
+        schema = self.schema
+        for field in schema:
+            if not pa.types.is_primitive(field.type):
+                raise ValueError(f"Column {field.name} of type {field.type} is not primitive")
+
+        capacity = max(self._info.total_records, 0) if self._info is not None else 0
+        arrays: dict[str, Any] = {}
+        rows = 0
+        for chunk in self:
+            batch = chunk.data
+            end = rows + batch.num_rows
+            for field, column in zip(schema, batch.columns):
+                if column.null_count and (
+                    pa.types.is_integer(field.type) or pa.types.is_boolean(field.type)
+                ):
+                    raise ValueError(f"Column {field.name} contains nulls, use to_pandas instead")
+                values = column.to_numpy(zero_copy_only=False)
+                array = arrays.get(field.name)
+                if array is None:
+                    array = arrays[field.name] = np.empty(max(capacity, end), dtype=values.dtype)
+                elif end > len(array):
+                    array.resize(max(end, 2 * len(array)), refcheck=False)
+                array[rows:end] = values
+            rows = end
+
+        for field in schema:
+            if field.name not in arrays:
+                arrays[field.name] = np.empty(0, dtype=field.type.to_pandas_dtype())
+            elif len(arrays[field.name]) != rows:
+                arrays[field.name].resize(rows, refcheck=False)
+        return arrays
+
+    def to_polars(self, **options) -> Any:
+        """
+        Read the remaining results into a polars DataFrame, without copies.
+
+        Args:
+            **options: Options of ``polars.from_arrow``.
+
+        Returns:
+            polars DataFrame with the results.
+
+        Raises:
+            ImportError: If polars is not installed.
+        """
+        try:
+            import polars as pl
+        except ImportError as e:
+            raise ImportError("to_polars requires polars: pip install polars") from e
+
+        return pl.from_arrow(self.to_table(), rechunk=options.pop("rechunk", False), **options)
+
+    def readahead(
+        self, *, max_chunks: int = 8, max_bytes: int = DEFAULT_READAHEAD_BYTES
+    ) -> "QueryResult":
+        """
+        Prefetch the remaining chunks on a background thread.
+
+        Network waits then overlap with the processing of the chunks already
+        received. Reading pauses once ``max_chunks`` chunks or ``max_bytes``
+        bytes are buffered, until the consumer catches up.
+
+        Args:
+            max_chunks: Maximum number of chunks buffered (default: 8).
+            max_bytes: Number of buffered bytes at which reading pauses
+                (default: 64 MiB).
+
+        Returns:
+            Result reading this one ahead of the consumer, to be used instead
+            of it.
+
+        Example:
+            >>> result = client.query("SELECT * FROM events").readahead(max_chunks=32)
+            >>> for chunk in result:
+            ...     transform(chunk.data)
+        """
+        reader = ReadaheadReader(self._reader, max_chunks=max_chunks, max_bytes=max_bytes)
+        return QueryResult(self._owner, self._info, reader)
+
+    def rechunk(
+        self, *, max_rows: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> "QueryResult":
+        """
+        Resize the remaining record batches to a target size.
+
+        Small batches are coalesced and large ones are sliced without copies,
+        whatever batch size the server streams. Combine with ``readahead`` to
+        resize batches on the consumer side while the next ones are fetched.
+
+        Args:
+            max_rows: Maximum number of rows per batch (default: None, no limit).
+            max_bytes: Maximum number of bytes per batch, estimated from the
+                average row size (default: None, no limit).
+
+        Returns:
+            Result returning the resized batches, to be used instead of this
+            one.
+
+        Raises:
+            ValueError: If neither ``max_rows`` nor ``max_bytes`` is set.
+
+        Example:
+            >>> result = client.query("SELECT * FROM events").rechunk(max_rows=10_000)
+            >>> for chunk in result:
+            ...     assert chunk.data.num_rows <= 10_000
+        """
+        reader = RechunkReader(self._reader, max_rows=max_rows, max_bytes=max_bytes)
+        return QueryResult(self._owner, self._info, reader)
+
+    @traced("cancel_query")
+    def cancel(self, *, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel the query.
+
+        The result streams are cancelled locally, and the server is asked to
+        stop executing the query with a ``CancelQuery`` action.
+
+        Args:
+            timeout: Timeout in seconds of the cancellation request,
+                overriding the client default.
+
+        Returns:
+            Whether the server cancelled the query or is cancelling it. False
+            when the query cannot be cancelled, for instance because it
+            already completed or the server does not support cancellation.
+        """
+        self._reader.cancel()
+        return self._info is not None and self._owner._cancel_query(self._info, timeout)
+
+    def close(self) -> None:
+        """Stop reading the result streams, without cancelling the query on the server."""
+        self._reader.cancel()
+
+    def __enter__(self) -> "QueryResult":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
+
+
+@dataclass(frozen=True)
+class _TableChunk:
+    data: pa.RecordBatch
+    app_metadata: Optional[pa.Buffer] = None
+
+
+class _TableReader:
+    """Stream reader over an in-memory table, mirroring ``FlightStreamReader``."""
+
+    def __init__(self, table: pa.Table):
+        self._table = table
+        self._batches = table.to_batches()
+        self._position = 0
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._table.schema
+
+    def __iter__(self) -> Iterator[_TableChunk]:
+        while self._position < len(self._batches):
+            yield self.read_chunk()
+
+    def read_chunk(self) -> _TableChunk:
+        if self._position >= len(self._batches):
+            raise StopIteration
+        self._position += 1
+        return _TableChunk(self._batches[self._position - 1])
+
+    def read_all(self) -> pa.Table:
+        # A new table over the same buffers, so that ``to_pandas(self_destruct=True)``
+        # leaves the cached table intact
+        table = pa.Table.from_batches(self._batches[self._position :], schema=self.schema)
+        self._position = len(self._batches)
+        return table
+
+    def read_pandas(self, **options) -> Any:
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        return pa.RecordBatchReader.from_batches(self.schema, (chunk.data for chunk in iter(self)))
+
+    def cancel(self) -> None:
+        self._position = len(self._batches)
+
+
+class QueryHandle:
+    """
+    Handle of a query submitted with ``Client.submit_query``.
+
+    The query is planned by a ``GetFlightInfo`` call made in the background.
+    The handle only knows whether that call is still running: no progress is
+    reported while the server plans the query. Once the server returned the
+    FlightInfo, its endpoints are exposed, all at once, and ``result`` streams
+    them.
+    """
+
+    def __init__(self, client: Client, future: Future, options: flight.FlightCallOptions):
+        """
+        Initialize a query handle.
+
+        Args:
+            client: Client that submitted the query.
+            future: Future resolved with the FlightInfo of the query.
+            options: Options of the calls made for the query.
+        """
+        self._owner = client
+        self._instrumentation = client._instrumentation
+        self._future = future
+        self._options = options
+        self._cancelled = False
+
+    def done(self) -> bool:
+        """Whether the server finished planning the query, or failed to."""
+        return self._future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the server finished planning the query.
+
+        Args:
+            timeout: Maximum time to wait in seconds (default: None, no limit).
+
+        Returns:
+            Whether the query is done planning.
+        """
+        try:
+            self._future.exception(timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+        return True
+
+    @property
+    def info(self) -> Optional[flight.FlightInfo]:
+        """FlightInfo of the query, None while it is planned or if planning failed."""
+        if not self._future.done() or self._future.exception() is not None:
+            return None
+        return self._future.result()
+
+    @property
+    def endpoints(self) -> list[flight.FlightEndpoint]:
+        """Endpoints of the result, empty until the query is planned."""
+        info = self.info
+        return list(info.endpoints) if info is not None else []
+
+    def result(
+        self,
+        *,
+        parallel: bool = False,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> QueryResult:
+        """
+        Wait for the query to be planned and read its results.
+
+        Args:
+            parallel: Whether to fetch the result endpoints concurrently,
+                see ``Client.query``.
+            ordered: Whether to return the endpoints in the order advertised
+                by the server (default: True).
+            max_workers: Maximum number of endpoints fetched concurrently when
+                ``parallel`` is set.
+            timeout: Maximum time to wait for the planning in seconds
+                (default: None, no limit).
+
+        Returns:
+            QueryResult streaming the query results.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the query is still planned
+                after ``timeout``.
+            RuntimeError: If the query was cancelled.
+        """
+        if self._cancelled:
+            raise RuntimeError("Query was cancelled")
+        info = self._future.result(timeout)
+        return self._owner._read_flight_info(
+            info, parallel=parallel, ordered=ordered, max_workers=max_workers, options=self._options
+        )
+
+    @traced("cancel_query")
+    def cancel(self, *, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel the query.
+
+        A query that is still planned is cancelled on the server as soon as
+        the server returns its FlightInfo.
+
+        Args:
+            timeout: Timeout in seconds of the cancellation request,
+                overriding the client default.
+
+        Returns:
+            Whether the server cancelled the query or is cancelling it. True
+            when the query is still planned and the cancellation is pending.
+        """
+        self._cancelled = True
+        if not self._future.done():
+            context = contextvars.copy_context()
+
+            def cancel_planned(future: Future) -> None:
+                if future.exception() is None:
+                    context.run(self._owner._cancel_query, future.result(), timeout)
+
+            self._future.add_done_callback(cancel_planned)
+            return True
+
+        info = self.info
+        return info is not None and self._owner._cancel_query(info, timeout)
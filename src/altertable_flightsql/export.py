@@ -0,0 +1,178 @@
+"""
+Streaming export.
+
+This module provides the file writers used by ``Client.export``. Result
+batches are written as they are received, so exporting a result never needs
+more memory than a row group, whatever the size of the result.
+"""
+
+import os
+from typing import Optional, Union
+
+import pyarrow as pa
+
+DEFAULT_ROW_GROUP_SIZE = 1024 * 1024
+
+EXPORT_FORMATS = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "csv": ".csv",
+}
+
+
+# Codecs CSV files can be compressed with as a whole, with their file extension
+CSV_COMPRESSIONS = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "brotli": ".br",
+    "lz4": ".lz4",
+    "zstd": ".zst",
+}
+
+
+def get_extension(format: str, compression: Optional[str] = None) -> str:
+    """
+    Get the file extension of an export format.
+
+    Args:
+        format: Export format, see ``ExportWriter``.
+        compression: Compression codec, which adds its extension to CSV files.
+
+    Raises:
+        ValueError: If the format, or the compression of CSV files, is not supported.
+    """
+    try:
+        extension = EXPORT_FORMATS[format]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported export format: {format!r}, expected one of {', '.join(EXPORT_FORMATS)}"
+        ) from None
+    if format != "csv" or compression is None:
+        return extension
+    try:
+        return extension + CSV_COMPRESSIONS[compression]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported CSV compression: {compression!r}, "
+            f"expected one of {', '.join(CSV_COMPRESSIONS)}"
+        ) from None
+
+
+class ExportWriter:
+    """
+    Writer of a Parquet, Arrow IPC or CSV file.
+
+    Record batches are buffered until ``row_group_size`` rows are pending,
+    then written as Parquet row groups or IPC record batches of exactly that
+    size. The rows left over are written when the writer is closed.
+
+    Example:
+        >>> with ExportWriter("events.parquet", schema, format="parquet") as writer:
+        ...     for chunk in client.query("SELECT * FROM events"):
+        ...         writer.write_batch(chunk.data)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        schema: pa.Schema,
+        *,
+        format: str = "parquet",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = None,
+    ):
+        """
+        Initialize a writer, creating the file.
+
+        Args:
+            path: Path of the file to write.
+            schema: Schema of the written data.
+            format: File format, "parquet", "arrow" (IPC file) or "csv"
+                (default: "parquet").
+            row_group_size: Number of rows per Parquet row group or IPC record
+                batch, bounding the rows buffered in memory (default: 1048576).
+            compression: Compression codec of Parquet and IPC files, or of
+                CSV files as a whole, see ``CSV_COMPRESSIONS`` (default: None,
+                Parquet's default "snappy", uncompressed IPC and CSV).
+        """
+        get_extension(format, compression)
+        if row_group_size < 1:
+            raise ValueError(f"row_group_size must be at least 1, got {row_group_size}")
+
+        self._schema = schema
+        self._format = format
+        self._row_group_size = row_group_size
+        self._pending: list[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._closed = False
+        self._sink: Optional[pa.NativeFile] = None
+
+        self.rows_written = 0
+        """Number of rows written to the file."""
+
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, schema, compression=compression or "snappy")
+        elif format == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(path, schema, options=options)
+        else:
+            import pyarrow.csv as csv
+
+            if compression is not None:
+                self._sink = pa.CompressedOutputStream(str(path), compression)
+            self._writer = csv.CSVWriter(self._sink or path, schema)
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the written data."""
+        return self._schema
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        """Buffer a record batch, writing the row groups it completes."""
+        if self._closed:
+            raise RuntimeError("ExportWriter is closed")
+        if not batch.num_rows:
+            return
+
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self._row_group_size:
+            table = pa.Table.from_batches(self._pending, schema=self._schema)
+            full_rows = self._pending_rows - self._pending_rows % self._row_group_size
+            self._write(table.slice(0, full_rows))
+            remainder = table.slice(full_rows)
+            self._pending = remainder.to_batches()
+            self._pending_rows = remainder.num_rows
+
+    def close(self) -> None:
+        """Write the pending rows and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._pending_rows:
+                self._write(pa.Table.from_batches(self._pending, schema=self._schema))
+                self._pending = []
+        finally:
+            self._writer.close()
+            if self._sink is not None:
+                self._sink.close()
+
+    def __enter__(self) -> "ExportWriter":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def _write(self, table: pa.Table) -> None:
+        if self._format == "parquet":
+            self._writer.write_table(table, row_group_size=self._row_group_size)
+        elif self._format == "arrow":
+            self._writer.write_table(table, max_chunksize=self._row_group_size)
+        else:
+            self._writer.write_table(table)
+        self.rows_written += table.num_rows
@@ -0,0 +1,301 @@
+"""
+Buffered ingestion.
+
+This module provides a writer that coalesces small record batches and rows
+into well-sized batches before they are sent to the server, which avoids the
+per-message overhead of streaming many tiny IPC messages.
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+import pyarrow as pa
+import pyarrow.flight as flight
+
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Rows buffered between two conversions refreshing the estimated size of a row
+_ROWS_PER_ESTIMATE = 1024
+
+
+@dataclass(frozen=True)
+class IngestProgress:
+    """Progress of a bulk ingestion."""
+
+    rows: int
+    """Number of rows read from the source so far."""
+
+    bytes: int
+    """Number of Arrow buffer bytes read from the source so far."""
+
+    elapsed: float
+    """Time in seconds since the ingestion started."""
+
+    done: bool = False
+    """Whether the whole source was read."""
+
+    @property
+    def rows_per_second(self) -> float:
+        """Average row throughput."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average byte throughput."""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def report_progress(
+    batches: Iterable[pa.RecordBatch],
+    callback: Callable[[IngestProgress], None],
+    interval: float,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Count the batches of a source, reporting the progress every ``interval`` seconds.
+
+    The final progress, with ``done`` set, is reported once the source is
+    exhausted.
+    """
+    start = last_report = time.monotonic()
+    rows = nbytes = 0
+    for batch in batches:
+        rows += batch.num_rows
+        nbytes += batch.nbytes
+        yield batch
+        now = time.monotonic()
+        if now - last_report >= interval:
+            last_report = now
+            callback(IngestProgress(rows, nbytes, now - start))
+    callback(IngestProgress(rows, nbytes, time.monotonic() - start, done=True))
+
+
+class Ingestor:
+    """
+    Buffering writer for bulk ingestion.
+
+    Rows and record batches are buffered until ``max_rows`` rows or
+    ``max_bytes`` bytes are pending, then sent as a single record batch.
+    Batches that are already large enough are sent as is, without copies.
+    Pending data is also flushed every ``flush_interval`` seconds when set,
+    and when the ingestor is closed.
+
+    Example:
+        >>> with client.ingestor(table_name="events", schema=schema) as ingestor:
+        ...     for message in consumer:
+        ...         ingestor.write_row({"id": message.id, "payload": message.value})
+        >>> print(ingestor.rows_written, ingestor.bytes_written)
+    """
+
+    def __init__(
+        self,
+        writer: flight.FlightStreamWriter,
+        schema: pa.Schema,
+        *,
+        max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize an ingestor.
+
+        Args:
+            writer: Writer returned by ``Client.ingest``.
+            schema: Schema of the ingested data.
+            max_rows: Number of pending rows triggering a flush (default: 100000).
+            max_bytes: Number of pending bytes triggering a flush (default: 4 MiB).
+            flush_interval: Maximum time in seconds data stays buffered
+                (default: None, only flush on size and close).
+        """
+        self._writer = writer
+        self._schema = schema
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._pending_batches: list[pa.RecordBatch] = []
+        self._pending_rows: list[Mapping[str, Any]] = []
+        self._pending_num_rows = 0
+        self._pending_num_bytes = 0.0
+        # Estimated size of the pending rows, replaced by the actual one on conversion
+        self._pending_rows_bytes = 0.0
+        self._row_nbytes: Optional[float] = None
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+        self.rows_written = 0
+        """Number of rows sent to the server."""
+        self.bytes_written = 0
+        """Number of Arrow buffer bytes sent to the server."""
+        self.batches_written = 0
+        """Number of record batches sent to the server."""
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                args=(flush_interval,),
+                name="altertable-ingest-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the ingested data."""
+        return self._schema
+
+    def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        """
+        Buffer a record batch or a table.
+
+        Args:
+            data: Data to ingest, matching the ingestor schema.
+        """
+        batches = data.to_batches() if isinstance(data, pa.Table) else [data]
+
+        with self._lock:
+            self._check_open()
+            for batch in batches:
+                if self._is_full(batch.num_rows, batch.nbytes):
+                    # Large enough on its own, send it after the pending data
+                    self._flush()
+                    self._write_batch(batch)
+                    continue
+
+                self._flush_rows()
+                self._pending_batches.append(batch)
+                self._add_pending(batch.num_rows, batch.nbytes)
+
+    def write_row(self, row: Mapping[str, Any]) -> None:
+        """
+        Buffer a single row.
+
+        Args:
+            row: Mapping from column names to values.
+        """
+        with self._lock:
+            self._check_open()
+            self._add_row(row)
+
+    def write_rows(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Buffer several rows.
+
+        Args:
+            rows: Mappings from column names to values.
+        """
+        with self._lock:
+            self._check_open()
+            for row in rows:
+                self._add_row(row)
+
+    def flush(self) -> None:
+        """Send the pending data to the server."""
+        with self._lock:
+            self._check_error()
+            self._flush()
+
+    def close(self) -> None:
+        """Flush the pending data and close the stream."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._check_error()
+                self._flush()
+            finally:
+                self._writer.close()
+
+    def __enter__(self) -> "Ingestor":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Ingestor is closed")
+        self._check_error()
+
+    def _is_full(self, num_rows: int, num_bytes: int) -> bool:
+        return (self._max_rows is not None and num_rows >= self._max_rows) or (
+            self._max_bytes is not None and num_bytes >= self._max_bytes
+        )
+
+    def _add_pending(self, num_rows: int, num_bytes: float) -> None:
+        self._pending_num_rows += num_rows
+        self._pending_num_bytes += num_bytes
+        if self._is_full(self._pending_num_rows, self._pending_num_bytes):
+            self._flush()
+
+    def _add_row(self, row: Mapping[str, Any]) -> None:
+        """Buffer a row, counting its size estimated from the rows converted so far."""
+        self._pending_rows.append(row)
+        if self._row_nbytes is None or len(self._pending_rows) >= _ROWS_PER_ESTIMATE:
+            self._pending_num_rows += 1
+            self._flush_rows()
+            self._add_pending(0, 0)
+        else:
+            self._pending_rows_bytes += self._row_nbytes
+            self._add_pending(1, self._row_nbytes)
+
+    def _flush_rows(self) -> None:
+        """Convert the pending rows to a pending batch, keeping the write order."""
+        if self._pending_rows:
+            batch = pa.RecordBatch.from_pylist(self._pending_rows, schema=self._schema)
+            self._pending_rows = []
+            self._pending_batches.append(batch)
+            self._pending_num_bytes += batch.nbytes - self._pending_rows_bytes
+            self._pending_rows_bytes = 0.0
+            self._row_nbytes = batch.nbytes / batch.num_rows
+
+    def _flush(self) -> None:
+        self._flush_rows()
+        if not self._pending_batches:
+            return
+
+        if len(self._pending_batches) == 1:
+            batch = self._pending_batches[0]
+        else:
+            table = pa.Table.from_batches(self._pending_batches, schema=self._schema)
+            batch = table.combine_chunks().to_batches()[0] if table.num_rows else None
+
+        self._pending_batches = []
+        self._pending_num_rows = 0
+        self._pending_num_bytes = 0.0
+        if batch is not None:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: pa.RecordBatch) -> None:
+        self._writer.write_batch(batch)
+        self.rows_written += batch.num_rows
+        self.bytes_written += batch.nbytes
+        self.batches_written += 1
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            with self._lock:
+                if self._closed or self._error is not None:
+                    return
+                try:
+                    self._flush()
+                except BaseException as e:
+                    # Surfaced to the caller on the next write, flush or close
+                    self._error = e
+                    return
@@ -0,0 +1,306 @@
+"""
+Instrumentation hooks.
+
+This module provides a Flight client middleware reporting a span for every
+RPC made by the client: planning (``GetFlightInfo``), streaming results
+(``DoGet``), uploads (``DoPut``) and actions (``DoAction``). Spans carry
+timings, row and byte counts, the client operation that made the call and
+the error it failed with, if any.
+
+Instrumentation is disabled by default, in which case no middleware is
+installed and the client pays no overhead.
+
+Example:
+    >>> recorder = SpanRecorder()
+    >>> client = Client(username="user", password="pass", instrumentation=recorder)
+    >>> client.query("SELECT * FROM events").read_all()
+    >>> for span in recorder.spans:
+    ...     print(span.operation, span.name, span.duration, span.rows)
+"""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import pyarrow as pa
+import pyarrow.flight as flight
+
+T = TypeVar("T")
+
+_operation: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "altertable_operation", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "altertable_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """Timings and counters of a single RPC."""
+
+    name: str
+    """RPC method, e.g. "GetFlightInfo", "DoGet", "DoPut" or "DoAction"."""
+
+    operation: Optional[str]
+    """Client operation that made the call, e.g. "query" or "ingest"."""
+
+    start_time_ns: int
+    """Wall-clock start time, in nanoseconds since the epoch."""
+
+    first_response_time_ns: Optional[int] = None
+    """Wall-clock time the first response headers were received."""
+
+    end_time_ns: Optional[int] = None
+    """Wall-clock end time, in nanoseconds since the epoch."""
+
+    rows: int = 0
+    """Number of rows streamed by the call, when read or written by the client."""
+
+    bytes: int = 0
+    """Number of Arrow buffer bytes streamed by the call."""
+
+    error: Optional[BaseException] = None
+    """Error the call failed with, if any."""
+
+    attributes: dict[str, Any] = field(default_factory=dict)
+    """Extra attributes, free for instrumentations to use."""
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration of the call in seconds, once it completed."""
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    @property
+    def time_to_first_response(self) -> Optional[float]:
+        """Time in seconds until the server started responding."""
+        if self.first_response_time_ns is None:
+            return None
+        return (self.first_response_time_ns - self.start_time_ns) / 1e9
+
+    def add(self, rows: int, nbytes: int) -> None:
+        """Count streamed data."""
+        self.rows += rows
+        self.bytes += nbytes
+
+
+class Instrumentation:
+    """
+    Base class of instrumentations.
+
+    Subclasses override ``on_start`` and/or ``on_end``. Both are called on
+    the thread making the call and must not block.
+    """
+
+    def on_start(self, span: Span) -> None:
+        """Called when a call starts."""
+
+    def on_end(self, span: Span) -> None:
+        """Called when a call completes, successfully or not."""
+
+
+class SpanRecorder(Instrumentation):
+    """Instrumentation keeping every completed span in memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: list[Span] = []
+        """Completed spans, in completion order."""
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        """Forget the recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Instrumentation reporting spans to an OpenTelemetry tracer.
+
+    Example:
+        >>> from opentelemetry import trace
+        >>> tracer = trace.get_tracer("altertable")
+        >>> client = Client(..., instrumentation=OpenTelemetryInstrumentation(tracer))
+    """
+
+    def __init__(self, tracer: Any):
+        """
+        Initialize the instrumentation.
+
+        Args:
+            tracer: ``opentelemetry.trace.Tracer`` receiving the spans.
+        """
+        self._tracer = tracer
+
+    def on_start(self, span: Span) -> None:
+        name = f"{span.operation} {span.name}" if span.operation else span.name
+        attributes = {"rpc.system": "apache_arrow_flight", "rpc.method": span.name}
+        if span.operation:
+            attributes["altertable.operation"] = span.operation
+        span.attributes["otel_span"] = self._tracer.start_span(
+            name, attributes=attributes, start_time=span.start_time_ns
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span.attributes.pop("otel_span", None)
+        if otel_span is None:
+            return
+        otel_span.set_attribute("altertable.rows", span.rows)
+        otel_span.set_attribute("altertable.bytes", span.bytes)
+        if span.time_to_first_response is not None:
+            otel_span.set_attribute(
+                "altertable.time_to_first_response", span.time_to_first_response
+            )
+        if span.error is not None:
+            from opentelemetry.trace import Status, StatusCode
+
+            otel_span.record_exception(span.error)
+            otel_span.set_status(Status(StatusCode.ERROR, str(span.error)))
+        otel_span.end(end_time=span.end_time_ns)
+
+
+def _method_name(method: flight.FlightMethod) -> str:
+    return "".join(word.capitalize() for word in method.name.split("_"))
+
+
+class _InstrumentationMiddleware(flight.ClientMiddleware):
+    def __init__(self, instrumentation: Instrumentation, span: Span):
+        self._instrumentation = instrumentation
+        self._span = span
+
+    def received_headers(self, headers):
+        if self._span.first_response_time_ns is None:
+            self._span.first_response_time_ns = time.time_ns()
+
+    def call_completed(self, exception):
+        self._span.end_time_ns = time.time_ns()
+        self._span.error = exception
+        self._instrumentation.on_end(self._span)
+
+
+class InstrumentationMiddlewareFactory(flight.ClientMiddlewareFactory):
+    """Client middleware factory reporting a span per call to an instrumentation."""
+
+    def __init__(self, instrumentation: Instrumentation):
+        self._instrumentation = instrumentation
+
+    def start_call(self, info):
+        span = Span(_method_name(info.method), _operation.get(), time.time_ns())
+        # Exposed to the caller, which counts the data it streams
+        _current_span.set(span)
+        self._instrumentation.on_start(span)
+        return _InstrumentationMiddleware(self._instrumentation, span)
+
+
+def current_span() -> Optional[Span]:
+    """Get the span of the last call started in the current context."""
+    return _current_span.get()
+
+
+@contextmanager
+def operation(name: Optional[str]):
+    """Attribute the calls made within the block to a client operation."""
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def current_operation() -> Optional[str]:
+    """Get the client operation of the current context."""
+    return _operation.get()
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorate a client method to attribute its calls to an operation.
+
+    The decorated object must have an ``_instrumentation`` attribute; when it
+    is None, the method is called directly. Calls made by nested operations
+    are attributed to the outermost one. Coroutine methods are supported too.
+    """
+
+    def decorator(method: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                if self._instrumentation is None or _operation.get() is not None:
+                    return await method(self, *args, **kwargs)
+                with operation(name):
+                    return await method(self, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self._instrumentation is None or _operation.get() is not None:
+                return method(self, *args, **kwargs)
+            with operation(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class CountingReader:
+    """Stream reader wrapper counting the rows and bytes read into a span."""
+
+    def __init__(self, reader: flight.FlightStreamReader, span: Optional[Span]):
+        self._reader = reader
+        self._span = span
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        chunk = self._reader.read_chunk()
+        if self._span is not None and chunk.data is not None:
+            self._span.add(chunk.data.num_rows, chunk.data.nbytes)
+        return chunk
+
+    def cancel(self) -> None:
+        self._reader.cancel()
+
+
+class CountingWriter:
+    """Stream writer wrapper counting the rows and bytes written into a span."""
+
+    def __init__(self, writer: flight.FlightStreamWriter, span: Optional[Span]):
+        self._writer = writer
+        self._span = span
+
+    def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        self._writer.write(data)
+        self._count(data)
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        self._writer.write_batch(batch)
+        self._count(batch)
+
+    def write_table(self, table: pa.Table, max_chunksize: Optional[int] = None) -> None:
+        self._writer.write_table(table, max_chunksize)
+        self._count(table)
+
+    def _count(self, data: Union[pa.RecordBatch, pa.Table]) -> None:
+        if self._span is not None:
+            self._span.add(data.num_rows, data.nbytes)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._writer, name)
+
+    def __enter__(self) -> "CountingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._writer.close()
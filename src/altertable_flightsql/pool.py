@@ -0,0 +1,360 @@
+"""
+Connection pool implementation.
+
+This module provides a pool of authenticated Altertable clients, so that
+short-lived units of work do not pay for a handshake and a session setup on
+every call.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Callable, Optional, Union
+
+import pyarrow as pa
+import pyarrow.flight as flight
+
+from altertable_flightsql.cache import ResultCache
+from altertable_flightsql.client import Client
+from altertable_flightsql.instrumentation import Instrumentation
+from altertable_flightsql.retry import RetryPolicy
+
+_CONNECTION_ERRORS = (
+    flight.FlightUnavailableError,
+    flight.FlightInternalError,
+    flight.FlightUnauthenticatedError,
+)
+
+
+def _default_health_check(client: Client) -> None:
+    client.query("SELECT 1", use_cache=False).read_all()
+
+
+class _PooledClient:
+    """Idle pool entry."""
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class _ThreadLease:
+    """Client leased to a thread, handed back to the pool when the thread exits."""
+
+    def __init__(self, pool: "ClientPool", client: Client):
+        self.pool = pool
+        self.client = client
+
+    def __del__(self) -> None:
+        try:
+            self.pool.release(self.client)
+        except Exception:
+            pass
+
+
+class ClientPool:
+    """
+    Bounded pool of warm, authenticated clients.
+
+    Clients are created lazily up to ``max_size``, each with its own session
+    configured for the pool's catalog and schema. Idle clients are
+    health-checked before being handed out again, and clients whose
+    connection broke are replaced.
+
+    Example:
+        >>> pool = ClientPool(username="user", password="pass", max_size=4)
+        >>> with pool.connection() as client:
+        ...     table = client.query("SELECT 1").read_all()
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        catalog: Optional[str] = "altertable",
+        schema: Optional[str] = "main",
+        host: str = "flight.altertable.ai",
+        port: int = 443,
+        tls: bool = True,
+        auto_commit: bool = False,
+        prepared_statement_cache_size: int = 0,
+        compression: Optional[Union[str, pa.Codec]] = None,
+        result_compression: Optional[str] = None,
+        result_batch_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        timeout: Optional[float] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache_ttl: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_size: int = 8,
+        min_size: int = 0,
+        health_check_interval: Optional[float] = 30.0,
+        health_check: Callable[[Client], None] = _default_health_check,
+    ):
+        """
+        Initialize a client pool.
+
+        Args:
+            username: Altertable username (required).
+            password: Altertable password (required).
+            catalog: Default catalog name (default: "altertable").
+            schema: Default schema name (default: "main").
+            host: Altertable server hostname (default: "flight.altertable.ai").
+            port: Server port (default: 443).
+            tls: Whether to use TLS/SSL (default: True).
+            auto_commit: Whether to auto-commit transactions (default: False).
+            prepared_statement_cache_size: Maximum number of prepared statements
+                kept open and reused per client (default: 0, disabled).
+            compression: Default IPC buffer compression for uploaded data
+                (default: None, uncompressed).
+            result_compression: Codec the server is asked to use for result
+                streams (default: None).
+            result_batch_size: Preferred number of rows per record batch of
+                result streams (default: None).
+            instrumentation: Instrumentation receiving a span per RPC
+                (default: None, disabled).
+            timeout: Default timeout in seconds of each call to the server
+                (default: None, no timeout).
+            result_cache: Cache of query results, shared by the clients of the
+                pool (default: None, disabled).
+            metadata_cache_ttl: Time in seconds metadata lookups are cached by
+                each client (default: None, disabled).
+            retry_policy: Policy retrying idempotent calls on transient errors
+                (default: None, no retries).
+            max_size: Maximum number of clients in the pool (default: 8).
+            min_size: Number of clients created upfront (default: 0).
+            health_check_interval: Idle time in seconds after which a client is
+                health-checked before being handed out (default: 30). None
+                disables health checks.
+            health_check: Callable raising an exception if a client is not
+                usable anymore (default: runs ``SELECT 1``).
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        if not 0 <= min_size <= max_size:
+            raise ValueError(f"min_size must be between 0 and {max_size}, got {min_size}")
+
+        self._client_options = {
+            "username": username,
+            "password": password,
+            "catalog": catalog,
+            "schema": schema,
+            "host": host,
+            "port": port,
+            "tls": tls,
+            "auto_commit": auto_commit,
+            "prepared_statement_cache_size": prepared_statement_cache_size,
+            "compression": compression,
+            "result_compression": result_compression,
+            "result_batch_size": result_batch_size,
+            "instrumentation": instrumentation,
+            "timeout": timeout,
+            "result_cache": result_cache,
+            "metadata_cache_ttl": metadata_cache_ttl,
+            "retry_policy": retry_policy,
+        }
+        self._catalog = catalog
+        self._schema = schema
+        self._max_size = max_size
+        self._health_check_interval = health_check_interval
+        self._health_check = health_check
+
+        self._condition = threading.Condition()
+        self._idle: deque[_PooledClient] = deque()
+        self._size = 0
+        self._closed = False
+        self._local = threading.local()
+
+        for _ in range(min_size):
+            with self._condition:
+                self._size += 1
+            self._idle.append(_PooledClient(self._create_client()))
+
+    @property
+    def size(self) -> int:
+        """Number of clients currently owned by the pool, idle or in use."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of idle clients."""
+        return len(self._idle)
+
+    def _create_client(self) -> Client:
+        try:
+            return Client(**self._client_options)
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _discard(self, client: Client) -> None:
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, entry: _PooledClient) -> bool:
+        if self._health_check_interval is None:
+            return True
+        if time.monotonic() - entry.last_used < self._health_check_interval:
+            return True
+        try:
+            self._health_check(entry.client)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> Client:
+        """
+        Take a client out of the pool.
+
+        The client must be handed back with ``release()``. Prefer the
+        ``connection()`` context manager, which does it automatically.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a client when the pool
+                is exhausted (default: wait forever).
+
+        Returns:
+            An authenticated client.
+
+        Raises:
+            TimeoutError: If no client became available within ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("ClientPool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self._max_size:
+                        self._size += 1
+                        entry = None
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            f"No client available after {timeout}s (max_size={self._max_size})"
+                        )
+                    self._condition.wait(remaining)
+
+            if entry is None:
+                return self._create_client()
+            if self._is_healthy(entry):
+                return entry.client
+
+            # Replace the broken client on the next iteration
+            self._discard(entry.client)
+
+    def release(self, client: Client, *, discard: bool = False) -> None:
+        """
+        Hand a client back to the pool.
+
+        Every transaction begun with the client and left open is rolled back,
+        whether or not it was entered as a context, and the session catalog
+        and schema are restored to the pool defaults.
+
+        Args:
+            client: Client obtained from ``acquire()``.
+            discard: Whether to close the client instead of reusing it, for
+                example after a connection error.
+        """
+        if not discard and not self._closed:
+            try:
+                self._reset(client)
+            except Exception:
+                discard = True
+
+        if discard or self._closed:
+            self._discard(client)
+            return
+
+        with self._condition:
+            self._idle.append(_PooledClient(client))
+            self._condition.notify()
+
+    def _reset(self, client: Client) -> None:
+        # Also covers leases released from another context, see ``_ThreadLease``
+        for transaction in list(client._open_transactions.values()):
+            transaction.rollback()
+        if self._catalog and client._catalog != self._catalog:
+            client.set_catalog(self._catalog)
+        if self._schema and client._schema != self._schema:
+            client.set_schema(self._schema)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Client]:
+        """
+        Borrow a client for the duration of a ``with`` block.
+
+        The client is discarded instead of being reused if the block raises a
+        connection error.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a client when the pool
+                is exhausted (default: wait forever).
+
+        Example:
+            >>> with pool.connection() as client:
+            ...     client.execute("INSERT INTO users (name) VALUES ('Alice')")
+        """
+        client = self.acquire(timeout)
+        try:
+            yield client
+        except _CONNECTION_ERRORS:
+            self.release(client, discard=True)
+            raise
+        except BaseException:
+            self.release(client)
+            raise
+        else:
+            self.release(client)
+
+    def thread_client(self) -> Client:
+        """
+        Get the client leased to the current thread.
+
+        The first call from a thread takes a client out of the pool. Later
+        calls from the same thread return the same client, which goes back to
+        the pool when the thread exits.
+
+        Returns:
+            The client of the current thread.
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = _ThreadLease(self, self.acquire())
+            self._local.lease = lease
+        return lease.client
+
+    def close(self) -> None:
+        """Close the pool and all its idle clients."""
+        self._local.__dict__.pop("lease", None)
+        with self._condition:
+            self._closed = True
+            idle = [entry.client for entry in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for client in idle:
+            self._discard(client)
+
+    def __enter__(self) -> "ClientPool":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
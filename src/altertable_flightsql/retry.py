@@ -0,0 +1,169 @@
+"""
+Retry policy.
+
+This module provides the policy the client retries idempotent calls with:
+planning (``GetFlightInfo``), including metadata lookups, and result
+streams (``DoGet``). Calls failing with a transient error are retried with
+exponential backoff. Result streams interrupted halfway through are reopened
+from their ticket, and the chunks already returned are skipped, so readers
+never see a chunk twice.
+
+Example:
+    >>> policy = RetryPolicy(max_attempts=5, initial_backoff=0.5)
+    >>> client = Client(username="user", password="pass", retry_policy=policy)
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+import pyarrow as pa
+import pyarrow.flight as flight
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff policy for idempotent calls."""
+
+    max_attempts: int = 3
+    """Maximum number of attempts of a call, or per endpoint for result streams."""
+
+    initial_backoff: float = 0.1
+    """Delay in seconds before the first retry."""
+
+    max_backoff: float = 5.0
+    """Maximum delay in seconds between two attempts."""
+
+    backoff_multiplier: float = 2.0
+    """Factor the delay grows by after each retry."""
+
+    jitter: float = 0.1
+    """Random fraction the delays vary by, spreading the retries of concurrent calls."""
+
+    retryable_errors: tuple[type[BaseException], ...] = (flight.FlightUnavailableError,)
+    """
+    Errors worth retrying, by default the UNAVAILABLE gRPC status.
+
+    INTERNAL usually reports a server-side failure that happens again on every
+    attempt; add ``flight.FlightInternalError`` for servers using it for
+    transient failures too.
+    """
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {self.max_attempts}")
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether a call failing with an error is worth retrying."""
+        return isinstance(error, self.retryable_errors)
+
+    def backoff(self, retry: int) -> float:
+        """Get the delay in seconds before a retry, counted from 0."""
+        delay = min(self.max_backoff, self.initial_backoff * self.backoff_multiplier**retry)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def call(self, call: Callable[[], T]) -> T:
+        """Make a call, retrying it on retryable errors."""
+        retry = 0
+        while True:
+            try:
+                return call()
+            except Exception as e:
+                if not self.is_retryable(e) or retry + 1 >= self.max_attempts:
+                    raise
+            time.sleep(self.backoff(retry))
+            retry += 1
+
+
+class ResumableStreamReader:
+    """
+    Endpoint stream reader resuming after transient failures.
+
+    When the stream fails with a retryable error, it is reopened from the
+    endpoint ticket and the chunks already returned are skipped. This relies
+    on the server streaming the same chunks for a ticket every time. Retries
+    are counted per endpoint, against ``policy.max_attempts``.
+    """
+
+    def __init__(self, open_stream: Callable[[], Any], policy: RetryPolicy):
+        """
+        Initialize the reader, opening the stream.
+
+        Args:
+            open_stream: Callable opening the ``do_get`` stream of the endpoint.
+            policy: Policy the stream is opened and resumed with.
+        """
+        self._open_stream = open_stream
+        self._policy = policy
+        self._cancelled = False
+        self._skip = 0
+
+        self.chunks_read = 0
+        """Number of chunks returned."""
+        self.retries = 0
+        """Number of times the stream was reopened after a failure."""
+
+        self._reader = self._open()
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the stream."""
+        return self._reader.schema
+
+    def read_chunk(self) -> flight.FlightStreamChunk:
+        """Read the next chunk, raising StopIteration at the end of the stream."""
+        while True:
+            try:
+                chunk = self._reader.read_chunk()
+            except StopIteration:
+                raise
+            except Exception as e:
+                if not self._should_retry(e):
+                    raise
+                self._reader = self._open()
+                # Returned before the stream broke
+                self._skip = self.chunks_read
+                continue
+
+            if self._skip:
+                self._skip -= 1
+                continue
+            self.chunks_read += 1
+            return chunk
+
+    def cancel(self) -> None:
+        """Cancel the stream, without resuming it."""
+        self._cancelled = True
+        self._reader.cancel()
+
+    def _open(self) -> Any:
+        while True:
+            try:
+                return self._open_stream()
+            except Exception as e:
+                if not self._should_retry(e):
+                    raise
+
+    def _should_retry(self, error: Exception) -> bool:
+        """Wait before the next attempt if the error is worth retrying, else return False."""
+        if (
+            self._cancelled
+            or not self._policy.is_retryable(error)
+            or self.retries + 1 >= self._policy.max_attempts
+        ):
+            return False
+        time.sleep(self._policy.backoff(self.retries))
+        self.retries += 1
+        return True
+
+
+def resumable(
+    open_stream: Callable[[Any], Any], policy: Optional[RetryPolicy]
+) -> Callable[[Any], Any]:
+    """Wrap an endpoint stream opener to resume streams with a policy, if any."""
+    if policy is None:
+        return open_stream
+    return lambda endpoint: ResumableStreamReader(lambda: open_stream(endpoint), policy)
@@ -0,0 +1,1016 @@
+"""
+In-process Flight SQL server for tests and benchmarks.
+
+This module provides a pure-Python stand-in for an Altertable server, built on
+``pyarrow.flight.FlightServerBase``. It keeps its data in memory and speaks
+the subset of Flight SQL used by the client, so the client can be tested and
+benchmarked without Docker or network access.
+
+The server understands a small SQL dialect:
+
+- ``SELECT * FROM <table> [LIMIT <n>]`` and ``SELECT count(*) FROM <table>``
+- ``SELECT * FROM range(<n>)``, generating ``n`` rows
+- ``SELECT <value> [AS <name>], ...`` with literals and ``?`` / ``$<n>`` parameters
+- ``CREATE TABLE``, ``INSERT INTO ... VALUES``, ``DELETE FROM <table>``,
+  ``DROP TABLE``, ``CREATE SCHEMA``, ``DROP SCHEMA``, ``ATTACH`` and ``DETACH``
+
+Anything else can be answered with ``register_query`` and ``register_update``.
+
+Example:
+    >>> from altertable_flightsql import Client
+    >>> from altertable_flightsql.testing import FlightSQLServer
+    >>> with FlightSQLServer(endpoints=4, latency=0.001) as server:
+    ...     server.create_table("events", pa.table({"id": range(1000)}))
+    ...     with Client(**server.client_options()) as client:
+    ...         table = client.query("SELECT * FROM events").read_all()
+"""
+
+import base64
+import functools
+import re
+import secrets
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+import pyarrow as pa
+import pyarrow.flight as flight
+from google.protobuf import any_pb2
+
+from altertable_flightsql.generated import arrow_flight_sql_pb2 as sql_pb2
+
+QueryResult = Union[pa.Table, Callable[[Optional[pa.Table]], pa.Table]]
+UpdateResult = Union[int, Callable[[Optional[pa.Table]], int]]
+
+_TableOptions = sql_pb2.CommandStatementIngest.TableDefinitionOptions
+
+_SQL_TYPES = {
+    "BOOLEAN": pa.bool_(),
+    "SMALLINT": pa.int16(),
+    "INT": pa.int32(),
+    "INTEGER": pa.int32(),
+    "BIGINT": pa.int64(),
+    "REAL": pa.float32(),
+    "FLOAT": pa.float32(),
+    "DOUBLE": pa.float64(),
+    "VARCHAR": pa.string(),
+    "TEXT": pa.string(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us"),
+}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<string>'(?:[^']|'')*')"
+    r"|(?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+    r"|(?P<param>\?|\$\d+)"
+    r"|(?P<word>[A-Za-z_][\w.]*)"
+    r"|(?P<punct>[(),*]))"
+)
+_NAME = r"([A-Za-z_][\w]*(?:\.[A-Za-z_][\w]*){0,2})"
+
+_SELECT_FROM = re.compile(rf"SELECT\s+\*\s+FROM\s+{_NAME}(?:\s+LIMIT\s+(\d+))?", re.I)
+_SELECT_COUNT = re.compile(rf"SELECT\s+count\(\s*\*\s*\)\s+FROM\s+{_NAME}", re.I)
+_SELECT_RANGE = re.compile(r"SELECT\s+\*\s+FROM\s+range\(\s*(\d+)\s*\)", re.I)
+_SELECT = re.compile(r"SELECT\s+(.+)", re.I | re.S)
+_CREATE_TABLE = re.compile(
+    rf"CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?{_NAME}\s*\((.+)\)", re.I | re.S
+)
+_INSERT = re.compile(rf"INSERT\s+INTO\s+{_NAME}\s*(?:\(([^)]*)\))?\s*VALUES\s*(.+)", re.I | re.S)
+_DELETE = re.compile(rf"DELETE\s+FROM\s+{_NAME}", re.I)
+_DROP_TABLE = re.compile(rf"DROP\s+TABLE\s+(IF\s+EXISTS\s+)?{_NAME}", re.I)
+_CREATE_SCHEMA = re.compile(rf"CREATE\s+SCHEMA\s+(IF\s+NOT\s+EXISTS\s+)?{_NAME}", re.I)
+_DROP_SCHEMA = re.compile(rf"DROP\s+SCHEMA\s+(IF\s+EXISTS\s+)?{_NAME}(\s+CASCADE)?", re.I)
+_ATTACH = re.compile(r"ATTACH\s+(?:DATABASE\s+)?'[^']*'\s+AS\s+(\w+)", re.I)
+_DETACH = re.compile(r"DETACH\s+(?:DATABASE\s+)?(?:IF\s+EXISTS\s+)?(\w+)", re.I)
+
+
+class _Param:
+    """Placeholder for a bound parameter."""
+
+    def __init__(self, index: int, name: str):
+        self.index = index
+        self.name = name
+
+
+def _pack(message) -> bytes:
+    any_msg = any_pb2.Any()
+    any_msg.Pack(message)
+    return any_msg.SerializeToString()
+
+
+def _unpack(data: bytes) -> any_pb2.Any:
+    any_msg = any_pb2.Any()
+    any_msg.ParseFromString(data)
+    return any_msg
+
+
+def _error(message: str) -> flight.FlightServerError:
+    return flight.FlightServerError(message)
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.strip().rstrip(";").split())
+
+
+def _like(pattern: str, value: str) -> bool:
+    """Match a SQL LIKE pattern."""
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.fullmatch(regex, value, re.S) is not None
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    text = text.strip()
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise _error(f"Unsupported SQL near: {text[pos:pos + 20]!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+def _split(tokens: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+    """Split tokens at top-level commas."""
+    items: list[list[tuple[str, str]]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token == ("punct", "(") or token == ("punct", ")"):
+            depth += 1 if token[1] == "(" else -1
+        if token == ("punct", ",") and depth == 0:
+            items.append([])
+        else:
+            items[-1].append(token)
+    return items
+
+
+class _Values:
+    """Literal and placeholder values of a statement."""
+
+    def __init__(self):
+        self._next_param = 0
+
+    def parse(self, token: tuple[str, str]) -> Any:
+        kind, text = token
+        if kind == "string":
+            return text[1:-1].replace("''", "'")
+        if kind == "number":
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if kind == "param":
+            if text == "?":
+                self._next_param += 1
+                return _Param(self._next_param - 1, f"${self._next_param}")
+            return _Param(int(text[1:]) - 1, text)
+        if kind == "word" and text.upper() in ("NULL", "TRUE", "FALSE"):
+            return {"NULL": None, "TRUE": True, "FALSE": False}[text.upper()]
+        raise _error(f"Unsupported value: {text!r}")
+
+
+def _bind(value: Any, parameters: Optional[pa.Table], row: int) -> Any:
+    if not isinstance(value, _Param):
+        return value
+    if parameters is None or value.index >= parameters.num_columns:
+        raise _error(f"Missing value for parameter {value.name}")
+    return parameters.column(value.index)[row].as_py()
+
+
+@dataclass
+class _Session:
+    """State of an authenticated client."""
+
+    catalog: Optional[str]
+    schema: Optional[str]
+    options: dict[str, Any] = field(default_factory=dict)
+    prepared_statements: dict[bytes, "_PreparedStatement"] = field(default_factory=dict)
+
+
+@dataclass
+class _PreparedStatement:
+    query: str
+    transaction_id: bytes
+    parameters: Optional[pa.Table] = None
+
+
+class _NoOpAuthHandler(flight.ServerAuthHandler):
+    """Accept the handshake, authentication happens in the middleware."""
+
+    def authenticate(self, outgoing, incoming):
+        pass
+
+    def is_valid(self, token):
+        return b""
+
+
+class _AuthMiddleware(flight.ServerMiddleware):
+    def __init__(self, token: str, session: _Session):
+        self.token = token
+        self.session = session
+
+    def sending_headers(self):
+        return {"authorization": f"Bearer {self.token}"}
+
+
+class _AuthMiddlewareFactory(flight.ServerMiddlewareFactory):
+    """Exchange basic credentials for a bearer token bound to a session."""
+
+    def __init__(self, server: "FlightSQLServer"):
+        self._server = server
+
+    def start_call(self, info, headers):
+        values = headers.get("authorization") or headers.get("Authorization") or []
+        authorization = values[0] if values else ""
+        scheme, _, credentials = authorization.partition(" ")
+
+        if scheme.lower() == "basic":
+            username, _, password = base64.b64decode(credentials).decode().partition(":")
+            return self._server._login(username, password)
+        if scheme.lower() == "bearer":
+            session = self._server._sessions.get(credentials)
+            if session is not None:
+                return _AuthMiddleware(credentials, session)
+
+        raise flight.FlightUnauthenticatedError("Invalid or missing credentials")
+
+
+class FlightSQLServer(flight.FlightServerBase):
+    """
+    In-memory Flight SQL server.
+
+    Tables live in ``catalog -> schema -> table`` dictionaries. Each client
+    login gets its own session, holding its catalog, schema and prepared
+    statements. Writes made within a transaction are staged and applied on
+    commit; queries do not see staged writes.
+
+    Example:
+        >>> server = FlightSQLServer(latency=0.005).serve_in_background()
+        >>> client = Client(**server.client_options())
+        >>> client.execute("CREATE TABLE users (id INT, name VARCHAR)")
+        >>> server.shutdown()
+    """
+
+    def __init__(
+        self,
+        location: str = "grpc://127.0.0.1:0",
+        *,
+        users: Optional[Mapping[str, str]] = None,
+        catalog: str = "altertable",
+        schema: str = "main",
+        latency: float = 0.0,
+        endpoints: int = 1,
+        chunk_size: Optional[int] = None,
+        late_binding: bool = False,
+        **kwargs,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            location: Location to listen on (default: a free local port).
+            users: Accepted usernames and passwords (default: accept anyone).
+            catalog: Default catalog of new sessions (default: "altertable").
+            schema: Default schema of new sessions (default: "main").
+            latency: Delay in seconds added to every call (default: 0).
+            endpoints: Number of endpoints query results are split into
+                (default: 1).
+            chunk_size: Maximum number of rows per streamed record batch,
+                overridden by the ``result_batch_size`` session option
+                (default: None, keep the stored batches).
+            late_binding: Whether prepared statement results are computed
+                when their stream is read, with the parameters bound to the
+                statement at that time, instead of when the query is planned
+                (default: False).
+            **kwargs: Extra arguments for ``pyarrow.flight.FlightServerBase``.
+        """
+        super().__init__(
+            location,
+            auth_handler=_NoOpAuthHandler(),
+            middleware={"auth": _AuthMiddlewareFactory(self)},
+            **kwargs,
+        )
+        self.latency = latency
+        """Delay in seconds added to every call."""
+        self.endpoints = endpoints
+        """Number of endpoints query results are split into."""
+        self.chunk_size = chunk_size
+        """Maximum number of rows per streamed record batch."""
+        self.late_binding = late_binding
+        """Whether prepared statement results are computed when their stream is read."""
+
+        self._users = dict(users) if users is not None else None
+        self._default_catalog = catalog
+        self._default_schema = schema
+        self._lock = threading.RLock()
+        self._catalogs: dict[str, dict[str, dict[str, pa.Table]]] = {catalog: {schema: {}}}
+        self._sessions: dict[str, _Session] = {}
+        # Results of each ticket, or the callable computing them when read
+        self._results: dict[bytes, Union[pa.Table, Callable[[], pa.Table]]] = {}
+        self._transactions: dict[bytes, list[Callable[[], None]]] = {}
+        self._queries: dict[str, QueryResult] = {}
+        self._updates: dict[str, UpdateResult] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._failures: dict[str, int] = {}
+        # Times each new ticket's stream breaks, and the batches sent before breaking
+        self._interruption: tuple[int, int] = (0, 0)
+        self._interrupted_tickets: dict[bytes, int] = {}
+
+        self.calls: dict[str, int] = {}
+        """Number of calls received per RPC or action name."""
+
+    # Server management
+
+    def serve_in_background(self) -> "FlightSQLServer":
+        """Start serving on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.serve, name="altertable-test-server", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """Shut the server down and wait for the serving thread to exit."""
+        super().shutdown()
+        if self._thread is not None:
+            # A lingering serving thread breaks the handshakes of later servers
+            self._thread.join()
+            self._thread = None
+
+    def client_options(self, username: str = "test", password: str = "test") -> dict:
+        """
+        Get the ``Client`` arguments connecting to this server.
+
+        Args:
+            username: Username to log in with (default: "test").
+            password: Password to log in with (default: "test").
+        """
+        return {
+            "host": "127.0.0.1",
+            "port": self.port,
+            "username": username,
+            "password": password,
+            "tls": False,
+            "catalog": self._default_catalog,
+            "schema": self._default_schema,
+        }
+
+    def __enter__(self) -> "FlightSQLServer":
+        """Start serving in the background."""
+        return self.serve_in_background()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut the server down."""
+        self.shutdown()
+
+    # Data management
+
+    def create_table(self, name: str, data: pa.Table, *, replace: bool = True) -> None:
+        """
+        Store a table.
+
+        Args:
+            name: Table name, optionally qualified with a schema and a catalog.
+            data: Table contents.
+            replace: Whether to replace an existing table (default: True).
+        """
+        catalog, schema, table = self._resolve(name, None)
+        with self._lock:
+            tables = self._schema_tables(catalog, schema)
+            if table in tables and not replace:
+                raise ValueError(f"Table {name} already exists")
+            tables[table] = data
+
+    def get_table(self, name: str) -> pa.Table:
+        """
+        Get the contents of a table.
+
+        Args:
+            name: Table name, optionally qualified with a schema and a catalog.
+        """
+        with self._lock:
+            return self._get_table(self._resolve(name, None))
+
+    def register_query(self, query: str, result: QueryResult) -> None:
+        """
+        Answer a query with a fixed result.
+
+        Args:
+            query: SQL query, compared with whitespace normalized.
+            result: Result table, or a callable receiving the bound parameters
+                (or None) and returning the result table.
+        """
+        self._queries[_normalize(query)] = result
+
+    def register_update(self, query: str, result: UpdateResult) -> None:
+        """
+        Answer an update statement with a fixed row count.
+
+        Args:
+            query: SQL statement, compared with whitespace normalized.
+            result: Affected row count, or a callable receiving the bound
+                parameters (or None) and returning it.
+        """
+        self._updates[_normalize(query)] = result
+
+    def fail_calls(self, name: str, count: int = 1) -> None:
+        """
+        Fail the next calls of an RPC with UNAVAILABLE.
+
+        Args:
+            name: RPC or action name, e.g. "GetFlightInfo".
+            count: Number of calls to fail (default: 1).
+        """
+        with self._lock:
+            self._failures[name] = self._failures.get(name, 0) + count
+
+    def interrupt_streams(self, times: int = 1, *, after: int = 1) -> None:
+        """
+        Break the result streams of the queries planned from now on with UNAVAILABLE.
+
+        Tickets stay valid until their stream completes, so broken streams
+        can be read again.
+
+        Args:
+            times: Number of times the stream of each ticket breaks
+                (default: 1). Zero stops breaking streams.
+            after: Number of batches sent before breaking (default: 1).
+        """
+        with self._lock:
+            self._interruption = (times, after)
+
+    def expire_tokens(self) -> None:
+        """
+        Expire every bearer token issued so far, along with its session.
+
+        Calls made with an expired token fail with UNAUTHENTICATED until the
+        client logs in again, which starts a new session.
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    # Flight RPCs
+
+    def get_flight_info(self, context, descriptor):
+        self._begin_call(context, "GetFlightInfo")
+        session = self._session(context)
+        command = _unpack(descriptor.command)
+        resolve = None
+
+        if command.Is(sql_pb2.CommandStatementQuery.DESCRIPTOR):
+            cmd = sql_pb2.CommandStatementQuery()
+            command.Unpack(cmd)
+            result = self._run_query(session, cmd.query, None)
+        elif command.Is(sql_pb2.CommandPreparedStatementQuery.DESCRIPTOR):
+            cmd = sql_pb2.CommandPreparedStatementQuery()
+            command.Unpack(cmd)
+            statement = self._prepared_statement(session, cmd.prepared_statement_handle)
+            result = self._run_prepared(session, statement)
+            if self.late_binding:
+                # Parameters bound after planning change the result of the tickets
+                resolve = functools.partial(self._run_prepared, session, statement)
+        elif command.Is(sql_pb2.CommandGetCatalogs.DESCRIPTOR):
+            result = self._get_catalogs()
+        elif command.Is(sql_pb2.CommandGetDbSchemas.DESCRIPTOR):
+            cmd = sql_pb2.CommandGetDbSchemas()
+            command.Unpack(cmd)
+            result = self._get_schemas(cmd)
+        elif command.Is(sql_pb2.CommandGetTables.DESCRIPTOR):
+            cmd = sql_pb2.CommandGetTables()
+            command.Unpack(cmd)
+            result = self._get_tables(cmd)
+        else:
+            raise NotImplementedError(f"Unsupported command: {command.type_url}")
+
+        return flight.FlightInfo(
+            result.schema,
+            descriptor,
+            self._endpoints(result, resolve),
+            result.num_rows,
+            result.nbytes,
+        )
+
+    def do_get(self, context, ticket):
+        self._begin_call(context, "DoGet")
+        session = self._session(context)
+        chunk_size = session.options.get("result_batch_size") or self.chunk_size
+        cmd = sql_pb2.TicketStatementQuery()
+        _unpack(ticket.ticket).Unpack(cmd)
+        with self._lock:
+            result = self._results.get(cmd.statement_handle)
+            interrupt_after = None
+            if self._interrupted_tickets.get(cmd.statement_handle):
+                self._interrupted_tickets[cmd.statement_handle] -= 1
+                interrupt_after = self._interruption[1]
+        if result is None:
+            raise _error("Unknown or expired ticket")
+        if callable(result):
+            result = result()
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            for index, batch in enumerate(result.to_batches(max_chunksize=chunk_size)):
+                if index == interrupt_after:
+                    raise flight.FlightUnavailableError("Stream interrupted")
+                yield batch
+            with self._lock:
+                self._results.pop(cmd.statement_handle, None)
+                self._interrupted_tickets.pop(cmd.statement_handle, None)
+
+        return flight.GeneratorStream(result.schema, batches())
+
+    def do_put(self, context, descriptor, reader, writer):
+        self._begin_call(context, "DoPut")
+        session = self._session(context)
+        command = _unpack(descriptor.command)
+
+        if command.Is(sql_pb2.CommandStatementIngest.DESCRIPTOR):
+            cmd = sql_pb2.CommandStatementIngest()
+            command.Unpack(cmd)
+            count = self._ingest(session, cmd, reader.read_all())
+        elif command.Is(sql_pb2.CommandStatementUpdate.DESCRIPTOR):
+            cmd = sql_pb2.CommandStatementUpdate()
+            command.Unpack(cmd)
+            reader.read_all()
+            count = self._run_update(session, cmd.query, None, cmd.transaction_id)
+        elif command.Is(sql_pb2.CommandPreparedStatementQuery.DESCRIPTOR):
+            cmd = sql_pb2.CommandPreparedStatementQuery()
+            command.Unpack(cmd)
+            statement = self._prepared_statement(session, cmd.prepared_statement_handle)
+            statement.parameters = reader.read_all()
+            result = sql_pb2.DoPutPreparedStatementResult(
+                prepared_statement_handle=cmd.prepared_statement_handle
+            )
+            writer.write(pa.py_buffer(result.SerializeToString()))
+            return
+        elif command.Is(sql_pb2.CommandPreparedStatementUpdate.DESCRIPTOR):
+            cmd = sql_pb2.CommandPreparedStatementUpdate()
+            command.Unpack(cmd)
+            statement = self._prepared_statement(session, cmd.prepared_statement_handle)
+            parameters = reader.read_all()
+            count = self._run_update(
+                session,
+                statement.query,
+                parameters if parameters.num_columns else None,
+                statement.transaction_id,
+            )
+        else:
+            raise NotImplementedError(f"Unsupported command: {command.type_url}")
+
+        result = sql_pb2.DoPutUpdateResult(record_count=count)
+        writer.write(pa.py_buffer(result.SerializeToString()))
+
+    def do_action(self, context, action):
+        self._begin_call(context, action.type)
+        session = self._session(context)
+        body = action.body.to_pybytes()
+
+        if action.type == "CreatePreparedStatement":
+            request = sql_pb2.ActionCreatePreparedStatementRequest()
+            _unpack(body).Unpack(request)
+            handle = secrets.token_bytes(16)
+            session.prepared_statements[handle] = _PreparedStatement(
+                request.query, request.transaction_id
+            )
+            result = sql_pb2.ActionCreatePreparedStatementResult(prepared_statement_handle=handle)
+            return [_pack(result)]
+
+        if action.type == "ClosePreparedStatement":
+            request = sql_pb2.ActionClosePreparedStatementRequest()
+            _unpack(body).Unpack(request)
+            session.prepared_statements.pop(request.prepared_statement_handle, None)
+            return []
+
+        if action.type == "BeginTransaction":
+            transaction_id = secrets.token_bytes(16)
+            with self._lock:
+                self._transactions[transaction_id] = []
+            return [_pack(sql_pb2.ActionBeginTransactionResult(transaction_id=transaction_id))]
+
+        if action.type == "EndTransaction":
+            request = sql_pb2.ActionEndTransactionRequest()
+            _unpack(body).Unpack(request)
+            self._end_transaction(
+                request.transaction_id,
+                request.action == sql_pb2.ActionEndTransactionRequest.END_TRANSACTION_COMMIT,
+            )
+            return []
+
+        if action.type == "CancelQuery":
+            request = sql_pb2.ActionCancelQueryRequest()
+            _unpack(body).Unpack(request)
+            info = flight.FlightInfo.deserialize(request.info)
+            cancelled = False
+            with self._lock:
+                for endpoint in info.endpoints:
+                    cmd = sql_pb2.TicketStatementQuery()
+                    _unpack(endpoint.ticket.ticket).Unpack(cmd)
+                    cancelled |= self._results.pop(cmd.statement_handle, None) is not None
+            result = sql_pb2.ActionCancelQueryResult(
+                result=(
+                    sql_pb2.ActionCancelQueryResult.CANCEL_RESULT_CANCELLED
+                    if cancelled
+                    else sql_pb2.ActionCancelQueryResult.CANCEL_RESULT_NOT_CANCELLABLE
+                )
+            )
+            return [_pack(result)]
+
+        if action.type == "SetSessionOptions":
+            request = sql_pb2.SetSessionOptionsRequest()
+            _unpack(body).Unpack(request)
+            for name, value in request.session_options.items():
+                option = value.WhichOneof("option_value")
+                session.options[name] = getattr(value, option) if option else None
+            session.catalog = session.options.get("catalog", session.catalog)
+            session.schema = session.options.get("schema", session.schema)
+            return [_pack(sql_pb2.SetSessionOptionsResult())]
+
+        raise NotImplementedError(f"Unsupported action: {action.type}")
+
+    # Call handling
+
+    def _login(self, username: str, password: str) -> _AuthMiddleware:
+        if self._users is not None and self._users.get(username) != password:
+            raise flight.FlightUnauthenticatedError("Invalid username or password")
+        token = secrets.token_urlsafe(16)
+        session = _Session(self._default_catalog, self._default_schema)
+        with self._lock:
+            self._sessions[token] = session
+        return _AuthMiddleware(token, session)
+
+    def _begin_call(self, context, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self._failures.get(name):
+                self._failures[name] -= 1
+                raise flight.FlightUnavailableError(f"{name} failed")
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _session(self, context) -> _Session:
+        return context.get_middleware("auth").session
+
+    def _prepared_statement(self, session: _Session, handle: bytes) -> _PreparedStatement:
+        statement = session.prepared_statements.get(handle)
+        if statement is None:
+            raise _error("Unknown prepared statement")
+        return statement
+
+    def _endpoints(
+        self, result: pa.Table, resolve: Optional[Callable[[], pa.Table]] = None
+    ) -> list[flight.FlightEndpoint]:
+        """Split a result into endpoints, computed again with ``resolve`` when read, if given."""
+        count = max(1, min(self.endpoints, result.num_rows))
+        size = -(-result.num_rows // count)
+        endpoints = []
+        with self._lock:
+            for offset in range(0, max(result.num_rows, 1), max(size, 1)):
+                handle = secrets.token_bytes(16)
+                if resolve is None:
+                    self._results[handle] = result.slice(offset, size)
+                else:
+                    self._results[handle] = lambda offset=offset: resolve().slice(offset, size)
+                if self._interruption[0]:
+                    self._interrupted_tickets[handle] = self._interruption[0]
+                ticket = _pack(sql_pb2.TicketStatementQuery(statement_handle=handle))
+                endpoints.append(flight.FlightEndpoint(ticket, []))
+        return endpoints
+
+    # Storage
+
+    def _resolve(self, name: str, session: Optional[_Session]) -> tuple[str, str, str]:
+        catalog = session.catalog if session else self._default_catalog
+        schema = session.schema if session else self._default_schema
+        parts = name.split(".")
+        if len(parts) == 3:
+            catalog, schema, table = parts
+        elif len(parts) == 2:
+            schema, table = parts
+        else:
+            (table,) = parts
+        if not catalog or not schema:
+            raise _error(f"No catalog or schema selected for {name}")
+        return catalog, schema, table
+
+    def _schema_tables(self, catalog: str, schema: str) -> dict[str, pa.Table]:
+        try:
+            return self._catalogs[catalog][schema]
+        except KeyError:
+            raise _error(f"Schema {catalog}.{schema} does not exist") from None
+
+    def _get_table(self, name: tuple[str, str, str]) -> pa.Table:
+        tables = self._schema_tables(name[0], name[1])
+        try:
+            return tables[name[2]]
+        except KeyError:
+            raise _error(f"Table {'.'.join(name)} does not exist") from None
+
+    def _write(self, transaction_id: bytes, operation: Callable[[], None]) -> None:
+        """Apply a write, or stage it until the transaction commits."""
+        with self._lock:
+            if not transaction_id:
+                operation()
+                return
+            if transaction_id not in self._transactions:
+                raise _error("Unknown transaction")
+            self._transactions[transaction_id].append(operation)
+
+    def _end_transaction(self, transaction_id: bytes, commit: bool) -> None:
+        with self._lock:
+            operations = self._transactions.pop(transaction_id, None)
+            if operations is None:
+                raise _error("Unknown transaction")
+            if commit:
+                for operation in operations:
+                    operation()
+
+    def _ingest(self, session: _Session, cmd: sql_pb2.CommandStatementIngest, data) -> int:
+        name = self._resolve(cmd.table, session)
+        if cmd.schema:
+            name = (name[0], cmd.schema, name[2])
+        if cmd.catalog:
+            name = (cmd.catalog, name[1], name[2])
+        options = cmd.table_definition_options
+
+        def operation():
+            tables = self._schema_tables(name[0], name[1])
+            existing = tables.get(name[2])
+            if existing is None:
+                if options.if_not_exist != _TableOptions.TABLE_NOT_EXIST_OPTION_CREATE:
+                    raise _error(f"Table {'.'.join(name)} does not exist")
+                tables[name[2]] = data
+            elif options.if_exists == _TableOptions.TABLE_EXISTS_OPTION_APPEND:
+                tables[name[2]] = pa.concat_tables([existing, data.cast(existing.schema)])
+            elif options.if_exists == _TableOptions.TABLE_EXISTS_OPTION_REPLACE:
+                tables[name[2]] = data
+            else:
+                raise _error(f"Table {'.'.join(name)} already exists")
+
+        self._write(cmd.transaction_id, operation)
+        return data.num_rows
+
+    # Metadata
+
+    def _get_catalogs(self) -> pa.Table:
+        with self._lock:
+            catalogs = sorted(self._catalogs)
+        schema = pa.schema([pa.field("catalog_name", pa.string(), nullable=False)])
+        return pa.table([catalogs], schema=schema)
+
+    def _get_schemas(self, cmd: sql_pb2.CommandGetDbSchemas) -> pa.Table:
+        rows = []
+        with self._lock:
+            for catalog, schemas in sorted(self._catalogs.items()):
+                if cmd.HasField("catalog") and cmd.catalog != catalog:
+                    continue
+                for schema in sorted(schemas):
+                    if cmd.HasField("db_schema_filter_pattern") and not _like(
+                        cmd.db_schema_filter_pattern, schema
+                    ):
+                        continue
+                    rows.append({"catalog_name": catalog, "db_schema_name": schema})
+        schema = pa.schema(
+            [
+                pa.field("catalog_name", pa.string()),
+                pa.field("db_schema_name", pa.string(), nullable=False),
+            ]
+        )
+        return pa.Table.from_pylist(rows, schema=schema)
+
+    def _get_tables(self, cmd: sql_pb2.CommandGetTables) -> pa.Table:
+        rows = []
+        with self._lock:
+            for catalog, schemas in sorted(self._catalogs.items()):
+                if cmd.HasField("catalog") and cmd.catalog != catalog:
+                    continue
+                for schema, tables in sorted(schemas.items()):
+                    if cmd.HasField("db_schema_filter_pattern") and not _like(
+                        cmd.db_schema_filter_pattern, schema
+                    ):
+                        continue
+                    for table, data in sorted(tables.items()):
+                        if cmd.HasField("table_name_filter_pattern") and not _like(
+                            cmd.table_name_filter_pattern, table
+                        ):
+                            continue
+                        rows.append(
+                            {
+                                "catalog_name": catalog,
+                                "db_schema_name": schema,
+                                "table_name": table,
+                                "table_type": "BASE TABLE",
+                                "table_schema": data.schema.serialize().to_pybytes(),
+                            }
+                        )
+
+        fields = [
+            pa.field("catalog_name", pa.string()),
+            pa.field("db_schema_name", pa.string()),
+            pa.field("table_name", pa.string(), nullable=False),
+            pa.field("table_type", pa.string(), nullable=False),
+        ]
+        if cmd.include_schema:
+            fields.append(pa.field("table_schema", pa.binary(), nullable=False))
+        else:
+            rows = [{k: v for k, v in row.items() if k != "table_schema"} for row in rows]
+        return pa.Table.from_pylist(rows, schema=pa.schema(fields))
+
+    # SQL
+
+    def _run_prepared(self, session: _Session, statement: _PreparedStatement) -> pa.Table:
+        return self._run_query(session, statement.query, statement.parameters)
+
+    def _run_query(self, session: _Session, query: str, parameters: Optional[pa.Table]) -> pa.Table:
+        sql = _normalize(query)
+        if sql in self._queries:
+            result = self._queries[sql]
+            return result(parameters) if callable(result) else result
+
+        if match := _SELECT_RANGE.fullmatch(sql):
+            return pa.table({"range": pa.array(range(int(match.group(1))), pa.int64())})
+
+        with self._lock:
+            if match := _SELECT_COUNT.fullmatch(sql):
+                table = self._get_table(self._resolve(match.group(1), session))
+                return pa.table({"count_star()": pa.array([table.num_rows], pa.int64())})
+            if match := _SELECT_FROM.fullmatch(sql):
+                table = self._get_table(self._resolve(match.group(1), session))
+                return table.slice(0, int(match.group(2))) if match.group(2) else table
+
+        if match := _SELECT.fullmatch(sql):
+            return self._select_values(match.group(1), parameters)
+
+        raise _error(f"Unsupported query: {query}")
+
+    def _select_values(self, items: str, parameters: Optional[pa.Table]) -> pa.Table:
+        values = _Values()
+        num_rows = parameters.num_rows if parameters is not None else 1
+        names, columns = [], []
+        for item in _split(_tokenize(items)):
+            if len(item) == 3 and item[1][1].upper() == "AS":
+                item = [item[0], item[2]]
+            if len(item) not in (1, 2):
+                raise _error(f"Unsupported select item: {' '.join(t for _, t in item)}")
+
+            value = values.parse(item[0])
+            if isinstance(value, _Param):
+                if parameters is None or value.index >= parameters.num_columns:
+                    raise _error(f"Missing value for parameter {value.name}")
+                column = parameters.column(value.index)
+                default_name = value.name
+            else:
+                column = pa.array([value] * num_rows)
+                default_name = item[0][1]
+            names.append(item[1][1] if len(item) == 2 else default_name)
+            columns.append(column)
+
+        return pa.table(columns, names=names)
+
+    def _run_update(
+        self,
+        session: _Session,
+        query: str,
+        parameters: Optional[pa.Table],
+        transaction_id: bytes,
+    ) -> int:
+        sql = _normalize(query)
+        if sql in self._updates:
+            result = self._updates[sql]
+            return result(parameters) if callable(result) else result
+
+        if match := _INSERT.fullmatch(sql):
+            return self._insert(session, match, parameters, transaction_id)
+
+        if match := _CREATE_TABLE.fullmatch(sql):
+            name = self._resolve(match.group(2), session)
+            schema = self._parse_columns(match.group(3))
+            if_not_exists = bool(match.group(1))
+
+            def operation():
+                tables = self._schema_tables(name[0], name[1])
+                if name[2] in tables:
+                    if if_not_exists:
+                        return
+                    raise _error(f"Table {'.'.join(name)} already exists")
+                tables[name[2]] = schema.empty_table()
+
+        elif match := _DELETE.fullmatch(sql):
+            name = self._resolve(match.group(1), session)
+            with self._lock:
+                count = self._get_table(name).num_rows
+
+            def operation():
+                table = self._get_table(name)
+                self._schema_tables(name[0], name[1])[name[2]] = table.schema.empty_table()
+
+            self._write(transaction_id, operation)
+            return count
+
+        elif match := _DROP_TABLE.fullmatch(sql):
+            name = self._resolve(match.group(2), session)
+            if_exists = bool(match.group(1))
+
+            def operation():
+                tables = self._schema_tables(name[0], name[1])
+                if tables.pop(name[2], None) is None and not if_exists:
+                    raise _error(f"Table {'.'.join(name)} does not exist")
+
+        elif match := _CREATE_SCHEMA.fullmatch(sql):
+            catalog, schema = self._resolve_schema(match.group(2), session)
+            if_not_exists = bool(match.group(1))
+
+            def operation():
+                if catalog not in self._catalogs:
+                    raise _error(f"Catalog {catalog} does not exist")
+                if schema in self._catalogs[catalog] and not if_not_exists:
+                    raise _error(f"Schema {catalog}.{schema} already exists")
+                self._catalogs[catalog].setdefault(schema, {})
+
+        elif match := _DROP_SCHEMA.fullmatch(sql):
+            catalog, schema = self._resolve_schema(match.group(2), session)
+            if_exists, cascade = bool(match.group(1)), bool(match.group(3))
+
+            def operation():
+                tables = self._catalogs.get(catalog, {}).get(schema)
+                if tables is None:
+                    if not if_exists:
+                        raise _error(f"Schema {catalog}.{schema} does not exist")
+                    return
+                if tables and not cascade:
+                    raise _error(f"Schema {catalog}.{schema} is not empty")
+                del self._catalogs[catalog][schema]
+
+        elif match := _ATTACH.fullmatch(sql):
+            catalog = match.group(1)
+
+            def operation():
+                if catalog in self._catalogs:
+                    raise _error(f"Catalog {catalog} already exists")
+                self._catalogs[catalog] = {"main": {}}
+
+        elif match := _DETACH.fullmatch(sql):
+            catalog = match.group(1)
+
+            def operation():
+                self._catalogs.pop(catalog, None)
+
+        else:
+            raise _error(f"Unsupported statement: {query}")
+
+        self._write(transaction_id, operation)
+        return 0
+
+    def _resolve_schema(self, name: str, session: _Session) -> tuple[str, str]:
+        parts = name.split(".")
+        if len(parts) == 2:
+            return parts[0], parts[1]
+        if len(parts) == 1 and session.catalog:
+            return session.catalog, parts[0]
+        raise _error(f"Invalid schema name: {name}")
+
+    def _parse_columns(self, definition: str) -> pa.Schema:
+        fields = []
+        for column in _split(_tokenize(definition)):
+            if len(column) < 2:
+                raise _error(f"Invalid column definition: {definition}")
+            type_name = column[1][1].upper()
+            if type_name not in _SQL_TYPES:
+                raise _error(f"Unsupported column type: {column[1][1]}")
+            fields.append(pa.field(column[0][1], _SQL_TYPES[type_name]))
+        return pa.schema(fields)
+
+    def _insert(
+        self,
+        session: _Session,
+        match: re.Match,
+        parameters: Optional[pa.Table],
+        transaction_id: bytes,
+    ) -> int:
+        name = self._resolve(match.group(1), session)
+        with self._lock:
+            schema = self._get_table(name).schema
+        columns = [c.strip() for c in match.group(2).split(",")] if match.group(2) else schema.names
+
+        values = _Values()
+        tuples = []
+        for group in _split(_tokenize(match.group(3))):
+            if group[:1] != [("punct", "(")] or group[-1:] != [("punct", ")")]:
+                raise _error(f"Invalid VALUES clause: {match.group(3)}")
+            items = _split(group[1:-1])
+            if len(items) != len(columns) or any(len(item) != 1 for item in items):
+                raise _error(f"Invalid VALUES clause: {match.group(3)}")
+            tuples.append([values.parse(item[0]) for item in items])
+
+        rows = [
+            {column: _bind(value, parameters, row) for column, value in zip(columns, row_values)}
+            for row in range(parameters.num_rows if parameters is not None else 1)
+            for row_values in tuples
+        ]
+        data = pa.Table.from_pylist(rows, schema=schema)
+
+        def operation():
+            existing = self._get_table(name)
+            self._schema_tables(name[0], name[1])[name[2]] = pa.concat_tables([existing, data])
+
+        self._write(transaction_id, operation)
+        return data.num_rows
@@ -14,6 +14,7 @@ import pytest
 from testcontainers.core.container import DockerContainer, LogMessageWaitStrategy
 
 from altertable_flightsql import Client
+from altertable_flightsql.testing import FlightSQLServer
 
 
 @dataclass(frozen=True)
@@ -127,6 +128,36 @@ def altertable_client(altertable_service: dict) -> Generator[Client, None, None]
         yield client
 
 
+@pytest.fixture
+def local_server() -> Generator[FlightSQLServer, None, None]:
+    """
+    Provide an in-process Flight SQL server.
+
+    Unlike ``altertable_service``, this fixture needs neither Docker nor
+    network access, but only understands a small SQL dialect.
+
+    Yields:
+        FlightSQLServer: Running server
+    """
+    with FlightSQLServer() as server:
+        yield server
+
+
+@pytest.fixture
+def local_client(local_server: FlightSQLServer) -> Generator[Client, None, None]:
+    """
+    Provide a client connected to the in-process server.
+
+    Args:
+        local_server: In-process server fixture
+
+    Yields:
+        Client: Connected client
+    """
+    with Client(**local_server.client_options()) as client:
+        yield client
+
+
 @pytest.fixture
 def test_catalog(altertable_client: Client) -> Generator[str, None, None]:
     """
@@ -0,0 +1,84 @@
+"""
+Integration tests for the asyncio client.
+
+Tests awaitable queries, updates, prepared statements and transactions.
+"""
+
+import asyncio
+
+from altertable_flightsql import AsyncClient
+from tests.conftest import TableInfo
+
+
+class TestAsyncQueries:
+    """Test asynchronous query execution."""
+
+    def test_simple_select(self, altertable_service: dict):
+        """Test executing a simple SELECT query."""
+
+        async def run():
+            async with AsyncClient(**altertable_service) as client:
+                stream = await client.query("SELECT 1 AS value")
+                return await stream.read_all()
+
+        table = asyncio.run(run())
+        assert table.column("value").to_pylist() == [1]
+
+    def test_async_iteration(self, altertable_service: dict, test_table: TableInfo):
+        """Test iterating over record batches with async for."""
+
+        async def run():
+            async with AsyncClient(**altertable_service) as client:
+                stream = await client.query(f"SELECT * FROM {test_table.full_name}")
+                return sum([batch.data.num_rows async for batch in stream])
+
+        assert asyncio.run(run()) == 3
+
+    def test_concurrent_queries(self, altertable_service: dict):
+        """Test running many queries concurrently on one client."""
+
+        async def run():
+            async with AsyncClient(**altertable_service) as client:
+                streams = await asyncio.gather(
+                    *[client.query(f"SELECT {i} AS value") for i in range(20)]
+                )
+                return await asyncio.gather(*[stream.read_all() for stream in streams])
+
+        tables = asyncio.run(run())
+        assert [table.column("value")[0].as_py() for table in tables] == list(range(20))
+
+    def test_prepared_statement(self, altertable_service: dict, test_table: TableInfo):
+        """Test an asynchronous prepared statement."""
+
+        async def run():
+            async with AsyncClient(**altertable_service) as client:
+                async with await client.prepare(
+                    f"SELECT * FROM {test_table.full_name} WHERE id = $id"
+                ) as stmt:
+                    stream = await stmt.query(parameters={"id": 1})
+                    return await stream.read_all()
+
+        table = asyncio.run(run())
+        assert table.column("name").to_pylist() == ["Alice"]
+
+
+class TestAsyncTransactions:
+    """Test asynchronous transactions."""
+
+    def test_commit_transaction(self, altertable_service: dict, test_table: TableInfo):
+        """Test committing a transaction."""
+
+        async def run():
+            async with AsyncClient(**altertable_service) as client:
+                async with await client.begin_transaction():
+                    await client.execute(
+                        f"INSERT INTO {test_table.full_name} (id, name, value) VALUES (999, 'Robert', 600)"
+                    )
+
+                stream = await client.query(
+                    f"SELECT name FROM {test_table.full_name} WHERE id = 999"
+                )
+                return await stream.read_all()
+
+        table = asyncio.run(run())
+        assert table.column("name").to_pylist() == ["Robert"]
@@ -0,0 +1,100 @@
+"""
+Tests for per-call timeouts and query cancellation.
+
+Runs against the in-process server, whose ``latency`` delays every call.
+"""
+
+import time
+
+import pyarrow as pa
+import pyarrow.flight as flight
+import pytest
+
+from altertable_flightsql import Client, QueryResult
+from altertable_flightsql.testing import FlightSQLServer
+
+
+class TestTimeouts:
+    """Test per-call and default timeouts."""
+
+    def test_call_timeout(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that a call slower than its timeout fails."""
+        local_server.latency = 0.5
+        with pytest.raises(flight.FlightTimedOutError):
+            local_client.query("SELECT 1 AS value", timeout=0.05)
+        with pytest.raises(flight.FlightTimedOutError):
+            local_client.execute("CREATE TABLE items (id INT)", timeout=0.05)
+
+    def test_default_timeout(self, local_server: FlightSQLServer):
+        """Test that the client default timeout applies to every call and can be overridden."""
+        with Client(**local_server.client_options(), timeout=0.5) as client:
+            local_server.latency = 1.0
+            with pytest.raises(flight.FlightTimedOutError):
+                client.get_catalogs()
+
+            local_server.latency = 0.1
+            result = client.query("SELECT 1 AS value", timeout=5)
+            assert result.read_all().to_pylist() == [{"value": 1}]
+
+
+class TestCancellation:
+    """Test cancelling queries on the server."""
+
+    def test_cancel_pending_query(self, local_server: FlightSQLServer, local_client: Client):
+        """Test cancelling a query whose results were not read yet."""
+        local_server.endpoints = 4
+        local_server.create_table("events", pa.table({"id": pa.array(range(100), pa.int64())}))
+        # Endpoints are fetched one at a time, each delayed by the latency
+        local_server.latency = 0.2
+
+        result = local_client.query("SELECT * FROM events", parallel=True, max_workers=1)
+        assert isinstance(result, QueryResult)
+        assert len(result.info.endpoints) == 4
+        assert result.cancel()
+        assert local_server.calls["CancelQuery"] == 1
+
+    def test_cancel_completed_query(self, local_client: Client):
+        """Test that a query which already completed cannot be cancelled."""
+        with local_client.query("SELECT 1 AS value") as result:
+            assert result.read_all().num_rows == 1
+            assert not result.cancel()
+
+
+class TestSubmitQuery:
+    """Test queries planned in the background."""
+
+    def test_submit_query(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that a submitted query reports its planning and streams its results."""
+        local_server.endpoints = 2
+        local_server.create_table("events", pa.table({"id": pa.array(range(10), pa.int64())}))
+        local_server.latency = 0.3
+
+        handle = local_client.submit_query("SELECT * FROM events")
+        assert not handle.done()
+        assert handle.endpoints == []
+
+        assert handle.wait(timeout=5)
+        assert len(handle.endpoints) == 2
+        assert handle.result(parallel=True).read_all().num_rows == 10
+
+    def test_submit_query_error(self, local_client: Client):
+        """Test that planning errors are raised by result."""
+        handle = local_client.submit_query("SELECT * FROM missing")
+        assert handle.wait(timeout=5)
+        assert handle.info is None
+        with pytest.raises(flight.FlightServerError):
+            handle.result()
+
+    def test_cancel_while_planning(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that a query cancelled while planned is cancelled once planned."""
+        local_server.latency = 0.3
+        handle = local_client.submit_query("SELECT 1 AS value")
+        assert handle.cancel()
+        assert handle.wait(timeout=5)
+        with pytest.raises(RuntimeError):
+            handle.result()
+
+        deadline = time.monotonic() + 5
+        while local_server.calls.get("CancelQuery", 0) == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert local_server.calls["CancelQuery"] == 1
@@ -0,0 +1,139 @@
+"""
+Tests for sharing one client across threads and tasks.
+
+Runs against the in-process server.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import AsyncClient, Client
+from altertable_flightsql.testing import FlightSQLServer
+
+
+class TestThreadSafety:
+    """Test concurrent use of a single client."""
+
+    def test_concurrent_queries(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that one client serves a thread pool of queries."""
+        local_server.create_table("numbers", pa.table({"n": pa.array(range(100), pa.int64())}))
+
+        def run(i: int) -> int:
+            if i % 2:
+                return local_client.query(f"SELECT {i} AS value").read_all().column(0)[0].as_py()
+            return local_client.query("SELECT * FROM numbers").read_all().num_rows + i
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(run, range(64)))
+
+        assert results == [i if i % 2 else 100 + i for i in range(64)]
+
+    @pytest.mark.parametrize("late_binding", [False, True])
+    def test_shared_prepared_statement(self, local_server: FlightSQLServer, late_binding: bool):
+        """Test that threads sharing a cached prepared statement get their own results."""
+        local_server.latency = 0.01
+        # Tickets then read the parameters bound when their stream is opened
+        local_server.late_binding = late_binding
+
+        with Client(**local_server.client_options(), prepared_statement_cache_size=4) as client:
+
+            def run(i: int) -> int:
+                stmt = client.prepare("SELECT ? AS value")
+                result = stmt.query(parameters={"value": i}, use_cache=False)
+                return result.read_all().column(0)[0].as_py()
+
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(run, range(32)))
+
+        assert results == list(range(32))
+
+    def test_statement_results_kept_open(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that binding a statement again keeps the unread results of the previous call."""
+        local_server.late_binding = True
+        stmt = local_client.prepare("SELECT ? AS value")
+
+        first = stmt.query(parameters={"value": 1}, use_cache=False)
+        second = stmt.query(parameters={"value": 2}, use_cache=False)
+
+        assert second.read_all().column(0).to_pylist() == [2]
+        assert first.read_all().column(0).to_pylist() == [1]
+
+    def test_statement_evicted_while_held(self, local_server: FlightSQLServer):
+        """Test that an evicted statement stays open until its callers close it."""
+        with Client(**local_server.client_options(), prepared_statement_cache_size=1) as client:
+            first = client.prepare("SELECT ? AS value")
+            with client.prepare("SELECT 2 AS value"):
+                pass
+
+            assert client.prepared_statement_cache_info().size == 1
+            result = first.query(parameters={"value": 1}, use_cache=False)
+            assert result.read_all().column(0).to_pylist() == [1]
+
+            (session,) = local_server._sessions.values()
+            handles = set(session.prepared_statements)
+            first.close()
+            assert set(session.prepared_statements) == handles - {first._handle}
+
+    def test_transaction_is_per_thread(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that a transaction entered on one thread is not used by the others."""
+        local_server.create_table("items", pa.table({"id": pa.array([], pa.int32())}))
+        in_transaction = threading.Event()
+        other_done = threading.Event()
+
+        def other_thread():
+            in_transaction.wait()
+            assert local_client._get_transaction_id(None) is None
+            local_client.execute("INSERT INTO items VALUES (2)")
+            other_done.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        with local_client.begin_transaction():
+            local_client.execute("INSERT INTO items VALUES (1)")
+            in_transaction.set()
+            assert other_done.wait(5)
+            # The other thread's insert was applied outside of the open transaction
+            assert local_server.get_table("items").column("id").to_pylist() == [2]
+        thread.join()
+
+        assert local_client._get_transaction_id(None) is None
+        assert sorted(local_server.get_table("items").column("id").to_pylist()) == [1, 2]
+
+    def test_nested_transaction_contexts(self, local_client: Client):
+        """Test that leaving a transaction block restores the enclosing one."""
+        with local_client.begin_transaction() as outer:
+            inner = local_client.begin_transaction()
+            with inner:
+                assert local_client._get_transaction_id(None) == inner._transaction_id
+            assert local_client._get_transaction_id(None) == outer._transaction_id
+
+    def test_transaction_is_per_task(self, local_server: FlightSQLServer):
+        """Test that async transactions only apply to the task that entered them."""
+        local_server.create_table("items", pa.table({"id": pa.array([], pa.int32())}))
+
+        async def run():
+            async with AsyncClient(**local_server.client_options()) as client:
+                entered = asyncio.Event()
+                inserted = asyncio.Event()
+
+                async def in_transaction():
+                    async with await client.begin_transaction():
+                        await client.execute("INSERT INTO items VALUES (1)")
+                        entered.set()
+                        await inserted.wait()
+                        return local_server.get_table("items").column("id").to_pylist()
+
+                async def outside():
+                    await entered.wait()
+                    await client.execute("INSERT INTO items VALUES (2)")
+                    inserted.set()
+
+                visible, _ = await asyncio.gather(in_transaction(), outside())
+                return visible
+
+        assert asyncio.run(run()) == [2]
+        assert sorted(local_server.get_table("items").column("id").to_pylist()) == [1, 2]
@@ -0,0 +1,72 @@
+"""
+Tests for the conversions of query results.
+
+Runs against the in-process server.
+"""
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import Client, ResultCache
+from altertable_flightsql.testing import FlightSQLServer
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def events(local_server: FlightSQLServer) -> pa.Table:
+    data = pa.table(
+        {
+            "id": pa.array(range(1000), pa.int64()),
+            "value": pa.array([i * 0.5 if i % 10 else None for i in range(1000)], pa.float64()),
+            "name": pa.array([f"event_{i}" for i in range(1000)], pa.string()),
+        }
+    )
+    local_server.create_table("events", data)
+    return data
+
+
+class TestConversions:
+    """Test converting query results."""
+
+    def test_to_table(self, local_server: FlightSQLServer, local_client: Client, events: pa.Table):
+        """Test that the result batches are kept as table chunks."""
+        local_server.chunk_size = 100
+        table = local_client.query("SELECT * FROM events").to_table()
+        assert table.equals(events)
+        assert table.column("id").num_chunks == 10
+
+    def test_to_pandas(self, local_client: Client, events: pa.Table):
+        """Test converting to a pandas DataFrame."""
+        pytest.importorskip("pandas")
+        df = local_client.query("SELECT * FROM events").to_pandas()
+        assert df.equals(events.to_pandas())
+
+    def test_to_pandas_cached(self, local_server: FlightSQLServer, events: pa.Table):
+        """Test that destructive conversions leave cached results intact."""
+        pytest.importorskip("pandas")
+        with Client(**local_server.client_options(), metadata_cache_ttl=60) as client:
+            for _ in range(2):
+                assert len(client.get_tables().to_pandas()) == 1
+        with Client(**local_server.client_options(), result_cache=ResultCache()) as client:
+            for _ in range(2):
+                assert len(client.query("SELECT * FROM events").to_pandas()) == 1000
+
+    @pytest.mark.parametrize("endpoints", [1, 3])
+    def test_to_numpy(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, endpoints: int
+    ):
+        """Test converting primitive columns to NumPy arrays."""
+        local_server.create_table("metrics", events.drop_columns(["name"]))
+        local_server.endpoints = endpoints
+        local_server.chunk_size = 128
+        arrays = local_client.query("SELECT * FROM metrics").to_numpy()
+        assert list(arrays) == ["id", "value"]
+        numpy.testing.assert_array_equal(arrays["id"], numpy.arange(1000))
+        assert numpy.isnan(arrays["value"][0])
+        assert arrays["value"][1] == 0.5
+
+    def test_to_numpy_unsupported(self, local_client: Client, events: pa.Table):
+        """Test that non-primitive columns are rejected."""
+        with pytest.raises(ValueError, match="name"):
+            local_client.query("SELECT * FROM events").to_numpy()
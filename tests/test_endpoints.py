@@ -0,0 +1,95 @@
+"""
+Tests for reading results split across several endpoints.
+
+Runs against the in-process server, which splits results into the
+configured number of endpoints.
+"""
+
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.flight as flight
+import pytest
+
+from altertable_flightsql import Client
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def events(local_server: FlightSQLServer) -> pa.Table:
+    data = pa.table({"id": pa.array(range(1000), pa.int64())})
+    local_server.create_table("events", data)
+    local_server.endpoints = 4
+    local_server.chunk_size = 50
+    return data
+
+
+def fetch_threads() -> list[threading.Thread]:
+    prefix = "altertable-fetch"
+    return [thread for thread in threading.enumerate() if thread.name.startswith(prefix)]
+
+
+class TestEndpoints:
+    """Test merging the result streams of several endpoints."""
+
+    def test_ordered(self, local_server: FlightSQLServer, local_client: Client, events: pa.Table):
+        """Test that a parallel fetch returns the endpoints in server order."""
+        result = local_client.query("SELECT * FROM events", parallel=True)
+
+        assert result.read_all().equals(events)
+        assert local_server.calls["DoGet"] == 4
+
+    def test_unordered(self, local_client: Client, events: pa.Table):
+        """Test that an unordered fetch returns every row."""
+        result = local_client.query("SELECT * FROM events", parallel=True, ordered=False)
+
+        ids = result.read_all().column("id").to_pylist()
+        assert sorted(ids) == events.column("id").to_pylist()
+
+    def test_sequential(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table
+    ):
+        """Test that endpoints are read one by one on the calling thread by default."""
+        result = local_client.query("SELECT * FROM events")
+
+        result.read_chunk()
+        assert local_server.calls["DoGet"] == 1
+        assert fetch_threads() == []
+        assert result.read_all().num_rows == len(events) - 50
+        assert local_server.calls["DoGet"] == 4
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"parallel": True}, {"parallel": True, "ordered": False}]
+    )
+    def test_endpoint_error(
+        self, local_server: FlightSQLServer, local_client: Client, events, options
+    ):
+        """Test that an endpoint failing halfway fails the result."""
+        local_server.interrupt_streams(1, after=2)
+        result = local_client.query("SELECT * FROM events", **options)
+
+        with pytest.raises(flight.FlightUnavailableError):
+            result.read_all()
+
+    def test_parallel_cancel(self, local_server: FlightSQLServer, local_client: Client, events):
+        """Test that cancelling a parallel fetch stops opening endpoints."""
+        local_server.latency = 0.2
+        result = local_client.query("SELECT * FROM events", parallel=True, max_workers=1)
+
+        result.read_chunk()
+        result.close()
+        time.sleep(0.5)
+
+        assert local_server.calls["DoGet"] < 4
+
+    def test_sequential_cancel(self, local_server: FlightSQLServer, local_client: Client, events):
+        """Test that a cancelled sequential read stops before the next endpoint."""
+        result = local_client.query("SELECT * FROM events")
+
+        result.read_chunk()
+        result.close()
+
+        with pytest.raises(StopIteration):
+            result.read_chunk()
+        assert local_server.calls["DoGet"] == 1
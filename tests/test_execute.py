@@ -42,3 +42,33 @@ class TestExecuteRowCount:
             f"UPDATE {test_table.full_name} SET value = 0 WHERE id = 9999"
         )
         assert rows == 0
+
+
+class TestPreparedExecute:
+    """Test that PreparedStatement.execute() reuses the prepared statement for updates."""
+
+    def test_prepared_update_returns_row_count(
+        self, altertable_client: Client, test_table: TableInfo
+    ):
+        """Test that a prepared UPDATE returns the number of updated rows."""
+        with altertable_client.prepare(
+            f"UPDATE {test_table.full_name} SET value = $value WHERE id = $id"
+        ) as stmt:
+            assert stmt.execute(parameters={"id": 1, "value": 111}) == 1
+            assert stmt.execute(parameters={"id": 9999, "value": 0}) == 0
+
+        reader = altertable_client.query(f"SELECT value FROM {test_table.full_name} WHERE id = 1")
+        assert reader.read_all().column("value").to_pylist() == [111]
+
+    def test_prepared_insert_with_positional_parameters(
+        self, altertable_client: Client, test_table: TableInfo
+    ):
+        """Test a prepared INSERT executed several times with positional parameters."""
+        with altertable_client.prepare(
+            f"INSERT INTO {test_table.full_name} (id, name, value) VALUES (?, ?, ?)"
+        ) as stmt:
+            assert stmt.execute(parameters=[4, "Dave", 400]) == 1
+            assert stmt.execute(parameters=[5, "Eve", 500]) == 1
+
+        reader = altertable_client.query(f"SELECT * FROM {test_table.full_name}")
+        assert reader.read_all().num_rows == 5
@@ -0,0 +1,103 @@
+"""
+Tests for exporting query results to files.
+
+Runs against the in-process server.
+"""
+
+import pyarrow as pa
+import pyarrow.csv as csv
+import pyarrow.parquet as pq
+import pytest
+
+from altertable_flightsql import Client
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def events(local_server: FlightSQLServer) -> pa.Table:
+    data = pa.table(
+        {
+            "id": pa.array(range(1000), pa.int64()),
+            "name": pa.array([f"event_{i}" for i in range(1000)], pa.string()),
+        }
+    )
+    local_server.create_table("events", data)
+    return data
+
+
+class TestExport:
+    """Test streaming query results to files."""
+
+    def test_parquet_row_groups(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test that Parquet files are written with the requested row groups."""
+        local_server.chunk_size = 64
+        path = tmp_path / "events.parquet"
+        rows = local_client.export("SELECT * FROM events", path, row_group_size=300)
+
+        assert rows == 1000
+        parquet_file = pq.ParquetFile(path)
+        assert [
+            parquet_file.metadata.row_group(i).num_rows
+            for i in range(parquet_file.metadata.num_row_groups)
+        ] == [300, 300, 300, 100]
+        assert parquet_file.read().equals(events)
+
+    def test_arrow_and_csv(self, local_client: Client, events: pa.Table, tmp_path):
+        """Test writing IPC and CSV files."""
+        local_client.export("SELECT * FROM events", tmp_path / "events.arrow", format="arrow")
+        with pa.memory_map(str(tmp_path / "events.arrow")) as source:
+            assert pa.ipc.open_file(source).read_all().equals(events)
+
+        local_client.export("SELECT * FROM events", tmp_path / "events.csv", format="csv")
+        assert csv.read_csv(tmp_path / "events.csv").equals(events)
+
+    def test_compressed_csv(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test that CSV files are compressed as a whole, with the codec's extension."""
+        local_client.export(
+            "SELECT * FROM events", tmp_path / "events.csv.gz", format="csv", compression="gzip"
+        )
+        with pa.CompressedInputStream(str(tmp_path / "events.csv.gz"), "gzip") as source:
+            assert csv.read_csv(source).equals(events)
+
+        local_server.endpoints = 2
+        local_client.export(
+            "SELECT * FROM events",
+            tmp_path / "events",
+            format="csv",
+            compression="zstd",
+            partitioned=True,
+        )
+        files = sorted(file.name for file in (tmp_path / "events").iterdir())
+        assert files == ["part-00000.csv.zst", "part-00001.csv.zst"]
+
+    def test_unsupported_csv_compression(self, local_client: Client, tmp_path):
+        """Test that CSV compressions without a stream codec are rejected."""
+        with pytest.raises(ValueError, match="Unsupported CSV compression"):
+            local_client.export(
+                "SELECT 1 AS value", tmp_path / "out.csv", format="csv", compression="snappy"
+            )
+        assert not (tmp_path / "out.csv").exists()
+
+    def test_partitioned(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test writing one file per endpoint, concurrently."""
+        local_server.endpoints = 4
+        rows = local_client.export(
+            "SELECT * FROM events", tmp_path / "events", partitioned=True, parallel=True
+        )
+
+        assert rows == 1000
+        files = sorted((tmp_path / "events").iterdir())
+        assert [file.name for file in files] == [f"part-0000{i}.parquet" for i in range(4)]
+        table = pa.concat_tables(pq.read_table(file) for file in files)
+        assert table.equals(events)
+
+    def test_unsupported_format(self, local_client: Client, tmp_path):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            local_client.export("SELECT 1 AS value", tmp_path / "out.json", format="json")
@@ -8,6 +8,7 @@ import pyarrow as pa
 
 from altertable_flightsql import Client
 from altertable_flightsql.client import IngestIncrementalOptions
+from altertable_flightsql.testing import FlightSQLServer
 from tests.conftest import SchemaInfo
 
 
@@ -181,3 +182,148 @@ class TestIngestWithPrimaryKey:
                 altertable_client.execute(f"DROP TABLE IF EXISTS {fully_qualified_table}")
             except Exception as e:
                 print(f"Warning: Failed to drop table {fully_qualified_table}: {e}")
+
+
+class TestIngestor:
+    """Test buffered ingestion."""
+
+    def test_ingestor_coalesces_small_batches(
+        self, altertable_client: Client, test_schema: SchemaInfo
+    ):
+        """Test that many tiny batches are sent as fewer, larger ones."""
+        import uuid
+
+        table_name = f"test_ingest_{uuid.uuid4().hex[:8]}"
+        fully_qualified_table = f"{test_schema.full_name}.{table_name}"
+
+        schema = pa.schema([("id", pa.int64()), ("name", pa.string())])
+
+        try:
+            with altertable_client.ingestor(
+                table_name=table_name,
+                schema=schema,
+                schema_name=test_schema.schema,
+                catalog_name=test_schema.catalog,
+                max_rows=100,
+            ) as ingestor:
+                for i in range(250):
+                    ingestor.write(pa.record_batch([[i], [f"user_{i}"]], schema=schema))
+                ingestor.write_row({"id": 250, "name": "user_250"})
+
+            assert ingestor.rows_written == 251
+            assert ingestor.batches_written == 3
+            assert ingestor.bytes_written > 0
+
+            reader = altertable_client.query(f"SELECT * FROM {fully_qualified_table} ORDER BY id")
+            result = reader.read_all()
+            assert result.num_rows == 251
+            assert result.column("id").to_pylist() == list(range(251))
+
+        finally:
+            # Cleanup
+            try:
+                altertable_client.execute(f"DROP TABLE IF EXISTS {fully_qualified_table}")
+            except Exception as e:
+                print(f"Warning: Failed to drop table {fully_qualified_table}: {e}")
+
+    def test_ingestor_flushes_rows_on_max_bytes(
+        self, local_server: FlightSQLServer, local_client: Client
+    ):
+        """Test that rows written one by one are flushed once max_bytes is reached."""
+        schema = pa.schema([("id", pa.int64())])
+
+        with local_client.ingestor(
+            table_name="events", schema=schema, max_rows=None, max_bytes=800
+        ) as ingestor:
+            for i in range(150):
+                ingestor.write_row({"id": i})
+            ingestor.write_rows([{"id": i} for i in range(150, 250)])
+
+        # 8 bytes per row
+        assert ingestor.batches_written == 3
+        assert ingestor.rows_written == 250
+        assert local_server.get_table("events").column("id").to_pylist() == list(range(250))
+
+
+class TestParallelIngest:
+    """Test ingestion over several concurrent streams."""
+
+    def test_ingest_parallel_table(self, altertable_client: Client, test_schema: SchemaInfo):
+        """Test ingesting a table split across several streams."""
+        import uuid
+
+        table_name = f"test_ingest_{uuid.uuid4().hex[:8]}"
+        fully_qualified_table = f"{test_schema.full_name}.{table_name}"
+
+        data = pa.table(
+            {"id": list(range(1000)), "name": [f"user_{i}" for i in range(1000)]},
+        )
+
+        try:
+            rows = altertable_client.ingest_parallel(
+                table_name=table_name,
+                source=data,
+                parallelism=4,
+                schema_name=test_schema.schema,
+                catalog_name=test_schema.catalog,
+                batch_size=100,
+            )
+            assert rows == 1000
+
+            reader = altertable_client.query(f"SELECT * FROM {fully_qualified_table} ORDER BY id")
+            result = reader.read_all()
+            assert result.num_rows == 1000
+            assert result.column("id").to_pylist() == list(range(1000))
+
+        finally:
+            # Cleanup
+            try:
+                altertable_client.execute(f"DROP TABLE IF EXISTS {fully_qualified_table}")
+            except Exception as e:
+                print(f"Warning: Failed to drop table {fully_qualified_table}: {e}")
+
+
+class TestCompressedIngest:
+    """Test ingestion with IPC buffer compression."""
+
+    def test_ingest_zstd(self, altertable_client: Client, test_schema: SchemaInfo):
+        """Test ingesting zstd-compressed batches."""
+        import uuid
+
+        table_name = f"test_ingest_{uuid.uuid4().hex[:8]}"
+        fully_qualified_table = f"{test_schema.full_name}.{table_name}"
+
+        data = pa.table(
+            {"id": list(range(1000)), "name": [f"user_{i}" for i in range(1000)]},
+        )
+
+        try:
+            with altertable_client.ingest(
+                table_name=table_name,
+                schema=data.schema,
+                schema_name=test_schema.schema,
+                catalog_name=test_schema.catalog,
+                compression="zstd",
+            ) as writer:
+                writer.write_table(data)
+
+            reader = altertable_client.query(f"SELECT * FROM {fully_qualified_table} ORDER BY id")
+            result = reader.read_all()
+            assert result.num_rows == 1000
+            assert result.column("name").to_pylist() == data.column("name").to_pylist()
+
+        finally:
+            # Cleanup
+            try:
+                altertable_client.execute(f"DROP TABLE IF EXISTS {fully_qualified_table}")
+            except Exception as e:
+                print(f"Warning: Failed to drop table {fully_qualified_table}: {e}")
+
+    def test_unsupported_codec(self, altertable_client: Client):
+        """Test that unknown codecs are rejected before anything is sent."""
+        import pytest
+
+        with pytest.raises(ValueError, match="Unsupported compression codec"):
+            altertable_client.ingest(
+                table_name="unused", schema=pa.schema([("id", pa.int64())]), compression="nope"
+            )
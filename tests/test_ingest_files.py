@@ -0,0 +1,109 @@
+"""
+Tests for bulk ingestion of files.
+
+Runs against the in-process server.
+"""
+
+import pyarrow as pa
+import pyarrow.csv as csv
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from altertable_flightsql import Client, IngestProgress
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def events() -> pa.Table:
+    return pa.table(
+        {
+            "id": pa.array(range(1000), pa.int64()),
+            "kind": pa.array(["click" if i % 4 else "view" for i in range(1000)], pa.string()),
+            "value": pa.array([i * 0.5 for i in range(1000)], pa.float64()),
+        }
+    )
+
+
+def _ingested(server: FlightSQLServer, name: str) -> pa.Table:
+    return server.get_table(name).sort_by("id")
+
+
+class TestIngestFiles:
+    """Test ingesting Parquet, IPC and CSV files."""
+
+    def test_parquet_directory(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test ingesting a directory of Parquet files over several streams."""
+        for i in range(4):
+            pq.write_table(events.slice(i * 250, 250), tmp_path / f"part-{i}.parquet")
+
+        rows = local_client.ingest_files(
+            table_name="events", source=tmp_path, parallelism=2, batch_size=100
+        )
+
+        assert rows == 1000
+        assert _ingested(local_server, "events").equals(events)
+
+    def test_formats_inferred_from_extensions(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test ingesting Feather and CSV files."""
+        feather.write_feather(events, tmp_path / "events.feather")
+        csv.write_csv(events, tmp_path / "events.csv")
+
+        local_client.ingest_files(table_name="from_ipc", source=tmp_path / "events.feather")
+        local_client.ingest_files(table_name="from_csv", source=[str(tmp_path / "events.csv")])
+
+        assert _ingested(local_server, "from_ipc").equals(events)
+        assert _ingested(local_server, "from_csv").equals(events)
+
+    def test_projection_and_filter(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table, tmp_path
+    ):
+        """Test that only the selected columns and rows are ingested."""
+        pq.write_table(events, tmp_path / "events.parquet")
+
+        rows = local_client.ingest_files(
+            table_name="views",
+            source=ds.dataset(tmp_path / "events.parquet"),
+            columns=["id", "value"],
+            filter=ds.field("kind") == "view",
+        )
+
+        assert rows == 250
+        views = _ingested(local_server, "views")
+        assert views.column_names == ["id", "value"]
+        assert views.column("id").to_pylist() == list(range(0, 1000, 4))
+
+    def test_progress(self, local_client: Client, events: pa.Table, tmp_path):
+        """Test that progress is reported, with a final report once done."""
+        pq.write_table(events, tmp_path / "events.parquet")
+        reports: list[IngestProgress] = []
+
+        local_client.ingest_files(
+            table_name="events",
+            source=tmp_path / "events.parquet",
+            batch_size=100,
+            progress=reports.append,
+            progress_interval=0,
+        )
+
+        assert len(reports) > 1
+        assert reports[-1].done
+        assert reports[-1].rows == 1000
+        assert reports[-1].bytes > 0
+        assert [report.rows for report in reports] == sorted(report.rows for report in reports)
+
+    def test_unknown_format(self, local_client: Client, tmp_path):
+        """Test that files of unknown format are rejected."""
+        (tmp_path / "events.txt").write_text("id\n1\n")
+
+        with pytest.raises(ValueError, match="format"):
+            local_client.ingest_files(table_name="events", source=tmp_path / "events.txt")
+        with pytest.raises(ValueError, match="Unsupported"):
+            local_client.ingest_files(
+                table_name="events", source=tmp_path / "events.txt", format="json"
+            )
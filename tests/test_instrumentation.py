@@ -0,0 +1,105 @@
+"""
+Tests for the instrumentation hooks.
+
+Runs against the in-process server from ``altertable_flightsql.testing``.
+"""
+
+import asyncio
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import AsyncClient, Client
+from altertable_flightsql.instrumentation import SpanRecorder
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def recorder() -> SpanRecorder:
+    """Provide an instrumentation recording spans."""
+    return SpanRecorder()
+
+
+@pytest.fixture
+def instrumented_client(local_server: FlightSQLServer, recorder: SpanRecorder):
+    """Provide an instrumented client, without the spans of the handshake."""
+    with Client(**local_server.client_options(), instrumentation=recorder) as client:
+        recorder.clear()
+        yield client
+
+
+class TestInstrumentation:
+    """Test the spans reported per RPC."""
+
+    def test_query_phases(
+        self, local_server: FlightSQLServer, instrumented_client: Client, recorder: SpanRecorder
+    ):
+        """Test that planning and streaming are reported separately, with counts."""
+        local_server.endpoints = 2
+        data = pa.table({"id": pa.array(range(10), pa.int64())})
+        local_server.create_table("events", data)
+
+        instrumented_client.query("SELECT * FROM events").read_all()
+
+        assert [(span.operation, span.name) for span in recorder.spans] == [
+            ("query", "GetFlightInfo"),
+            ("query", "DoGet"),
+            ("query", "DoGet"),
+        ]
+        streams = recorder.spans[1:]
+        assert sum(span.rows for span in streams) == 10
+        assert sum(span.bytes for span in streams) == data.nbytes
+        for span in recorder.spans:
+            assert span.duration >= span.time_to_first_response >= 0
+
+    def test_upload_counts(self, instrumented_client: Client, recorder: SpanRecorder):
+        """Test that prepared statement parameters are counted."""
+        instrumented_client.execute("CREATE TABLE items (id BIGINT)")
+        with instrumented_client.prepare("INSERT INTO items VALUES (?)") as stmt:
+            stmt.executemany(pa.table({"id": pa.array([1, 2, 3], pa.int64())}))
+
+        spans = [(span.operation, span.name, span.rows) for span in recorder.spans]
+        assert spans == [
+            ("execute", "DoPut", 0),
+            ("prepare", "DoAction", 0),
+            ("prepared_statement.executemany", "DoPut", 3),
+            ("prepared_statement.close", "DoAction", 0),
+        ]
+
+    def test_ingest_counts(self, instrumented_client: Client, recorder: SpanRecorder):
+        """Test that ingested rows and bytes are counted."""
+        data = pa.table({"id": pa.array(range(100), pa.int64())})
+
+        with instrumented_client.ingest(table_name="items", schema=data.schema) as writer:
+            writer.write_table(data)
+
+        (span,) = recorder.spans
+        assert (span.operation, span.name) == ("ingest", "DoPut")
+        assert (span.rows, span.bytes) == (100, data.nbytes)
+
+    def test_async_query(self, local_server: FlightSQLServer, recorder: SpanRecorder):
+        """Test that the calls of asyncio queries are attributed to the query."""
+        local_server.create_table("events", pa.table({"id": pa.array(range(10), pa.int64())}))
+
+        async def run():
+            async with AsyncClient(
+                **local_server.client_options(), instrumentation=recorder
+            ) as client:
+                recorder.clear()
+                stream = await client.query("SELECT * FROM events")
+                return await stream.read_all()
+
+        assert asyncio.run(run()).num_rows == 10
+        assert [(span.operation, span.name, span.rows) for span in recorder.spans] == [
+            ("query", "GetFlightInfo", 0),
+            ("query", "DoGet", 10),
+        ]
+
+    def test_errors(self, instrumented_client: Client, recorder: SpanRecorder):
+        """Test that failed calls report their error."""
+        with pytest.raises(Exception):
+            instrumented_client.query("SELECT * FROM missing")
+
+        (span,) = recorder.spans
+        assert span.name == "GetFlightInfo"
+        assert "missing" in str(span.error)
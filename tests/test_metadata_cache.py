@@ -0,0 +1,94 @@
+"""
+Tests for the metadata cache.
+
+Runs against the in-process server, which counts the calls it receives.
+"""
+
+import time
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import Client
+from altertable_flightsql.client import IngestTableMode
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def cached_client(local_server: FlightSQLServer):
+    with Client(**local_server.client_options(), metadata_cache_ttl=60) as client:
+        yield client
+
+
+class TestMetadataCache:
+    """Test caching metadata lookups."""
+
+    def test_repeated_lookups(self, local_server: FlightSQLServer, cached_client: Client):
+        """Test that repeated lookups are served from the cache."""
+        local_server.create_table("users", pa.table({"id": pa.array([1], pa.int32())}))
+
+        for _ in range(3):
+            assert cached_client.get_catalogs().read_all().num_rows == 1
+            tables = cached_client.get_tables(include_schema=True).read_all()
+            assert tables.column("table_name").to_pylist() == ["users"]
+            schemas = cached_client.get_table_schemas()
+            assert schemas == {"users": pa.schema([pa.field("id", pa.int32())])}
+
+        assert local_server.calls["GetFlightInfo"] == 3
+        assert cached_client.metadata_cache_info().hits == 6
+
+    def test_table_schemas_without_client_schema(self, local_server: FlightSQLServer):
+        """Test that a client without a default catalog and schema lists every table."""
+        local_server.create_table("users", pa.table({"id": pa.array([1], pa.int32())}))
+        options = {**local_server.client_options(), "catalog": None, "schema": None}
+
+        with Client(**options) as client:
+            assert client.get_table_schemas() == {"users": pa.schema([("id", pa.int32())])}
+
+    def test_ddl_invalidation(self, local_server: FlightSQLServer, cached_client: Client):
+        """Test that DDL statements clear the cache, and other updates do not."""
+        cached_client.execute("CREATE TABLE users (id INT)")
+        assert list(cached_client.get_table_schemas()) == ["users"]
+
+        cached_client.execute("INSERT INTO users VALUES (1)")
+        cached_client.get_table_schemas()
+        assert local_server.calls["GetFlightInfo"] == 1
+
+        cached_client.execute("DROP TABLE users")
+        assert cached_client.get_table_schemas() == {}
+
+    def test_ingest_invalidation(self, local_server: FlightSQLServer, cached_client: Client):
+        """Test that ingests creating or replacing tables clear the cache once done."""
+        assert cached_client.get_table_schemas() == {}
+
+        data = pa.table({"id": pa.array([1, 2], pa.int64())})
+        with cached_client.ingest(
+            table_name="events", schema=data.schema, mode=IngestTableMode.CREATE
+        ) as writer:
+            writer.write_table(data)
+        assert cached_client.get_table_schemas() == {"events": data.schema}
+
+        replaced = pa.table({"id": pa.array(["a"], pa.string())})
+        with cached_client.ingest(
+            table_name="events", schema=replaced.schema, mode=IngestTableMode.REPLACE
+        ) as writer:
+            writer.write_table(replaced)
+        assert cached_client.get_table_schemas() == {"events": replaced.schema}
+
+    def test_transaction_invalidation(self, local_server: FlightSQLServer, cached_client: Client):
+        """Test that ending a transaction clears the cache again after DDL within it."""
+        with cached_client.begin_transaction():
+            cached_client.execute("CREATE TABLE users (id INT)")
+            # The table is only visible once the transaction is committed
+            assert cached_client.get_table_schemas() == {}
+
+        assert list(cached_client.get_table_schemas()) == ["users"]
+
+    def test_ttl(self, local_server: FlightSQLServer):
+        """Test that entries expire after the TTL."""
+        with Client(**local_server.client_options(), metadata_cache_ttl=0.2) as client:
+            client.get_catalogs().read_all()
+            time.sleep(0.3)
+            client.get_catalogs().read_all()
+
+        assert local_server.calls["GetFlightInfo"] == 2
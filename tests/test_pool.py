@@ -0,0 +1,100 @@
+"""
+Integration tests for the client pool.
+
+Tests connection reuse, bounds and session reset.
+"""
+
+import threading
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import ClientPool, ResultCache
+from altertable_flightsql.testing import FlightSQLServer
+
+
+class TestClientPool:
+    """Test pooled clients."""
+
+    def test_connection_is_reused(self, altertable_service: dict):
+        """Test that a released client is handed out again."""
+        with ClientPool(**altertable_service, max_size=2) as pool:
+            with pool.connection() as client:
+                first = client
+                assert client.query("SELECT 1 AS value").read_all().num_rows == 1
+
+            with pool.connection() as client:
+                assert client is first
+
+            assert pool.size == 1
+
+    def test_pool_is_bounded(self, altertable_service: dict):
+        """Test that acquire times out when the pool is exhausted."""
+        with ClientPool(**altertable_service, max_size=1) as pool:
+            with pool.connection():
+                with pytest.raises(TimeoutError):
+                    pool.acquire(timeout=0.1)
+
+    def test_concurrent_connections(self, altertable_service: dict):
+        """Test sharing a pool across threads."""
+        results = []
+
+        with ClientPool(**altertable_service, max_size=2) as pool:
+
+            def work(i: int):
+                with pool.connection() as client:
+                    table = client.query(f"SELECT {i} AS value").read_all()
+                    results.append(table.column("value")[0].as_py())
+
+            threads = [threading.Thread(target=work, args=(i,)) for i in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert pool.size <= 2
+
+        assert sorted(results) == list(range(6))
+
+    def test_thread_client(self, altertable_service: dict):
+        """Test that a thread gets the same client on every call."""
+        with ClientPool(**altertable_service) as pool:
+            assert pool.thread_client() is pool.thread_client()
+
+    def test_health_check_bypasses_result_cache(self, local_server: FlightSQLServer):
+        """Test that health checks reach the server even with a shared result cache."""
+        options = local_server.client_options()
+        with ClientPool(**options, result_cache=ResultCache(), health_check_interval=0) as pool:
+            with pool.connection():
+                pass
+            for _ in range(3):
+                with pool.connection():
+                    pass
+
+        assert local_server.calls["GetFlightInfo"] == 3
+
+    def test_release_rolls_back_transactions(self, local_server: FlightSQLServer):
+        """Test that transactions left open, entered or not, are rolled back on release."""
+        local_server.create_table("items", pa.table({"id": pa.array([], pa.int32())}))
+
+        with ClientPool(**local_server.client_options(), max_size=1) as pool:
+            with pool.connection() as client:
+                transaction = client.begin_transaction()
+                client.execute("INSERT INTO items VALUES (1)", transaction=transaction)
+
+            def run():
+                client = pool.thread_client()
+                client.begin_transaction().__enter__()
+                client.execute("INSERT INTO items VALUES (2)")
+
+            # The lease of the thread is released once it exits
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+
+            assert pool.idle == 1
+            assert local_server._transactions == {}
+            with pool.connection() as client:
+                assert client._get_transaction_id(None) is None
+
+        assert local_server.get_table("items").num_rows == 0
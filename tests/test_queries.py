@@ -54,6 +54,29 @@ class TestBasicQueries:
             assert len(df) == 0
 
 
+class TestParallelQueries:
+    """Test fetching every endpoint of a query result."""
+
+    def test_parallel_query(self, altertable_client: Client, test_table: TableInfo):
+        """Test that a parallel fetch returns the full result."""
+        reader = altertable_client.query(
+            f"SELECT * FROM {test_table.full_name} ORDER BY id", parallel=True
+        )
+        table = reader.read_all()
+
+        assert table.num_rows == 3
+        assert table.column("id").to_pylist() == [1, 2, 3]
+
+    def test_parallel_query_unordered(self, altertable_client: Client, test_table: TableInfo):
+        """Test that an unordered parallel fetch returns every row."""
+        reader = altertable_client.query(
+            f"SELECT * FROM {test_table.full_name}", parallel=True, ordered=False
+        )
+        table = reader.read_all()
+
+        assert sorted(table.column("id").to_pylist()) == [1, 2, 3]
+
+
 class TestPreparedStatements:
     """Test prepared statement functionality."""
 
@@ -102,6 +125,95 @@ class TestPreparedStatements:
             assert table.num_rows > 0
 
 
+class TestPreparedStatementParameters:
+    """Test that prepared statement results follow the bound parameters."""
+
+    def test_rebinding_parameters(self, altertable_client: Client, test_table: TableInfo):
+        """Test that each query returns the results of its own parameters."""
+        with altertable_client.prepare(
+            f"SELECT name FROM {test_table.full_name} WHERE id = $id"
+        ) as stmt:
+            names = [
+                stmt.query(parameters={"id": i}).read_all().column("name").to_pylist()
+                for i in (1, 2, 3)
+            ]
+
+        assert names == [["Alice"], ["Bob"], ["Charlie"]]
+
+    def test_querymany(self, altertable_client: Client, test_table: TableInfo):
+        """Test streaming the results of many parameter batches."""
+        with altertable_client.prepare(
+            f"SELECT name FROM {test_table.full_name} WHERE id = $id"
+        ) as stmt:
+            reader = stmt.querymany([{"id": 3}, {"id": 1}, {"id": 2}], batch_size=1)
+            table = reader.read_all()
+
+        assert table.column("name").to_pylist() == ["Charlie", "Alice", "Bob"]
+
+
+class TestPreparedStatementBatches:
+    """Test executing prepared statements for many parameter sets."""
+
+    def test_executemany_with_table(self, altertable_client: Client, test_table: TableInfo):
+        """Test executemany with a Table of parameter sets."""
+        parameters = pa.table(
+            {"id": [10, 11, 12], "name": ["Dave", "Eve", "Frank"], "value": [400, 500, 600]}
+        )
+        with altertable_client.prepare(
+            f"INSERT INTO {test_table.full_name} (id, name, value) VALUES ($id, $name, $value)"
+        ) as stmt:
+            counts = stmt.executemany(parameters)
+
+        assert sum(counts) == 3
+        table = altertable_client.query(f"SELECT * FROM {test_table.full_name}").read_all()
+        assert table.num_rows == 6
+
+    def test_executemany_with_tuples(self, altertable_client: Client, test_table: TableInfo):
+        """Test executemany with a list of positional parameter sets."""
+        with altertable_client.prepare(
+            f"INSERT INTO {test_table.full_name} (id, name, value) VALUES (?, ?, ?)"
+        ) as stmt:
+            counts = stmt.executemany([(20 + i, f"user_{i}", i) for i in range(10)], batch_size=4)
+
+        assert sum(counts) == 10
+        table = altertable_client.query(
+            f"SELECT * FROM {test_table.full_name} WHERE id >= 20"
+        ).read_all()
+        assert table.num_rows == 10
+
+
+class TestPreparedStatementCache:
+    """Test the client-side prepared statement cache."""
+
+    def test_cache_reuses_statements(self, altertable_service: dict, test_table: TableInfo):
+        """Test that preparing the same SQL twice hits the cache."""
+        query = f"SELECT * FROM {test_table.full_name} WHERE id = $id"
+
+        with Client(**altertable_service, prepared_statement_cache_size=4) as client:
+            with client.prepare(query) as first:
+                first.query(parameters={"id": 1}).read_all()
+
+            with client.prepare(query) as second:
+                table = second.query(parameters={"id": 2}).read_all()
+
+            assert second is first
+            assert table.column("name").to_pylist() == ["Bob"]
+
+            info = client.prepared_statement_cache_info()
+            assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+    def test_cache_evicts_least_recently_used(
+        self, altertable_service: dict, test_table: TableInfo
+    ):
+        """Test that the cache is bounded."""
+        with Client(**altertable_service, prepared_statement_cache_size=1) as client:
+            first = client.prepare(f"SELECT * FROM {test_table.full_name} WHERE id = $id")
+            client.prepare(f"SELECT * FROM {test_table.full_name} WHERE value = $value")
+
+            assert client.prepared_statement_cache_info().size == 1
+            assert not first._cached
+
+
 class TestErrorHandling:
     """Test error handling in query execution."""
 
@@ -0,0 +1,142 @@
+"""
+Tests for reading result streams ahead of the consumer.
+
+Runs against the in-process server, and against an in-memory reader that
+records how far it was read.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import Client, ReadaheadReader
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@dataclass
+class Chunk:
+    data: pa.RecordBatch
+    app_metadata: Optional[pa.Buffer] = None
+
+
+class RecordingReader:
+    """Reader of in-memory batches, counting the chunks read and failing on demand."""
+
+    def __init__(
+        self,
+        batches: list[pa.RecordBatch],
+        fail_after: Optional[int] = None,
+        delay: float = 0.0,
+    ):
+        self.schema = batches[0].schema
+        self.chunks_read = 0
+        self.cancelled = False
+        self._batches = batches
+        self._fail_after = fail_after
+        self._delay = delay
+        self._read = threading.Event()
+
+    def read_chunk(self) -> Chunk:
+        time.sleep(self._delay)
+        if self.chunks_read == self._fail_after:
+            raise RuntimeError("stream broke")
+        if self.chunks_read >= len(self._batches):
+            raise StopIteration
+        self.chunks_read += 1
+        self._read.set()
+        return Chunk(self._batches[self.chunks_read - 1])
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def settle(self) -> int:
+        """Wait for the background reads to pause, returning the chunks read."""
+        while True:
+            self._read.clear()
+            if not self._read.wait(0.05):
+                return self.chunks_read
+
+
+def make_batches(count: int, rows: int = 1000) -> list[pa.RecordBatch]:
+    return [pa.record_batch({"id": pa.array(range(rows), pa.int64())}) for _ in range(count)]
+
+
+class TestReadahead:
+    """Test prefetching result chunks with bounded memory."""
+
+    def test_query_result(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that a prefetched result reads the same data."""
+        data = pa.table({"id": pa.array(range(10_000), pa.int64())})
+        local_server.create_table("events", data)
+        local_server.chunk_size = 512
+
+        result = local_client.query("SELECT * FROM events").readahead(max_chunks=4)
+
+        assert result.schema == data.schema
+        assert result.read_all().equals(data)
+
+    def test_bounded_by_chunks(self):
+        """Test that reading pauses once max_chunks chunks are buffered."""
+        source = RecordingReader(make_batches(20))
+        reader = ReadaheadReader(source, max_chunks=3)
+
+        assert source.settle() == 3
+        reader.read_chunk()
+        assert source.settle() == 4
+        assert sum(chunk.data.num_rows for chunk in reader) == 19_000
+
+    def test_bounded_by_bytes(self):
+        """Test that reading pauses once max_bytes bytes are buffered."""
+        batches = make_batches(20)
+        source = RecordingReader(batches)
+        reader = ReadaheadReader(source, max_chunks=100, max_bytes=int(batches[0].nbytes * 2.5))
+
+        assert source.settle() == 3
+        reader.cancel()
+
+    def test_dropped_reader_stops(self):
+        """Test that dropping a reader before the end stops reading ahead."""
+        source = RecordingReader(make_batches(20), delay=0.01)
+        ReadaheadReader(source, max_chunks=100)
+
+        assert source.settle() < 3
+
+    def test_oversized_chunk(self):
+        """Test that a chunk larger than max_bytes is still read ahead, alone."""
+        source = RecordingReader(make_batches(5))
+        reader = ReadaheadReader(source, max_bytes=1)
+
+        assert source.settle() == 1
+        assert len(list(reader)) == 5
+
+    def test_error_propagated(self):
+        """Test that a stream error is raised after the chunks read before it."""
+        reader = ReadaheadReader(RecordingReader(make_batches(5), fail_after=2))
+
+        reader.read_chunk()
+        reader.read_chunk()
+        with pytest.raises(RuntimeError, match="stream broke"):
+            reader.read_chunk()
+
+    def test_cancel(self):
+        """Test that cancelling drops the buffer and cancels the stream."""
+        source = RecordingReader(make_batches(20))
+        reader = ReadaheadReader(source, max_chunks=2)
+        source.settle()
+
+        reader.cancel()
+        time.sleep(0.05)
+
+        assert source.cancelled
+        assert source.chunks_read == 2
+        with pytest.raises(StopIteration):
+            reader.read_chunk()
+
+    def test_invalid_max_chunks(self):
+        """Test that at least one chunk must be buffered."""
+        with pytest.raises(ValueError):
+            ReadaheadReader(RecordingReader(make_batches(1)), max_chunks=0)
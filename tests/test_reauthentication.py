@@ -0,0 +1,103 @@
+"""
+Tests for re-authenticating when the bearer token expires.
+
+Runs against the in-process server, whose ``expire_tokens`` invalidates
+every issued token and session.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.flight as flight
+import pytest
+
+from altertable_flightsql import AsyncClient, Client
+from altertable_flightsql.testing import FlightSQLServer
+
+
+class TestReauthentication:
+    """Test transparent token refresh."""
+
+    def test_calls_after_expiry(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that queries, metadata and idempotent actions survive an expired token."""
+        local_server.create_table("items", pa.table({"id": pa.array([1, 2], pa.int32())}))
+
+        local_server.expire_tokens()
+        assert local_client.query("SELECT * FROM items").read_all().num_rows == 2
+
+        local_client.execute("INSERT INTO items VALUES (3)")
+
+        local_server.expire_tokens()
+        assert "items" in local_client.get_tables().read_all().column("table_name").to_pylist()
+
+        local_server.expire_tokens()
+        statement = local_client.prepare("SELECT * FROM items")
+        assert statement.query().read_all().num_rows == 3
+
+    def test_action_not_retried(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that actions changing server state are not run again after re-authenticating."""
+        local_server.expire_tokens()
+
+        with pytest.raises(flight.FlightUnauthenticatedError):
+            local_client.begin_transaction()
+        assert local_server._transactions == {}
+
+        # The token was renewed for the next calls
+        with local_client.begin_transaction():
+            pass
+
+    def test_update_not_retried(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that an update failing after it was applied is not applied again."""
+        applied = []
+
+        def insert(parameters) -> int:
+            applied.append(1)
+            # The token expires while the statement runs
+            local_server.expire_tokens()
+            raise flight.FlightUnauthenticatedError("Token expired")
+
+        local_server.register_update("INSERT INTO items VALUES (1)", insert)
+
+        with pytest.raises(flight.FlightUnauthenticatedError):
+            local_client.execute("INSERT INTO items VALUES (1)")
+        assert applied == [1]
+
+        # The token was renewed for the next calls
+        assert local_client.query("SELECT 1 AS value").read_all().num_rows == 1
+
+    def test_single_handshake(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that concurrent calls failing with the same token share one handshake."""
+        local_server.latency = 0.05
+        local_server.expire_tokens()
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(
+                    lambda i: local_client.query(f"SELECT {i} AS value").read_all(), range(8)
+                )
+            )
+
+        assert [result.column(0)[0].as_py() for result in results] == list(range(8))
+        assert len(local_server._sessions) == 1
+
+    def test_session_options_restored(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that the schema set on the client applies to the new session."""
+        local_client.execute("CREATE SCHEMA staging")
+        local_server.create_table("altertable.staging.items", pa.table({"id": [1, 2, 3]}))
+        local_client.set_schema("staging")
+
+        local_server.expire_tokens()
+
+        assert local_client.query("SELECT * FROM items").read_all().num_rows == 3
+
+    def test_async_query_after_expiry(self, local_server: FlightSQLServer):
+        """Test that the asyncio client re-authenticates too."""
+
+        async def run():
+            async with AsyncClient(**local_server.client_options()) as client:
+                local_server.expire_tokens()
+                stream = await client.query("SELECT 1 AS value")
+                return await stream.read_all()
+
+        assert asyncio.run(run()).to_pylist() == [{"value": 1}]
@@ -0,0 +1,123 @@
+"""
+Tests for resizing the record batches of result streams.
+
+Runs against the in-process server, and against an in-memory reader.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import Client, RechunkReader
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@dataclass
+class Chunk:
+    data: pa.RecordBatch
+    app_metadata: Optional[pa.Buffer] = None
+
+
+class BatchReader:
+    """Reader of in-memory batches."""
+
+    def __init__(self, batches: list[pa.RecordBatch]):
+        self.schema = batches[0].schema
+        self._batches = iter(batches)
+
+    def read_chunk(self) -> Chunk:
+        return Chunk(next(self._batches))
+
+    def cancel(self) -> None:
+        pass
+
+
+def make_batches(*sizes: int) -> list[pa.RecordBatch]:
+    return [pa.record_batch({"id": pa.array(range(size), pa.int64())}) for size in sizes]
+
+
+def batch_sizes(reader: RechunkReader) -> list[int]:
+    return [chunk.data.num_rows for chunk in reader]
+
+
+class TestRechunk:
+    """Test coalescing and splitting batches."""
+
+    def test_coalesce(self):
+        """Test that small batches are combined up to max_rows."""
+        batches = make_batches(*[100] * 10)
+        reader = RechunkReader(BatchReader(batches), max_rows=250)
+
+        table = reader.read_all()
+
+        assert [batch.num_rows for batch in table.to_batches()] == [250, 250, 250, 250]
+        assert table.equals(pa.Table.from_batches(batches))
+
+    def test_split_without_copy(self):
+        """Test that large batches are sliced over the same buffers."""
+        (batch,) = make_batches(1000)
+        chunks = list(RechunkReader(BatchReader([batch]), max_rows=300))
+
+        assert [chunk.data.num_rows for chunk in chunks] == [300, 300, 300, 100]
+        source = batch.column(0).buffers()[1].address
+        assert all(chunk.data.column(0).buffers()[1].address == source for chunk in chunks)
+
+    def test_mixed_sizes(self):
+        """Test that batches are split and coalesced across boundaries."""
+        reader = RechunkReader(BatchReader(make_batches(30, 150, 10, 10, 500)), max_rows=100)
+
+        assert batch_sizes(reader) == [100, 100, 100, 100, 100, 100, 100]
+
+    def test_max_bytes(self):
+        """Test that batches are sized by their estimated number of bytes."""
+        # 8 bytes per row
+        reader = RechunkReader(BatchReader(make_batches(1000, 1000)), max_bytes=6000)
+
+        assert batch_sizes(reader) == [750, 750, 500]
+
+    def test_rows_and_bytes(self):
+        """Test that the smaller of both limits applies."""
+        reader = RechunkReader(BatchReader(make_batches(1000)), max_rows=400, max_bytes=2400)
+
+        assert batch_sizes(reader) == [300, 300, 300, 100]
+
+    def test_row_over_max_bytes(self):
+        """Test that a row larger than max_bytes makes a batch on its own."""
+        reader = RechunkReader(BatchReader(make_batches(3)), max_bytes=1)
+
+        assert batch_sizes(reader) == [1, 1, 1]
+
+    def test_invalid_arguments(self):
+        """Test that a positive limit is required."""
+        with pytest.raises(ValueError):
+            RechunkReader(BatchReader(make_batches(1)))
+        with pytest.raises(ValueError):
+            RechunkReader(BatchReader(make_batches(1)), max_rows=0)
+
+    def test_query_result(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that query results are resized, with readahead too."""
+        data = pa.table({"id": pa.array(range(10_000), pa.int64())})
+        local_server.create_table("events", data)
+        local_server.chunk_size = 100
+
+        result = local_client.query("SELECT * FROM events").readahead().rechunk(max_rows=4096)
+
+        assert [chunk.data.num_rows for chunk in result] == [4096, 4096, 1808]
+
+
+class TestResultBatchSize:
+    """Test asking the server for a batch size."""
+
+    def test_session_option(self, local_server: FlightSQLServer):
+        """Test that the preferred batch size is sent and restored after re-authenticating."""
+        local_server.create_table("events", pa.table({"id": pa.array(range(1000), pa.int64())}))
+
+        with Client(**local_server.client_options(), result_batch_size=300) as client:
+            result = client.query("SELECT * FROM events")
+            assert [chunk.data.num_rows for chunk in result] == [300, 300, 300, 100]
+
+            local_server.expire_tokens()
+            result = client.query("SELECT * FROM events")
+            assert [chunk.data.num_rows for chunk in result] == [300, 300, 300, 100]
@@ -0,0 +1,173 @@
+"""
+Tests for the query result cache.
+
+Runs against the in-process server, which counts the calls it receives.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import AsyncClient, Client, ResultCache
+from altertable_flightsql.testing import FlightSQLServer
+
+
+@pytest.fixture
+def events() -> pa.Table:
+    return pa.table({"id": pa.array(range(1000), pa.int64())})
+
+
+@pytest.fixture
+def cached_client(local_server: FlightSQLServer, events: pa.Table):
+    local_server.create_table("events", events)
+    with Client(**local_server.client_options(), result_cache=ResultCache()) as client:
+        yield client
+
+
+class TestResultCache:
+    """Test caching query results."""
+
+    def test_repeated_query(
+        self, local_server: FlightSQLServer, cached_client: Client, events: pa.Table
+    ):
+        """Test that a repeated query is served from the cache."""
+        assert cached_client.query("SELECT * FROM events").read_all().equals(events)
+        calls = local_server.calls["GetFlightInfo"]
+
+        result = cached_client.query("SELECT * FROM events")
+        assert result.info is None
+        assert result.read_all().equals(events)
+        assert local_server.calls["GetFlightInfo"] == calls
+
+        info = cached_client.result_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert info.size > 0
+
+    def test_bypass(self, local_server: FlightSQLServer, cached_client: Client):
+        """Test that updates, transactions and use_cache=False bypass the cache."""
+        cached_client.query("SELECT * FROM events").read_all()
+        calls = local_server.calls["GetFlightInfo"]
+
+        cached_client.query("SELECT * FROM events", use_cache=False).read_all()
+        with cached_client.begin_transaction():
+            cached_client.query("SELECT * FROM events").read_all()
+        assert local_server.calls["GetFlightInfo"] == calls + 2
+        assert cached_client.result_cache_info().hits == 0
+
+    def test_invalidation_and_ttl(self, local_server: FlightSQLServer, events: pa.Table):
+        """Test explicit invalidation and expiry."""
+        local_server.create_table("events", events)
+        cache = ResultCache(ttl=0.2)
+        with Client(**local_server.client_options(), result_cache=cache) as client:
+            client.query("SELECT * FROM events").read_all()
+            client.invalidate_result_cache("SELECT * FROM events")
+            client.query("SELECT * FROM events").read_all()
+            time.sleep(0.3)
+            client.query("SELECT * FROM events").read_all()
+
+        assert cache.info().hits == 0
+        assert cache.info().misses == 3
+
+    def test_isolated_by_user_and_server(self, local_server: FlightSQLServer, events: pa.Table):
+        """Test that clients of other users or servers never share cached results."""
+        local_server.create_table("events", events)
+        cache = ResultCache()
+        with FlightSQLServer() as other_server:
+            other_server.create_table("events", events.slice(0, 10))
+            clients = [
+                Client(**local_server.client_options("alice"), result_cache=cache),
+                Client(**local_server.client_options("bob"), result_cache=cache),
+                Client(**other_server.client_options("alice"), result_cache=cache),
+            ]
+            tables = [client.query("SELECT * FROM events").read_all() for client in clients]
+            for client in clients:
+                client.close()
+
+        assert [table.num_rows for table in tables] == [1000, 1000, 10]
+        assert (cache.info().hits, cache.info().misses) == (0, 3)
+
+    def test_invalidated_by_writes(
+        self, local_server: FlightSQLServer, cached_client: Client, events: pa.Table
+    ):
+        """Test that writing a table invalidates the cached results reading it."""
+        local_server.create_table("other", events)
+        cached_client.query("SELECT * FROM other").read_all()
+
+        cached_client.query("SELECT * FROM events").read_all()
+        cached_client.execute("INSERT INTO events VALUES (1000)")
+        assert cached_client.query("SELECT * FROM events").read_all().num_rows == 1001
+
+        with cached_client.ingest(table_name="events", schema=events.schema) as writer:
+            writer.write_table(events.slice(0, 1))
+        assert cached_client.query("SELECT * FROM events").read_all().num_rows == 1002
+
+        with cached_client.prepare("INSERT INTO events VALUES (?)") as stmt:
+            stmt.execute(parameters={"id": 1})
+        assert cached_client.query("SELECT * FROM events").read_all().num_rows == 1003
+
+        # Results of other tables stay cached
+        cached_client.query("SELECT * FROM other").read_all()
+        assert cached_client.result_cache_info().hits == 1
+
+    def test_invalidated_on_commit(self, cached_client: Client):
+        """Test that results cached while a transaction writes are invalidated on commit."""
+        with cached_client.begin_transaction() as transaction:
+            cached_client.execute("INSERT INTO events VALUES (1000)")
+            # Outside the transaction, the insert is not visible yet
+            with ThreadPoolExecutor(1) as executor:
+                executor.submit(lambda: cached_client.query("SELECT * FROM events").read_all())
+            transaction.commit()
+
+        assert cached_client.query("SELECT * FROM events").read_all().num_rows == 1001
+
+    def test_prepared_statement_parameters(
+        self, local_server: FlightSQLServer, cached_client: Client
+    ):
+        """Test that prepared statement results are keyed by their parameters."""
+        with cached_client.prepare("SELECT ? AS value") as stmt:
+            assert stmt.query(parameters={"value": 1}).read_all().to_pylist() == [{"value": 1}]
+            assert stmt.query(parameters={"value": 2}).read_all().to_pylist() == [{"value": 2}]
+            assert stmt.query(parameters={"value": 1}).read_all().to_pylist() == [{"value": 1}]
+
+        assert cached_client.result_cache_info().hits == 1
+
+    def test_size_bound(self, events: pa.Table):
+        """Test that the least recently used results are evicted past the size bound."""
+        cache = ResultCache(max_bytes=int(events.nbytes * 2.5))
+        for key in range(3):
+            cache.put(key, events)
+
+        assert cache.get(0) is None
+        assert cache.get(2).equals(events)
+        assert cache.info().size <= cache.info().maxsize
+
+    def test_disk_cache(self, tmp_path, events: pa.Table):
+        """Test storing results in memory-mapped files."""
+        cache = ResultCache(directory=tmp_path)
+        cache.put("events", events)
+        assert len(list(tmp_path.iterdir())) == 1
+        assert cache.get("events").equals(events)
+
+        cache.clear()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_async_client(self, local_server: FlightSQLServer, events: pa.Table):
+        """Test that the asyncio client uses the cache too."""
+        local_server.create_table("events", events)
+
+        async def run():
+            async with AsyncClient(
+                **local_server.client_options(), result_cache=ResultCache()
+            ) as client:
+                tables = []
+                for _ in range(2):
+                    stream = await client.query("SELECT * FROM events")
+                    tables.append(await stream.read_all())
+                return tables, client.result_cache_info()
+
+        tables, info = asyncio.run(run())
+        assert all(table.equals(events) for table in tables)
+        assert (info.hits, info.misses) == (1, 1)
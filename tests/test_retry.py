@@ -0,0 +1,113 @@
+"""
+Tests for retrying idempotent calls and resuming result streams.
+
+Runs against the in-process server, which can fail calls and break result
+streams on demand.
+"""
+
+import pyarrow as pa
+import pyarrow.flight as flight
+import pytest
+
+from altertable_flightsql import Client, RetryPolicy
+from altertable_flightsql.testing import FlightSQLServer
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, initial_backoff=0.001)
+
+
+@pytest.fixture
+def events(local_server: FlightSQLServer) -> pa.Table:
+    data = pa.table({"id": pa.array(range(1000), pa.int64())})
+    local_server.create_table("events", data)
+    local_server.chunk_size = 100
+    return data
+
+
+@pytest.fixture
+def retrying_client(local_server: FlightSQLServer):
+    with Client(**local_server.client_options(), retry_policy=FAST_RETRIES) as client:
+        yield client
+
+
+class TestRetryPolicy:
+    """Test the backoff schedule."""
+
+    def test_backoff(self):
+        """Test that delays grow exponentially up to the maximum."""
+        policy = RetryPolicy(initial_backoff=1, backoff_multiplier=2, max_backoff=5, jitter=0)
+        assert [policy.backoff(retry) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_default_errors(self):
+        """Test that only UNAVAILABLE is retried by default, INTERNAL being opt-in."""
+        assert RetryPolicy().is_retryable(flight.FlightUnavailableError("down"))
+        assert not RetryPolicy().is_retryable(flight.FlightInternalError("bad query"))
+
+        policy = RetryPolicy(
+            retryable_errors=(flight.FlightUnavailableError, flight.FlightInternalError)
+        )
+        assert policy.is_retryable(flight.FlightInternalError("flaky"))
+
+    def test_invalid_attempts(self):
+        """Test that a policy needs at least one attempt."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+class TestRetries:
+    """Test retrying planning and result streams."""
+
+    def test_planning_retried(
+        self, local_server: FlightSQLServer, retrying_client: Client, events: pa.Table
+    ):
+        """Test that transient planning failures are retried."""
+        local_server.fail_calls("GetFlightInfo", 2)
+
+        assert retrying_client.query("SELECT * FROM events").read_all().equals(events)
+        assert local_server.calls["GetFlightInfo"] == 3
+
+    def test_attempts_exhausted(self, local_server: FlightSQLServer, retrying_client: Client):
+        """Test that the error is raised once every attempt failed."""
+        local_server.fail_calls("GetFlightInfo", 3)
+
+        with pytest.raises(flight.FlightUnavailableError):
+            retrying_client.get_catalogs()
+
+    def test_no_retries_by_default(
+        self, local_server: FlightSQLServer, local_client: Client, events: pa.Table
+    ):
+        """Test that clients without a policy fail on the first error."""
+        local_server.fail_calls("GetFlightInfo")
+
+        with pytest.raises(flight.FlightUnavailableError):
+            local_client.query("SELECT * FROM events")
+
+    def test_stream_resumed(
+        self, local_server: FlightSQLServer, retrying_client: Client, events: pa.Table
+    ):
+        """Test that an interrupted stream is resumed without repeating chunks."""
+        local_server.interrupt_streams(2, after=3)
+        result = retrying_client.query("SELECT * FROM events")
+
+        assert result.read_all().equals(events)
+        assert local_server.calls["DoGet"] == 3
+
+    def test_stream_resumed_per_endpoint(
+        self, local_server: FlightSQLServer, retrying_client: Client, events: pa.Table
+    ):
+        """Test that retries are counted per endpoint."""
+        local_server.endpoints = 4
+        # Every endpoint breaks twice, within its own budget of 3 attempts
+        local_server.interrupt_streams(2, after=1)
+        result = retrying_client.query("SELECT * FROM events")
+
+        assert result.read_all().equals(events)
+
+    def test_stream_failure_after_attempts(
+        self, local_server: FlightSQLServer, retrying_client: Client, events: pa.Table
+    ):
+        """Test that a stream breaking on every attempt fails."""
+        local_server.interrupt_streams(3, after=2)
+        result = retrying_client.query("SELECT * FROM events")
+
+        with pytest.raises(flight.FlightUnavailableError):
+            result.read_all()
@@ -0,0 +1,114 @@
+"""
+Tests for the in-process Flight SQL server.
+
+Runs the client against the server from ``altertable_flightsql.testing``,
+without Docker.
+"""
+
+import pyarrow as pa
+import pytest
+
+from altertable_flightsql import Client
+from altertable_flightsql.testing import FlightSQLServer
+
+
+class TestLocalServer:
+    """Test the client against the in-process server."""
+
+    def test_create_insert_select(self, local_client: Client):
+        """Test a table round trip through SQL statements."""
+        local_client.execute("CREATE TABLE users (id INT, name VARCHAR)")
+        rows = local_client.execute("INSERT INTO users VALUES (1, 'Alice'), (2, 'Bob')")
+        assert rows == 2
+
+        result = local_client.query("SELECT * FROM users").read_all()
+        assert result.to_pylist() == [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+
+    def test_ingest_and_endpoint_splitting(
+        self, local_server: FlightSQLServer, local_client: Client
+    ):
+        """Test that results are split across the configured number of endpoints."""
+        local_server.endpoints = 4
+        data = pa.table({"id": pa.array(range(100), pa.int64())})
+        with local_client.ingest(table_name="events", schema=data.schema) as writer:
+            writer.write_table(data)
+
+        reader = local_client.query("SELECT * FROM events", parallel=True)
+        assert reader.read_all().equals(data)
+        assert local_server.calls["DoGet"] == 4
+
+    def test_prepared_statement_parameters(self, local_client: Client):
+        """Test binding parameters to a prepared query."""
+        with local_client.prepare("SELECT ? AS value") as stmt:
+            assert stmt.query(parameters={"value": 1}).read_all().to_pylist() == [{"value": 1}]
+            assert stmt.query(parameters={"value": 2}).read_all().to_pylist() == [{"value": 2}]
+
+    def test_querymany(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that each batch is bound once the previous results are read, unless pipelined."""
+        with local_client.prepare("SELECT ? AS value") as stmt:
+            result = stmt.querymany([{"value": 1}, {"value": 2}, {"value": 3}], batch_size=1)
+            assert local_server.calls["DoPut"] == 1
+            assert result.read_chunk().data.to_pylist() == [{"value": 1}]
+            assert result.read_all().to_pylist() == [{"value": 2}, {"value": 3}]
+            assert local_server.calls["DoPut"] == 3
+
+            result = stmt.querymany([{"value": 1}, {"value": 2}], batch_size=1, pipeline=True)
+            assert result.read_all().to_pylist() == [{"value": 1}, {"value": 2}]
+
+    def test_executemany_keeps_order(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that rows and Arrow batches mixed in parameter sets run in order."""
+        local_client.execute("CREATE TABLE items (id BIGINT)")
+        batch = pa.record_batch({"id": pa.array([2, 3], pa.int64())})
+
+        with local_client.prepare("INSERT INTO items VALUES (?)") as stmt:
+            stmt.executemany([{"id": 1}, batch, {"id": 4}])
+
+        assert local_server.get_table("items").column("id").to_pylist() == [1, 2, 3, 4]
+
+    def test_transaction_is_staged(self, local_server: FlightSQLServer, local_client: Client):
+        """Test that writes within a transaction are applied on commit only."""
+        local_client.execute("CREATE TABLE items (id INT)")
+
+        with local_client.begin_transaction() as transaction:
+            local_client.execute("INSERT INTO items VALUES (1)")
+            assert local_server.get_table("items").num_rows == 0
+            transaction.rollback()
+        assert local_server.get_table("items").num_rows == 0
+
+        with local_client.begin_transaction():
+            local_client.execute("INSERT INTO items VALUES (1)")
+        assert local_server.get_table("items").num_rows == 1
+
+    def test_registered_query(self, local_server: FlightSQLServer, local_client: Client):
+        """Test answering a query outside of the built-in dialect."""
+        expected = pa.table({"total": [42]})
+        local_server.register_query("SELECT sum(x) AS total FROM t WHERE y > 1", expected)
+
+        result = local_client.query("SELECT sum(x) AS total FROM t  WHERE y > 1;").read_all()
+        assert result.equals(expected)
+
+    def test_metadata(self, local_server: FlightSQLServer, local_client: Client):
+        """Test catalog, schema and table listings."""
+        local_server.create_table("users", pa.table({"id": [1]}))
+
+        assert local_client.get_catalogs().read_all().column(0).to_pylist() == ["altertable"]
+        schemas = local_client.get_schemas(catalog="altertable").read_all()
+        assert schemas.column("db_schema_name").to_pylist() == ["main"]
+        tables = local_client.get_tables(table_pattern="us%").read_all()
+        assert tables.column("table_name").to_pylist() == ["users"]
+
+    def test_unsupported_query(self, local_client: Client):
+        """Test that queries outside of the dialect fail."""
+        with pytest.raises(Exception, match="Unsupported"):
+            local_client.query("SELECT name FROM users WHERE id = 1")
+
+    def test_authentication(self):
+        """Test that configured users are enforced."""
+        import pyarrow.flight as flight
+
+        with FlightSQLServer(users={"alice": "secret"}) as server:
+            with Client(**server.client_options("alice", "secret")) as client:
+                assert client.query("SELECT 1 AS one").read_all().to_pylist() == [{"one": 1}]
+
+            with pytest.raises(flight.FlightUnauthenticatedError):
+                Client(**server.client_options("alice", "wrong"))